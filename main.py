@@ -1,9 +1,7 @@
 import os
 import random
+import time
 import webbrowser
-import tempfile
-import cv2
-from datetime import datetime
 
 from kivy.config import Config
 
@@ -23,15 +21,19 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.image import Image
 from kivy.animation import Animation
-from pathlib import Path
 import re
 
+from modules.asset_index import get_asset_index
 from modules.personality_test import PersonalityTest
 from modules.scientist_matcher import ScientistMatcher
 from modules.rps_camera_game import RPSCameraGame
 from modules.maze_game import MazeGame
 from modules.circuit_game import CircuitGame
 from modules.circuit_canvas import CircuitCanvas
+from modules.camera_service import get_camera_service
+from modules.camera_preview import CameraPreview
+from modules.portrait_cache import PortraitCache
+from modules.job_executor import JobExecutor
 
 
 # --- Screen-uri de bază ---
@@ -49,13 +51,9 @@ class ScreensaverScreen(Screen):
     
     def _load_images(self):
         """Încarcă imaginile din folderul prezentare și le sortează după număr."""
-        prezentare_dir = Path("assets/images/prezentare")
-        if prezentare_dir.exists():
-            # Colectează toate imaginile
-            all_images = list(prezentare_dir.glob("*.png"))
-            all_images.extend(prezentare_dir.glob("*.jpg"))
-            all_images.extend(prezentare_dir.glob("*.jpeg"))
-            
+        # Lista vine din indexul de assets (fără glob la fiecare pornire)
+        all_images = get_asset_index().files("images/prezentare")
+        if all_images:
             # Sortează după numărul din numele fișierului
             def extract_number(path):
                 """Extrage numărul din numele fișierului."""
@@ -266,15 +264,37 @@ class ScientistMatcherScreen(Screen):
     """Ecran pentru modulul care găsește oameni de știință care seamănă cu elevul."""
     
     def on_leave(self):
-        """Oprește feed-ul camerei când se părăsește ecranul."""
+        """Oprește feed-ul camerei și captura în curs când se părăsește ecranul."""
         app = App.get_running_app()
         if app:
             app._stop_scientist_camera_feed()
+            app.jobs.cancel_group("scientist")
+            app.jobs.cancel_group("scientist-camera")
 
 
 class RPSCameraGameScreen(Screen):
     """Ecran pentru jocul piatră-foarfecă-hârtie la cameră."""
-    pass
+
+    def on_enter(self):
+        """Dacă detecția gesturilor încă se inițializează, afișează asta până e gata."""
+        app = App.get_running_app()
+        if app and not app.rps_game.ready.is_set():
+            app.rps_status_text = "Pregătesc recunoașterea gesturilor..."
+            # warm_up() așteaptă inițializarea deja pornită (sau o reia dacă a eșuat)
+            app.jobs.submit(
+                app.rps_game.warm_up,
+                on_success=lambda result: app._on_rps_ready(),
+                on_error=lambda exc: print(f"[DEBUG] Inițializarea detecției RPS a eșuat: {exc}"),
+                group="rps",
+            )
+    
+    def on_leave(self):
+        """Oprește runda în curs când se părăsește ecranul."""
+        app = App.get_running_app()
+        if app:
+            app._cancel_rps_round()
+            app.rps_timer_text = ""
+            app.rps_status_text = "Atinge «Joacă o rundă» și arată un gest către cameră."
 
 
 class MazeGameScreen(Screen):
@@ -300,11 +320,12 @@ class KioskApp(App):
     # Proprietăți pentru scientist matcher
     scientist_status_text = StringProperty("Atinge butonul pentru a face o poză și a găsi un om de știință.")
     scientist_photo_path = StringProperty("")
-    scientist_camera_feed = StringProperty("")  # Calea către feed-ul live al camerei
 
     # Proprietăți pentru RPS
     rps_status_text = StringProperty("Atinge «Joacă o rundă» și arată un gest către cameră.")
     rps_timer_text = StringProperty("")
+    # Treapta de calitate a detecției gesturilor (adaptată de QualityGovernor)
+    rps_quality_text = StringProperty("")
 
     # Proprietăți pentru Labirint
     maze_display_text = StringProperty("")
@@ -318,11 +339,28 @@ class KioskApp(App):
     def build(self):
         self.title = "Universitatea Dunărea de Jos Galați"
         kv_path = os.path.join(os.path.dirname(__file__), "kv", "main.kv")
-        # Permite schimbarea camerei din variabilă de mediu (ex: CAMERA_INDEX=1)
+        # Permite schimbarea camerei din variabilă de mediu (ex: CAMERA_INDEX=1).
+        # Sursa se alege cu CAMERA_BACKEND=rpicam|opencv|video|images (+ CAMERA_SOURCE pentru replay).
+        # Cu CAMERA_PROCESS=1 captura rulează într-un proces separat (memorie partajată).
+        # Cu RPS_SPLIT_HALVES=1 fiecare jucător RPS are propriul graf MediaPipe (stânga/dreapta).
+        # RPS_LATENCY_BUDGET_MS (implicit 66) - bugetul per frame după care se adaptează calitatea detecției.
+        # Modelele YuNet/SFace pentru fețe se instalează o dată cu `python -m modules.face_detectors --fetch`.
         self.camera_index = int(os.environ.get("CAMERA_INDEX", "0"))
+        # Lucrul blocant (cameră, detecție) rulează în fundal, nu pe thread-ul UI
+        self.jobs = JobExecutor()
         self.personality_engine = PersonalityTest()
         self.scientist_matcher = ScientistMatcher()
+        # Portretele se decodează la cerere și rămân ca texturi (LRU); cel ales se preîncarcă
+        self.portrait_cache = PortraitCache()
+        self.scientist_matcher.on_scientist_chosen = lambda scientist: self.portrait_cache.preload(scientist.image_path)
         self.rps_game = RPSCameraGame()
+        # Crește la fiecare rundă nouă, anulată sau încheiată; un job de pregătire care
+        # termină după aceea nu mai pornește urmărirea mâinilor
+        self._rps_round = 0
+        self._on_rps_quality_change(self.rps_game.quality_tier)
+        self.rps_game.governor.add_listener(
+            lambda tier: Clock.schedule_once(lambda dt: self._on_rps_quality_change(tier), 0)
+        )
         self.maze_game = MazeGame()
         self.circuit_game = CircuitGame()
         self._reset_personality_test()
@@ -336,6 +374,31 @@ class KioskApp(App):
         Setăm person_present=True ca să nu blocăm butoanele.
         """
         self.person_present = True
+        # MediaPipe și referințele RPS se încarcă în fundal, după ce UI-ul e deja pe ecran
+        Clock.schedule_once(self._warm_up_rps, 1.0)
+        Clock.schedule_once(self._warm_up_scientist, 1.0)
+
+    def _warm_up_rps(self, dt):
+        self.jobs.submit(
+            self.rps_game.warm_up,
+            on_error=lambda exc: print(f"[DEBUG] Inițializarea detecției RPS a eșuat: {exc}"),
+        )
+
+    def _warm_up_scientist(self, dt):
+        # La prima pornire calibrează detectoarele de fețe; apoi doar citește rezultatul salvat
+        self.jobs.submit(
+            self.scientist_matcher.warm_up,
+            on_error=lambda exc: print(f"[DEBUG] Alegerea detectorului de fețe a eșuat: {exc}"),
+        )
+
+    def _on_rps_quality_change(self, tier):
+        """Actualizează eticheta cu treapta de calitate (apelat pe thread-ul UI)."""
+        self.rps_quality_text = f"Calitate detecție: {tier.name}"
+
+    def _on_rps_ready(self):
+        """Detecția gesturilor e gata (apelat pe thread-ul UI)."""
+        if not self.rps_timer_text:
+            self.rps_status_text = "Atinge «Joacă o rundă» și arată un gest către cameră."
 
     # Detectorul este dezactivat; metodele rămân ca no-op pentru compatibilitate
     def _setup_presence_detector(self):
@@ -409,15 +472,34 @@ class KioskApp(App):
             self._capture_scientist_photo()
     
     def _capture_scientist_photo(self):
-        """Capturează poza și face matching-ul."""
+        """Capturează poza și face matching-ul în fundal; rezultatul vine pe thread-ul UI."""
+        if self.jobs.is_busy("scientist"):
+            return
         self.scientist_status_text = "Capturez... te rog stai nemișcat(ă)."
         self.scientist_photo_path = ""
-        try:
-            match = self.scientist_matcher.capture_and_match(camera_index=self.camera_index)
-        except Exception as exc:
-            self._show_scientist_error_popup(f"Eroare cameră: {exc}")
-            return
-
+        self.jobs.submit(
+            self.scientist_matcher.capture_and_match,
+            camera_index=self.camera_index,
+            on_success=self._on_scientist_match,
+            on_error=lambda exc: self._show_scientist_error_popup(f"Eroare cameră: {exc}"),
+            group="scientist",
+        )
+    
+    def _capture_scientist_photo_from_frame(self, frame):
+        """Face matching-ul pe frame-ul din preview; poza salvată vine din fluxul de rezoluție mare."""
+        self.scientist_status_text = "Procesez imaginea..."
+        self.scientist_photo_path = ""
+        self.jobs.submit(
+            self.scientist_matcher.match_frame,
+            frame,
+            prefix="scientist_match",
+            on_success=self._on_scientist_match,
+            on_error=lambda exc: self._show_scientist_error_popup(f"Eroare la procesarea imaginii: {exc}"),
+            group="scientist",
+        )
+    
+    def _on_scientist_match(self, match):
+        """Afișează rezultatul matching-ului (apelat pe thread-ul UI)."""
         if not match:
             self._show_scientist_error_popup("Nu am putut detecta o față. Încearcă din nou.")
             return
@@ -425,48 +507,12 @@ class KioskApp(App):
         name = match.get("name", "Om de știință misterios")
         desc = match.get("description", "")
         photo_path = match.get("edited_photo_path", "")
-        scientist_image_path = match.get("image_path", "")
+        scientist_image_path = match.get("image_path") or ""
         
         self.scientist_photo_path = photo_path
         self.scientist_status_text = "Atinge butonul pentru a face o poză și a găsi un om de știință."
         self._show_scientist_result_popup(name, desc, photo_path, scientist_image_path)
     
-    def _capture_scientist_photo_from_frame(self, frame):
-        """Capturează poza și face matching-ul folosind un frame deja capturat."""
-        self.scientist_status_text = "Procesez imaginea..."
-        self.scientist_photo_path = ""
-        try:
-            # Detectează fața în frame
-            faces = self.scientist_matcher._detect_face(frame)
-            if len(faces) == 0:
-                self._show_scientist_error_popup("Nu am putut detecta o față. Încearcă din nou.")
-                return
-            
-            # Alege prima față detectată
-            face = faces[0]
-            
-            # Adaugă casca pe față
-            edited_frame = self.scientist_matcher._add_helmet_to_face(frame, face)
-            
-            # Salvează poza editată
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"scientist_match_{timestamp}.jpg"
-            output_path = os.path.join(self.scientist_matcher.output_dir, output_filename)
-            cv2.imwrite(output_path, edited_frame)
-            
-            # Alege un om de știință random (sau poți implementa logica de matching)
-            scientist = random.choice(self.scientist_matcher.scientists)
-            
-            name = scientist.name
-            desc = scientist.description
-            scientist_image_path = scientist.image_path or ""
-            
-            self.scientist_photo_path = output_path
-            self.scientist_status_text = "Atinge butonul pentru a face o poză și a găsi un om de știință."
-            self._show_scientist_result_popup(name, desc, output_path, scientist_image_path)
-        except Exception as exc:
-            self._show_scientist_error_popup(f"Eroare la procesarea imaginii: {exc}")
-    
     def _show_scientist_result_popup(self, name: str, desc: str, photo_path: str, scientist_image_path: str = ""):
         """Afișează rezultatul matching-ului într-un popup cu imaginea omului de știință."""
         content = BoxLayout(orientation="horizontal", padding=16, spacing=12)
@@ -494,56 +540,18 @@ class KioskApp(App):
         # Layout pentru imagine
         image_layout = BoxLayout(orientation="vertical", size_hint_x=0.4)
         
-        # Afișează imaginea omului de știință dacă există
-        if scientist_image_path:
-            # Convertește la cale absolută pentru a evita problemele cu cache-ul
-            abs_image_path = os.path.abspath(scientist_image_path)
-            
-            if os.path.exists(abs_image_path):
-                print(f"[DEBUG] Încarc imaginea: {abs_image_path}, există: {os.path.exists(abs_image_path)}")
-                
-                scientist_image = Image(
-                    source=abs_image_path,
-                    allow_stretch=True,
-                    keep_ratio=True,
-                    size_hint=(1, 1)
-                )
-                image_layout.add_widget(scientist_image)
-                
-                # Forțează reîncărcarea după ce popup-ul este deschis
-                def force_reload_image(dt):
-                    try:
-                        # Șterge cache-ul pentru imagine
-                        from kivy.cache import Cache
-                        try:
-                            Cache.remove('kv.image', abs_image_path)
-                        except:
-                            pass
-                        try:
-                            Cache.remove('kv.texture', abs_image_path)
-                        except:
-                            pass
-                        
-                        # Reîncarcă imaginea
-                        scientist_image.source = ""
-                        Clock.schedule_once(lambda dt2: setattr(scientist_image, 'source', abs_image_path), 0.05)
-                        Clock.schedule_once(lambda dt2: scientist_image.reload(), 0.1)
-                    except Exception as e:
-                        print(f"[DEBUG] Eroare la reîncărcarea imaginii: {e}")
-                
-                Clock.schedule_once(force_reload_image, 0.2)
-            else:
-                print(f"[DEBUG] Imaginea nu există: {abs_image_path}")
-                # Placeholder dacă nu există imagine
-                placeholder = Label(
-                    text=f"Imagine\n{name}",
-                    font_size="16sp",
-                    halign="center",
-                    valign="middle",
-                )
-                image_layout.add_widget(placeholder)
+        # Portretul vine din cache-ul de texturi (preîncărcat cât timp se salva poza)
+        texture = self.portrait_cache.texture(scientist_image_path)
+        if texture is not None:
+            scientist_image = Image(
+                texture=texture,
+                allow_stretch=True,
+                keep_ratio=True,
+                size_hint=(1, 1)
+            )
+            image_layout.add_widget(scientist_image)
         else:
-            # Placeholder dacă nu există cale
+            # Placeholder dacă nu există imagine
             placeholder = Label(
                 text=f"Imagine\n{name}",
                 font_size="16sp",
@@ -612,43 +620,13 @@ class KioskApp(App):
         if hasattr(self, '_scientist_camera_popup') and self._scientist_camera_popup:
             return  # Deja pornit
         
-        # Creează un fișier temporar pentru feed
-        self._scientist_camera_temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-        self._scientist_camera_temp_path = self._scientist_camera_temp_file.name
-        self._scientist_camera_temp_file.close()
-        
-        # Face o captură inițială pentru a avea ceva de afișat (folosind fișierul persistent)
-        try:
-            initial_frame = self.scientist_matcher._capture_frame_rpicam(output_path=self._scientist_camera_temp_path)
-            if initial_frame is None:
-                # Verifică dacă fișierul a fost creat de rpicam-hello chiar dacă frame este None
-                if not os.path.exists(self._scientist_camera_temp_path) or os.path.getsize(self._scientist_camera_temp_path) == 0:
-                    # Creează o imagine neagră placeholder dacă captura eșuează
-                    import numpy as np
-                    placeholder = np.zeros((480, 640, 3), dtype=np.uint8)
-                    cv2.imwrite(self._scientist_camera_temp_path, placeholder)
-                    print(f"[DEBUG] Placeholder creat la: {self._scientist_camera_temp_path}")
-                else:
-                    print(f"[DEBUG] Fișierul există și are {os.path.getsize(self._scientist_camera_temp_path)} bytes")
-            else:
-                print(f"[DEBUG] Captură inițială reușită, frame shape: {initial_frame.shape}")
-        except Exception as e:
-            # Creează o imagine neagră placeholder dacă nu se poate captura
-            import numpy as np
-            placeholder = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.imwrite(self._scientist_camera_temp_path, placeholder)
-            print(f"[DEBUG] Eroare la captură inițială: {e}, placeholder creat")
-        
-        self.scientist_camera_feed = self._scientist_camera_temp_path
-        
         # Creează popup-ul cu feed-ul camerei
         content = BoxLayout(orientation="vertical", padding=10, spacing=10)
         
-        # Imaginea feed-ului camerei
-        camera_image = Image(
-            source=self._scientist_camera_temp_path,
-            allow_stretch=True,
-            keep_ratio=True,
+        # Preview-ul camerei (textură actualizată direct din bus, fără fișiere temporare)
+        camera_image = CameraPreview(
+            camera=self.scientist_matcher.camera,
+            face_tracker=self.scientist_matcher.face_tracker,
             size_hint=(1, 0.85)
         )
         content.add_widget(camera_image)
@@ -688,23 +666,14 @@ class KioskApp(App):
         
         # Funcție pentru a face poza și a face matching-ul
         def capture_photo(instance):
-            # Oprește feed-ul temporar
-            if hasattr(self, '_scientist_camera_timer') and self._scientist_camera_timer:
-                self._scientist_camera_timer.cancel()
-                self._scientist_camera_timer = None
-            
-            # Folosește frame-ul deja capturat din feed-ul live
-            if hasattr(self, '_scientist_camera_temp_path') and os.path.exists(self._scientist_camera_temp_path):
-                # Citește frame-ul din fișierul temporar
-                frame = cv2.imread(self._scientist_camera_temp_path)
-                if frame is not None:
-                    # Face matching-ul direct cu frame-ul din feed
-                    self._capture_scientist_photo_from_frame(frame)
-                else:
-                    # Dacă nu poate citi frame-ul, face o captură nouă
-                    self._capture_scientist_photo()
+            # Folosește exact frame-ul afișat în preview
+            shown = camera_image.last_frame
+            camera_image.stop()
+            if shown is not None:
+                # Face matching-ul direct cu frame-ul din feed
+                self._capture_scientist_photo_from_frame(shown)
             else:
-                # Dacă nu există frame, face o captură nouă
+                # Dacă nu există încă frame, face o captură nouă
                 self._capture_scientist_photo()
             
             # Închide popup-ul după captură
@@ -724,112 +693,37 @@ class KioskApp(App):
         self._scientist_camera_popup = popup
         self._scientist_camera_image = camera_image
         
-        # Deschide popup-ul
+        # Deschide popup-ul; sesiunea camerei (blocantă până la primul frame) se deschide
+        # în fundal, iar preview-ul pornește pe thread-ul UI când e gata
         popup.open()
-        
-        # Forțează reîncărcarea imaginii după ce popup-ul este deschis
-        def force_reload_image(dt):
-            if hasattr(self, '_scientist_camera_image') and self._scientist_camera_image:
-                try:
-                    # Verifică dacă fișierul există și are conținut
-                    if os.path.exists(self._scientist_camera_temp_path) and os.path.getsize(self._scientist_camera_temp_path) > 0:
-                        self._scientist_camera_image.source = self._scientist_camera_temp_path
-                        self._scientist_camera_image.reload()
-                        print(f"[DEBUG] Forțat reîncărcarea imaginii: {self._scientist_camera_temp_path}, size: {os.path.getsize(self._scientist_camera_temp_path)}")
-                    else:
-                        print(f"[DEBUG] Fișierul nu există sau este gol la forțarea reîncărcării: {self._scientist_camera_temp_path}")
-                except Exception as e:
-                    print(f"[DEBUG] Eroare la forțarea reîncărcării: {e}")
-        
-        # Face o captură inițială după ce popup-ul este deschis
-        Clock.schedule_once(force_reload_image, 0.2)
-        Clock.schedule_once(lambda dt: self._update_scientist_camera_feed(0), 0.5)
-        
-        # Pornește actualizarea feed-ului cu interval mai mare pentru a evita timeout-urile
-        self._scientist_camera_timer = Clock.schedule_interval(self._update_scientist_camera_feed, 0.5)  # 2 FPS pentru a evita timeout-urile
+        self.jobs.submit(
+            self.scientist_matcher.camera.start,
+            on_success=lambda result: self._on_scientist_camera_ready(camera_image),
+            on_error=lambda exc: print(f"[DEBUG] Nu am putut porni preview-ul camerei: {exc}"),
+            # Grup separat: captura din „scientist” nu trebuie să aștepte după pornirea preview-ului
+            group="scientist-camera",
+        )
+
+    def _on_scientist_camera_ready(self, camera_image):
+        """Camera e pornită (apelat pe thread-ul UI): pornește preview-ul dacă popup-ul e tot deschis."""
+        if getattr(self, "_scientist_camera_image", None) is camera_image:
+            camera_image.start()
     
     def _stop_scientist_camera_feed(self):
         """Oprește feed-ul live al camerei și închide popup-ul."""
-        # Oprește timer-ul
-        if hasattr(self, '_scientist_camera_timer') and self._scientist_camera_timer:
-            self._scientist_camera_timer.cancel()
-            self._scientist_camera_timer = None
+        # Oprește preview-ul
+        if hasattr(self, '_scientist_camera_image') and self._scientist_camera_image:
+            self._scientist_camera_image.stop()
+            self._scientist_camera_image = None
         
         # Închide popup-ul
         if hasattr(self, '_scientist_camera_popup') and self._scientist_camera_popup:
-            try:
-                self._scientist_camera_popup.dismiss()
-            except:
-                pass
+            popup = self._scientist_camera_popup
             self._scientist_camera_popup = None
-        
-        # Șterge referințele
-        if hasattr(self, '_scientist_camera_image'):
-            self._scientist_camera_image = None
-        
-        # Șterge fișierul temporar
-        if hasattr(self, '_scientist_camera_temp_path') and os.path.exists(self._scientist_camera_temp_path):
             try:
-                os.unlink(self._scientist_camera_temp_path)
+                popup.dismiss()
             except:
                 pass
-        
-        self.scientist_camera_feed = ""
-    
-    def _update_scientist_camera_feed(self, dt):
-        """Actualizează feed-ul camerei capturând un nou frame."""
-        try:
-            # Verifică dacă popup-ul este încă deschis
-            if not hasattr(self, '_scientist_camera_popup') or not self._scientist_camera_popup:
-                return
-            
-            if not hasattr(self, '_scientist_camera_image') or not self._scientist_camera_image:
-                return
-            
-            if not hasattr(self, '_scientist_camera_temp_path'):
-                return
-            
-            # Salvează dimensiunea veche pentru a verifica dacă s-a actualizat
-            old_size = os.path.getsize(self._scientist_camera_temp_path) if os.path.exists(self._scientist_camera_temp_path) else 0
-            
-            # Folosește fișierul persistent pentru feed live
-            # _capture_frame_rpicam salvează direct la output_path, deci nu mai trebuie cv2.imwrite
-            frame = self.scientist_matcher._capture_frame_rpicam(output_path=self._scientist_camera_temp_path)
-            
-            # Verifică dacă fișierul există și are conținut
-            if os.path.exists(self._scientist_camera_temp_path):
-                new_size = os.path.getsize(self._scientist_camera_temp_path)
-                
-                # Verifică dacă fișierul s-a actualizat (nu este placeholder-ul vechi)
-                # Placeholder-ul are ~5427 bytes, o captură reală ar trebui să aibă dimensiune diferită
-                if new_size > 0 and (new_size != old_size or new_size > 10000):
-                    # Verifică dacă sursa trebuie actualizată
-                    current_source = self._scientist_camera_image.source
-                    if current_source != self._scientist_camera_temp_path:
-                        # Setează sursa pentru prima dată
-                        self._scientist_camera_image.source = self._scientist_camera_temp_path
-                        print(f"[DEBUG] Sursa setată la: {self._scientist_camera_temp_path}, size: {new_size}")
-                    else:
-                        # Forțează reîncărcarea setând sursa din nou doar dacă s-a actualizat
-                        if new_size != old_size:
-                            self._scientist_camera_image.source = ""
-                            self._scientist_camera_image.source = self._scientist_camera_temp_path
-                            print(f"[DEBUG] Fișier actualizat: {old_size} -> {new_size} bytes")
-                    
-                    # Forțează reîncărcarea
-                    try:
-                        self._scientist_camera_image.reload()
-                    except Exception as reload_err:
-                        print(f"[DEBUG] Eroare la reload: {reload_err}")
-                else:
-                    print(f"[DEBUG] Fișierul nu s-a actualizat sau este placeholder: size={new_size}, old_size={old_size}")
-            else:
-                print(f"[DEBUG] Fișierul nu există: {self._scientist_camera_temp_path}")
-        except Exception as e:
-            # Afișează eroarea pentru debugging
-            print(f"[DEBUG] Eroare la actualizarea feed-ului: {e}")
-            import traceback
-            traceback.print_exc()
 
     # --- RPS ---
     def play_rps_round(self):
@@ -846,32 +740,73 @@ class KioskApp(App):
             else:
                 self.rps_timer_text = "0"
                 self.rps_status_text = "Capturez gestul... Arată semnul!"
-                Clock.schedule_once(self._capture_rps_move, 0.5)
-        
-        # Anulează orice timer anterior
-        if hasattr(self, '_rps_timer'):
-            self._rps_timer.cancel()
+                # Frame-ul ales va fi cel mai apropiat de momentul în care timer-ul a ajuns la 0
+                self._capture_rps_move(target_time=time.time())
+                # Oprește intervalul după ce countdown-ul a ajuns la 0
+                return False
+        
+        # Anulează orice rundă anterioară
+        self._cancel_rps_round()
+        
+        # Pornește fluxul camerei acum, ca să fie cald când countdown-ul ajunge la 0; urmărirea
+        # mâinilor pornește pe thread-ul UI, doar dacă runda e tot cea curentă
+        round_id = self._rps_round
+        self.jobs.submit(
+            self.rps_game.prepare_capture,
+            stream=False,
+            on_success=lambda result: self._start_rps_streaming(round_id),
+            on_error=lambda exc: print(f"[DEBUG] Nu am putut porni camera pentru RPS: {exc}"),
+            group="rps",
+        )
         
         # Pornește timer-ul
         self._rps_timer = Clock.schedule_interval(update_timer, 1.0)
-        Clock.schedule_once(lambda dt: self._rps_timer.cancel(), 3.5)
     
-    def _capture_rps_move(self, dt):
-        """Capturează mutarea după timer pentru 2 jucători."""
-        print("[DEBUG] _capture_rps_move apelat")
-        try:
-            self.rps_status_text = "Capturez gestul... te rog așteaptă."
-            outcome = self.rps_game.play_round_two_players(camera_index=self.camera_index)
-            print(f"[DEBUG] Outcome primit: {outcome}")
-        except Exception as exc:
-            import traceback
-            print(f"[DEBUG] Eroare în _capture_rps_move: {exc}")
-            traceback.print_exc()
-            self._show_rps_error_popup(f"Eroare cameră: {exc}")
-            self.rps_timer_text = ""
-            self.rps_status_text = "Atinge «Joacă o rundă» și arată un gest către cameră."
-            return
+    def _start_rps_streaming(self, round_id):
+        """Camera e pornită (apelat pe thread-ul UI): urmărește mâinile dacă runda e încă în curs."""
+        if round_id == self._rps_round:
+            self.rps_game.start_streaming()
+
+    def _stop_rps_streaming(self):
+        """Încheie runda curentă: oprește urmărirea și invalidează pregătirile încă în lucru."""
+        self._rps_round += 1
+        self.rps_game.stop_streaming()
 
+    def _cancel_rps_round(self):
+        """Oprește countdown-ul și captura în curs (ex. la părăsirea ecranului)."""
+        timer = getattr(self, "_rps_timer", None)
+        if timer is not None:
+            timer.cancel()
+            self._rps_timer = None
+        self.jobs.cancel_group("rps")
+        self._stop_rps_streaming()
+    
+    def _capture_rps_move(self, target_time=None):
+        """Capturează mutarea după timer pentru 2 jucători (detecția rulează în fundal)."""
+        print("[DEBUG] _capture_rps_move apelat")
+        self.rps_status_text = "Capturez gestul... te rog așteaptă."
+        self.jobs.submit(
+            self.rps_game.play_round_two_players,
+            camera_index=self.camera_index,
+            target_time=target_time,
+            on_success=self._on_rps_outcome,
+            on_error=self._on_rps_error,
+            group="rps",
+        )
+    
+    def _on_rps_error(self, exc):
+        """Afișează eroarea rundei RPS (apelat pe thread-ul UI)."""
+        print(f"[DEBUG] Eroare în _capture_rps_move: {exc}")
+        self._stop_rps_streaming()
+        self._show_rps_error_popup(f"Eroare cameră: {exc}")
+        self.rps_timer_text = ""
+        self.rps_status_text = "Atinge «Joacă o rundă» și arată un gest către cameră."
+    
+    def _on_rps_outcome(self, outcome):
+        """Afișează rezultatul rundei RPS (apelat pe thread-ul UI)."""
+        print(f"[DEBUG] Outcome primit: {outcome}")
+        # Runda s-a decis; urmărirea mâinilor repornește la următorul countdown
+        self._stop_rps_streaming()
         if not outcome:
             self._show_rps_error_popup("Nu am putut detecta gesturile. Încearcă din nou.")
             self.rps_timer_text = ""
@@ -1045,7 +980,7 @@ class KioskApp(App):
         
         # Imaginea lui Einstein
         einstein_img = Image(
-            source='assets/images/Albert_Einstein_sticks_his_tongue.jpg',
+            source=get_asset_index().image("Albert_Einstein_sticks_his_tongue"),
             allow_stretch=True,
             keep_ratio=True,
             size_hint=(1, 0.8)
@@ -1198,7 +1133,7 @@ class KioskApp(App):
         popup.open()
 
     def on_stop(self):
-        """Oprește detectorul (nefolosit acum) la ieșirea din aplicație."""
+        """Oprește detectorul (nefolosit acum) și sesiunea camerei la ieșirea din aplicație."""
         detector = getattr(self, "presence_detector", None)
         if detector is not None:
             try:
@@ -1206,6 +1141,13 @@ class KioskApp(App):
             except Exception as exc:
                 print(f"[KIOSK] Eroare la oprirea PresenceDetector: {exc}")
 
+        self.jobs.shutdown()
+
+        try:
+            get_camera_service().stop()
+        except Exception as exc:
+            print(f"[KIOSK] Eroare la oprirea serviciului de cameră: {exc}")
+
 
 if __name__ == "__main__":
     KioskApp().run()
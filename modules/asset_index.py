@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+# Lângă assets/, nu în el: scrierea cache-ului ar schimba chiar mtime-ul directorului indexat
+INDEX_CACHE_PATH = ASSETS_DIR.parent / ".asset_index.json"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".jfif")
+# Directoare care nu conțin resurse pentru UI
+SKIPPED_DIRS = ("__pycache__",)
+
+
+def normalize_name(name: str) -> str:
+    """Cheia de căutare: fără extensie, fără diacritice, lowercase, cu „_” în loc de spații și cratime."""
+    stem, ext = os.path.splitext(name)
+    if ext.lower() not in IMAGE_EXTENSIONS:
+        stem = name
+    text = unicodedata.normalize("NFKD", stem)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return "_".join(text.lower().replace("-", " ").split())
+
+
+class AssetIndex:
+    """
+    Indexul imaginilor din assets/.
+
+    Fiecare director se citește o singură dată (os.scandir), iar rezultatul se salvează
+    în .asset_index.json împreună cu mtime-ul directorului. La pornirile următoare
+    un director se recitește doar dacă i s-a schimbat mtime-ul (fișiere adăugate, șterse
+    sau redenumite); altfel costul e un singur stat(). Căutările se fac într-un dict
+    de nume normalizate, fără acces la disc.
+    """
+
+    def __init__(self, root: Path = ASSETS_DIR, cache_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else INDEX_CACHE_PATH
+        # director relativ -> {"mtime", "files", "dirs"}
+        self._dirs: Dict[str, Dict] = {}
+        # director relativ -> {nume normalizat -> nume fișier}
+        self._lookup: Dict[str, Dict[str, str]] = {}
+
+    def _read_cache(self) -> Dict[str, Dict]:
+        if not self.cache_path.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if data.get("root") != str(self.root):
+                return {}
+            return data.get("dirs", {})
+        except (OSError, ValueError) as exc:
+            print(f"[AssetIndex] Cache invalid, rescanez: {exc}")
+            return {}
+
+    def _write_cache(self):
+        try:
+            tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            tmp_path.write_text(
+                json.dumps({"root": str(self.root), "dirs": self._dirs}, ensure_ascii=False, indent=1),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, self.cache_path)
+        except OSError as exc:
+            print(f"[AssetIndex] Nu pot salva indexul: {exc}")
+
+    @staticmethod
+    def _scan(path: Path) -> Dict:
+        files, dirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    if entry.name not in SKIPPED_DIRS:
+                        dirs.append(entry.name)
+                elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                    files.append(entry.name)
+        return {"files": sorted(files), "dirs": sorted(dirs)}
+
+    def load(self) -> "AssetIndex":
+        """Construiește indexul, refolosind directoarele nemodificate din cache."""
+        cached = self._read_cache()
+        self._dirs = {}
+        scanned = 0
+
+        pending = [""]
+        while pending:
+            relative = pending.pop()
+            path = self.root / relative if relative else self.root
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            entry = cached.get(relative)
+            if entry is None or entry.get("mtime") != mtime:
+                try:
+                    entry = dict(self._scan(path), mtime=mtime)
+                except OSError:
+                    continue
+                scanned += 1
+            self._dirs[relative] = entry
+            pending.extend(f"{relative}/{name}" if relative else name for name in entry["dirs"])
+
+        self._lookup = {
+            relative: {normalize_name(name): name for name in entry["files"]}
+            for relative, entry in self._dirs.items()
+        }
+        if scanned or len(self._dirs) != len(cached):
+            self._write_cache()
+            print(f"[AssetIndex] {scanned} directoare scanate, {len(self._dirs)} în index.")
+        return self
+
+    def files(self, directory: str, extensions: Sequence[str] = IMAGE_EXTENSIONS) -> List[Path]:
+        """Fișierele dintr-un director (relativ la assets/, ex. „images/prezentare”)."""
+        entry = self._dirs.get(directory.strip("/"))
+        if entry is None:
+            return []
+        base = self.root / directory.strip("/")
+        return [base / name for name in entry["files"] if os.path.splitext(name)[1].lower() in extensions]
+
+    def find(self, name: str, directory: str = "images", partial: bool = True) -> Optional[str]:
+        """
+        Calea absolută a imaginii cu numele dat (cu sau fără extensie, indiferent de
+        majuscule, spații sau diacritice). Cu partial=True, dacă nu există potrivire exactă
+        se acceptă primul fișier (alfabetic) al cărui nume îl conține.
+        """
+        lookup = self._lookup.get(directory.strip("/"), {})
+        key = normalize_name(name)
+        filename = lookup.get(key)
+        if filename is None and partial and key:
+            filename = next((lookup[k] for k in sorted(lookup) if key in k), None)
+        if filename is None:
+            return None
+        return str(self.root / directory.strip("/") / filename)
+
+    def image(self, name: str, directory: str = "images") -> str:
+        """Ca find(), dar întoarce "" dacă imaginea lipsește (pentru proprietăți `source` din kv)."""
+        return self.find(name, directory, partial=False) or ""
+
+
+_shared_index: Optional[AssetIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_asset_index() -> AssetIndex:
+    """Indexul comun al aplicației (încărcat la primul apel)."""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = AssetIndex().load()
+        return _shared_index
@@ -0,0 +1,495 @@
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from modules.frame_bus import FORMAT_BGR, FORMAT_YUV420
+
+try:
+    from picamera2 import Picamera2
+    PICAMERA2_AVAILABLE = True
+except ImportError:
+    PICAMERA2_AVAILABLE = False
+
+# Marcajele de început/sfârșit pentru un JPEG din fluxul MJPEG
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = b"\xff\xd9"
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class CameraBackend:
+    """
+    Interfață comună pentru sursele de frame-uri ale serviciului de cameră.
+
+    read() blochează până la următorul frame și returnează (frame, timestamp),
+    sau None când sursa s-a terminat / a căzut. Formatul frame-urilor este dat de
+    frame_format (implicit BGR).
+    """
+
+    name = "base"
+    frame_format = FORMAT_BGR
+
+    def open(self):
+        raise NotImplementedError
+
+    def read(self) -> Optional[Tuple[np.ndarray, float]]:
+        raise NotImplementedError
+
+    def capture_still(self, timeout: float = 3.0) -> Optional[np.ndarray]:
+        """
+        Poză la rezoluție mare (BGR) din aceeași sesiune, fără repornirea camerei.
+        None = backend-ul are un singur flux; se folosește cel mai nou frame din flux.
+        """
+        return None
+
+    def close(self):
+        pass
+
+
+class RpicamBackend(CameraBackend):
+    """
+    Sesiune rpicam-vid de lungă durată, cu ieșirea pe stdout.
+
+    codec="mjpeg": fiecare frame e un JPEG decodat cu OpenCV (BGR).
+    codec="yuv420": frame-uri brute I420 citite cu readinto() în buffere prealocate și
+    expuse cu np.frombuffer, fără decodare și fără copii. Lățimea trebuie să fie
+    multiplu de 64 (altfel rpicam-vid adaugă padding pe rânduri).
+    """
+
+    name = "rpicam"
+
+    def __init__(
+        self,
+        width: int = 640,
+        height: int = 480,
+        framerate: int = 30,
+        codec: str = "mjpeg",
+        raw_buffers: int = 12,
+    ):
+        self.width = width
+        self.height = height
+        self.framerate = framerate
+        self.codec = codec
+        self.frame_format = FORMAT_YUV420 if codec == "yuv420" else FORMAT_BGR
+        # Mai multe buffere decât ține bus-ul, ca frame-urile publicate să nu fie suprascrise
+        self.raw_buffers = raw_buffers
+        self._process = None
+        self._buffer = bytearray()
+        self._raw_pool = []
+        self._raw_index = 0
+
+    def open(self):
+        cmd = [
+            "rpicam-vid",
+            "--timeout", "0",  # flux continuu
+            "--codec", self.codec,
+            "--width", str(self.width),
+            "--height", str(self.height),
+            "--framerate", str(self.framerate),
+            "--nopreview",
+            "--output", "-",
+        ]
+        print(f"[RpicamBackend] Pornesc: {' '.join(cmd)}")
+        try:
+            self._process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+            )
+        except FileNotFoundError:
+            raise RuntimeError("rpicam-vid nu este instalat sau nu este în PATH.")
+        self._buffer = bytearray()
+        if self.codec == "yuv420":
+            frame_bytes = self.width * self.height * 3 // 2
+            self._raw_pool = [bytearray(frame_bytes) for _ in range(self.raw_buffers)]
+            self._raw_index = 0
+
+    def read(self) -> Optional[Tuple[np.ndarray, float]]:
+        process = self._process
+        if process is None:
+            return None
+        if self.codec == "yuv420":
+            return self._read_raw(process.stdout)
+
+        while True:
+            try:
+                chunk = process.stdout.read(65536)
+            except Exception as exc:
+                print(f"[RpicamBackend] Eroare la citirea fluxului: {exc}")
+                return None
+            if not chunk:
+                return None
+            self._buffer.extend(chunk)
+
+            # Caută ultimul JPEG complet; cele mai vechi din același chunk sunt sărite
+            latest_jpeg = None
+            while True:
+                start = self._buffer.find(JPEG_SOI)
+                if start < 0:
+                    self._buffer.clear()
+                    break
+                end = self._buffer.find(JPEG_EOI, start + 2)
+                if end < 0:
+                    if start > 0:
+                        del self._buffer[:start]
+                    break
+                latest_jpeg = bytes(self._buffer[start:end + 2])
+                del self._buffer[:end + 2]
+
+            if latest_jpeg is None:
+                continue
+
+            frame = cv2.imdecode(np.frombuffer(latest_jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is not None:
+                return frame, time.time()
+
+    def _read_raw(self, stream) -> Optional[Tuple[np.ndarray, float]]:
+        """Citește exact un frame I420 în următorul buffer prealocat (fără alocări)."""
+        buffer = self._raw_pool[self._raw_index]
+        self._raw_index = (self._raw_index + 1) % len(self._raw_pool)
+
+        view = memoryview(buffer)
+        filled = 0
+        while filled < len(buffer):
+            try:
+                count = stream.readinto(view[filled:])
+            except Exception as exc:
+                print(f"[RpicamBackend] Eroare la citirea fluxului: {exc}")
+                return None
+            if not count:
+                return None
+            filled += count
+
+        frame = np.frombuffer(buffer, dtype=np.uint8).reshape(self.height * 3 // 2, self.width)
+        return frame, time.time()
+
+    def close(self):
+        process = self._process
+        self._process = None
+        if process is None:
+            return
+        try:
+            process.terminate()
+            process.wait(timeout=2.0)
+        except Exception:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+
+class OpenCVBackend(CameraBackend):
+    """Cameră V4L2/USB prin cv2.VideoCapture (index sau cale /dev/videoN)."""
+
+    name = "opencv"
+
+    def __init__(self, device=0, width: int = 640, height: int = 480, framerate: int = 30):
+        self.device = device
+        self.width = width
+        self.height = height
+        self.framerate = framerate
+        self._capture = None
+
+    def open(self):
+        self._capture = cv2.VideoCapture(self.device)
+        if not self._capture.isOpened():
+            self._capture = None
+            raise RuntimeError(f"Nu pot deschide camera {self.device}")
+        self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self._capture.set(cv2.CAP_PROP_FPS, self.framerate)
+        # Buffer intern minim - vrem mereu cel mai nou frame
+        self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def read(self) -> Optional[Tuple[np.ndarray, float]]:
+        if self._capture is None:
+            return None
+        ret, frame = self._capture.read()
+        if not ret or frame is None:
+            return None
+        return frame, time.time()
+
+    def close(self):
+        if self._capture is not None:
+            try:
+                self._capture.release()
+            except Exception:
+                pass
+            self._capture = None
+
+
+class Picamera2Backend(CameraBackend):
+    """
+    Cameră Pi prin Picamera2, cu două fluxuri din aceeași sesiune libcamera:
+    - "lores": flux continuu YUV420 de rezoluție mică (analiză: prezență, față, mâini);
+    - "main": rezoluție mare (BGR), citit doar când se cere o poză cu capture_still().
+
+    Lățimea fluxului lores trebuie să fie multiplu de 64 (fără padding pe rânduri).
+    """
+
+    name = "picamera2"
+    frame_format = FORMAT_YUV420
+
+    def __init__(
+        self,
+        stream_size: Tuple[int, int] = (320, 240),
+        still_size: Tuple[int, int] = (1600, 1200),
+        framerate: int = 30,
+    ):
+        self.stream_size = stream_size
+        self.still_size = still_size
+        self.framerate = framerate
+        self._camera = None
+
+        # Cererea de poză e servită de thread-ul care citește fluxul, din același request
+        self._still_lock = threading.Lock()
+        self._still_wanted = threading.Event()
+        self._still_ready = threading.Event()
+        self._still: Optional[np.ndarray] = None
+
+    def open(self):
+        if not PICAMERA2_AVAILABLE:
+            raise RuntimeError("picamera2 nu este instalat.")
+        camera = Picamera2()
+        config = camera.create_video_configuration(
+            main={"size": tuple(self.still_size), "format": "RGB888"},
+            lores={"size": tuple(self.stream_size), "format": "YUV420"},
+            controls={"FrameRate": self.framerate},
+        )
+        camera.configure(config)
+        camera.start()
+        self._camera = camera
+
+    def read(self) -> Optional[Tuple[np.ndarray, float]]:
+        camera = self._camera
+        if camera is None:
+            return None
+
+        request = camera.capture_request()
+        try:
+            width, height = self.stream_size
+            frame = request.make_array("lores")[:height * 3 // 2, :width]
+            if self._still_wanted.is_set():
+                # "RGB888" în libcamera înseamnă ordinea BGR în memorie - direct pentru OpenCV
+                self._still = request.make_array("main")
+                self._still_wanted.clear()
+                self._still_ready.set()
+        finally:
+            request.release()
+        return frame, time.time()
+
+    def capture_still(self, timeout: float = 3.0) -> Optional[np.ndarray]:
+        if self._camera is None:
+            return None
+        with self._still_lock:
+            self._still = None
+            self._still_ready.clear()
+            self._still_wanted.set()
+            if not self._still_ready.wait(timeout):
+                self._still_wanted.clear()
+                return None
+            return self._still
+
+    def close(self):
+        camera = self._camera
+        self._camera = None
+        if camera is not None:
+            try:
+                camera.stop()
+                camera.close()
+            except Exception:
+                pass
+
+
+class _PacedBackend(CameraBackend):
+    """Bază pentru sursele înregistrate: redă frame-urile la momentele lor originale."""
+
+    def __init__(self, pace: bool = True, loop: bool = True):
+        self.pace = pace
+        self.loop = loop
+        self._wall_start: Optional[float] = None
+        self._media_start: Optional[float] = None
+
+    def _restart_clock(self):
+        self._wall_start = None
+        self._media_start = None
+
+    def _wait_until(self, media_time: float) -> float:
+        """Așteaptă momentul de redare pentru media_time (secunde) și returnează timestamp-ul."""
+        now = time.monotonic()
+        if self._wall_start is None:
+            self._wall_start = now
+            self._media_start = media_time
+        if self.pace:
+            delay = (self._wall_start + (media_time - self._media_start)) - now
+            if delay > 0:
+                time.sleep(delay)
+        return time.time()
+
+
+class VideoReplayBackend(_PacedBackend):
+    """Redă un fișier video, la timestamp-urile înregistrate (sau cât de repede se poate)."""
+
+    name = "video"
+
+    def __init__(self, path: str, pace: bool = True, loop: bool = True):
+        super().__init__(pace=pace, loop=loop)
+        self.path = path
+        self._capture = None
+
+    def open(self):
+        if not os.path.exists(self.path):
+            raise RuntimeError(f"Fișierul video nu există: {self.path}")
+        self._capture = cv2.VideoCapture(self.path)
+        if not self._capture.isOpened():
+            self._capture = None
+            raise RuntimeError(f"Nu pot deschide fișierul video: {self.path}")
+        self._restart_clock()
+
+    def read(self) -> Optional[Tuple[np.ndarray, float]]:
+        if self._capture is None:
+            return None
+
+        ret, frame = self._capture.read()
+        if not ret or frame is None:
+            if not self.loop:
+                return None
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._restart_clock()
+            ret, frame = self._capture.read()
+            if not ret or frame is None:
+                return None
+
+        media_time = self._capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        return frame, self._wait_until(media_time)
+
+    def close(self):
+        if self._capture is not None:
+            try:
+                self._capture.release()
+            except Exception:
+                pass
+            self._capture = None
+
+
+class ImageDirectoryBackend(_PacedBackend):
+    """
+    Redă imaginile dintr-un director (ordine alfabetică) la o rată fixă.
+    Dacă directorul conține timestamps.txt (câte o valoare în secunde pe linie, în ordinea
+    fișierelor), frame-urile sunt redate la momentele înregistrate.
+    """
+
+    name = "images"
+
+    def __init__(self, path: str, framerate: float = 30.0, pace: bool = True, loop: bool = True):
+        super().__init__(pace=pace, loop=loop)
+        self.path = path
+        self.framerate = framerate
+        self._files: List[Path] = []
+        self._times: List[float] = []
+        self._index = 0
+        self._lap_offset = 0.0
+
+    def open(self):
+        directory = Path(self.path)
+        if not directory.is_dir():
+            raise RuntimeError(f"Directorul de imagini nu există: {self.path}")
+        self._files = sorted(
+            p for p in directory.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS
+        )
+        if not self._files:
+            raise RuntimeError(f"Nu există imagini în {self.path}")
+
+        self._times = [i / max(1e-6, self.framerate) for i in range(len(self._files))]
+        timestamps_file = directory / "timestamps.txt"
+        if timestamps_file.exists():
+            try:
+                values = [float(line) for line in timestamps_file.read_text().split() if line]
+                if len(values) >= len(self._files):
+                    self._times = values[:len(self._files)]
+            except ValueError:
+                print(f"[ImageDirectoryBackend] timestamps.txt invalid, folosesc {self.framerate} fps")
+
+        self._index = 0
+        self._lap_offset = 0.0
+        self._restart_clock()
+
+    def read(self) -> Optional[Tuple[np.ndarray, float]]:
+        while self._files:
+            if self._index >= len(self._files):
+                if not self.loop:
+                    return None
+                # Tura următoare continuă cronologia, fără salt înapoi în timp
+                self._lap_offset += self._times[-1] - self._times[0] + 1.0 / max(1e-6, self.framerate)
+                self._index = 0
+
+            path = self._files[self._index]
+            media_time = self._lap_offset + self._times[self._index]
+            self._index += 1
+
+            frame = cv2.imread(str(path))
+            if frame is None:
+                print(f"[ImageDirectoryBackend] Nu pot citi {path}, sar peste")
+                continue
+            return frame, self._wait_until(media_time)
+        return None
+
+
+BACKENDS = ("auto", "picamera2", "rpicam", "opencv", "video", "images")
+
+
+def _parse_size(value: str, default: Tuple[int, int]) -> Tuple[int, int]:
+    try:
+        width, height = value.lower().split("x")
+        return int(width), int(height)
+    except (ValueError, AttributeError):
+        return default
+
+
+def backend_from_env(width: int = 640, height: int = 480, framerate: int = 30) -> CameraBackend:
+    """
+    Alege backend-ul camerei din variabile de mediu:
+      CAMERA_BACKEND = auto (implicit: picamera2 dacă e instalat, altfel rpicam) |
+                       picamera2 | rpicam | opencv | v4l2 | video | images
+      CAMERA_STREAM_SIZE = rezoluția fluxului de analiză pentru picamera2 (implicit 320x240)
+      CAMERA_STILL_SIZE  = rezoluția pozelor pentru picamera2 (implicit 1600x1200)
+      CAMERA_SOURCE  = fișierul video / directorul de imagini (pentru replay)
+      CAMERA_INDEX   = indexul camerei pentru opencv/v4l2 (sau CAMERA_SOURCE = /dev/videoN)
+      CAMERA_FORMAT  = mjpeg (implicit) | yuv420 - formatul fluxului rpicam
+      CAMERA_REPLAY_PACE = 1 (implicit, redă la timestamp-urile înregistrate) | 0
+      CAMERA_REPLAY_LOOP = 1 (implicit) | 0
+    """
+    name = os.environ.get("CAMERA_BACKEND", "auto").strip().lower()
+    source = os.environ.get("CAMERA_SOURCE", "")
+    pace = os.environ.get("CAMERA_REPLAY_PACE", "1") != "0"
+    loop = os.environ.get("CAMERA_REPLAY_LOOP", "1") != "0"
+
+    if name == "auto":
+        name = "picamera2" if PICAMERA2_AVAILABLE else "rpicam"
+
+    if name == "picamera2":
+        stream_size = _parse_size(os.environ.get("CAMERA_STREAM_SIZE", ""), (320, 240))
+        still_size = _parse_size(os.environ.get("CAMERA_STILL_SIZE", ""), (1600, 1200))
+        return Picamera2Backend(stream_size, still_size, framerate)
+    if name == "rpicam":
+        codec = os.environ.get("CAMERA_FORMAT", "mjpeg").strip().lower()
+        return RpicamBackend(width, height, framerate, codec=codec)
+    if name in ("opencv", "v4l2"):
+        device = source or int(os.environ.get("CAMERA_INDEX", "0"))
+        return OpenCVBackend(device, width, height, framerate)
+    if name == "video":
+        if not source:
+            raise RuntimeError("CAMERA_BACKEND=video necesită CAMERA_SOURCE=<fișier video>")
+        return VideoReplayBackend(source, pace=pace, loop=loop)
+    if name == "images":
+        if not source:
+            raise RuntimeError("CAMERA_BACKEND=images necesită CAMERA_SOURCE=<director>")
+        return ImageDirectoryBackend(source, framerate=framerate, pace=pace, loop=loop)
+    raise RuntimeError(f"Backend de cameră necunoscut: {name} (opțiuni: {', '.join(BACKENDS)})")
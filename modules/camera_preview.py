@@ -0,0 +1,120 @@
+from typing import Optional
+
+from kivy.clock import Clock
+from kivy.graphics import Color, InstructionGroup, Line
+from kivy.graphics.texture import Texture
+from kivy.uix.image import Image
+
+from modules.camera_service import CameraService, get_camera_service
+from modules.face_tracker import FaceTracker
+from modules.frame_bus import Frame
+
+
+class CameraPreview(Image):
+    """
+    Preview live al camerei.
+
+    Se abonează la bus-ul serviciului de cameră și încarcă fiecare frame nou direct
+    într-o textură Kivy persistentă (blit_buffer). Textura se recreează doar dacă se
+    schimbă rezoluția - fără JPEG temporar, fără disc și fără reload().
+
+    Cu un face_tracker, urmărirea rulează pe thread-ul lui, iar preview-ul doar desenează
+    casetele ultimului frame procesat peste imagine.
+    """
+
+    def __init__(
+        self,
+        camera: Optional[CameraService] = None,
+        fps: float = 30.0,
+        face_tracker: Optional[FaceTracker] = None,
+        **kwargs,
+    ):
+        kwargs.setdefault("allow_stretch", True)
+        kwargs.setdefault("keep_ratio", True)
+        super().__init__(**kwargs)
+        self.camera = camera or get_camera_service()
+        self.fps = fps
+        self.face_tracker = face_tracker
+
+        self._subscription = None
+        self._event = None
+        self._texture: Optional[Texture] = None
+        self._last_seq: Optional[int] = None
+
+        # Ultimul frame afișat (folosit pentru „Fă poză” - exact ce vede utilizatorul)
+        self.last_frame: Optional[Frame] = None
+
+        self._face_boxes = InstructionGroup()
+        self.canvas.after.add(self._face_boxes)
+
+    def start(self):
+        """
+        Pornește actualizarea preview-ului (no-op dacă rulează deja). Se apelează pe
+        thread-ul UI după ce sesiunea camerei a fost deschisă (camera.start() blochează
+        până la primul frame, deci rulează ca job în fundal).
+        """
+        if self._event is not None:
+            return
+        self._subscription = self.camera.bus.subscribe("preview", fps=self.fps)
+        self._event = Clock.schedule_interval(self._update_texture, 1.0 / self.fps)
+        if self.face_tracker is not None:
+            self.face_tracker.start(self.camera)
+
+    def stop(self):
+        """Oprește actualizarea preview-ului; sesiunea camerei rămâne deschisă."""
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        if self.face_tracker is not None:
+            # Cache-ul rămâne: poza făcută imediat după refolosește ultima detecție
+            self.face_tracker.stop()
+        self._face_boxes.clear()
+
+    def _update_texture(self, dt):
+        if self._subscription is None:
+            return
+
+        # Nu așteptăm pe thread-ul UI: luăm doar ce e deja publicat
+        frame = self._subscription.latest()
+        if frame is None or frame.seq == self._last_seq:
+            return
+        self._last_seq = frame.seq
+        self.last_frame = frame
+
+        image = frame.bgr()
+        height, width = image.shape[:2]
+        texture = self._texture
+        if texture is None or texture.size != (width, height):
+            texture = Texture.create(size=(width, height), colorfmt="bgr")
+            # Frame-urile OpenCV au originea sus; textura Kivy o are jos
+            texture.flip_vertical()
+            self._texture = texture
+            self.texture = texture
+
+        texture.blit_buffer(memoryview(image).cast("B"), colorfmt="bgr", bufferfmt="ubyte")
+        if self.face_tracker is not None:
+            self._draw_faces(width, height)
+        self.canvas.ask_update()
+
+    def _draw_faces(self, width: int, height: int):
+        """Desenează casetele fețelor (coordonate de frame) peste imaginea afișată."""
+        _, boxes = self.face_tracker.latest()
+        self._face_boxes.clear()
+        if not boxes:
+            return
+
+        # Imaginea e centrată în widget și scalată cu păstrarea proporțiilor
+        shown_w, shown_h = self.norm_image_size
+        left = self.center_x - shown_w / 2
+        top = self.center_y + shown_h / 2
+        scale_x, scale_y = shown_w / width, shown_h / height
+
+        self._face_boxes.add(Color(0.2, 1.0, 0.4, 1.0))
+        for x, y, w, h in boxes:
+            self._face_boxes.add(Line(
+                rectangle=(left + x * scale_x, top - (y + h) * scale_y, w * scale_x, h * scale_y),
+                width=2,
+            ))
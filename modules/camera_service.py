@@ -0,0 +1,206 @@
+import os
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from modules.camera_backends import CameraBackend, backend_from_env
+from modules.frame_bus import Frame, FrameBus
+from modules.shared_frames import SharedMemoryBackend
+
+
+class CameraService:
+    """
+    Serviciu de captură de lungă durată.
+
+    Ține deschisă o singură sesiune de cameră (backend rpicam, V4L2/OpenCV sau o sursă
+    de replay), citește frame-urile pe un thread separat și le publică pe un FrameBus
+    (buffer circular în memorie). Modulele iau cel mai nou frame din bus sau se abonează
+    cu rată și rezoluție proprii, fără să mai deschidă fiecare camera separat.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CameraBackend] = None,
+        width: int = 640,
+        height: int = 480,
+        framerate: int = 30,
+        buffer_size: int = 8,
+    ):
+        self.width = width
+        self.height = height
+        self.framerate = framerate
+        # Backend-ul se alege din variabilele de mediu (CAMERA_BACKEND etc.) dacă nu e dat
+        self.backend = backend or backend_from_env(width, height, framerate)
+
+        self._thread = None
+        self._running = False
+        self._lock = threading.Lock()
+
+        # Bus-ul pe care se publică frame-urile decodate (buffer circular)
+        self.bus = FrameBus(buffer_size=buffer_size)
+
+    @property
+    def frame_interval(self) -> float:
+        return 1.0 / max(1, self.framerate)
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Deschide backend-ul și pornește thread-ul de citire (no-op dacă rulează deja)."""
+        with self._lock:
+            if self._running:
+                return
+
+            print(f"[CameraService] Pornesc backend-ul {self.backend.name}")
+            self.backend.open()
+            self._running = True
+            self._thread = threading.Thread(target=self._reader_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Oprește sesiunea camerei și golește bufferul."""
+        with self._lock:
+            self._running = False
+            thread = self._thread
+            self._thread = None
+        self.bus.notify()
+
+        # Thread-ul iese după frame-ul curent; backend-ul se închide după aceea
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        try:
+            self.backend.close()
+        except Exception as exc:
+            print(f"[CameraService] Eroare la închiderea backend-ului: {exc}")
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+        self.bus.clear()
+        print("[CameraService] Oprit.")
+
+    def latest(self) -> Optional[Frame]:
+        """Returnează cel mai nou frame publicat, fără să aștepte."""
+        return self.bus.latest()
+
+    def get_latest_frame(self, timeout: float = 3.0, newer_than: Optional[int] = None) -> Optional[Frame]:
+        """
+        Returnează cel mai nou Frame publicat (în formatul nativ al backend-ului).
+        Pornește sesiunea dacă e nevoie.
+
+        Args:
+            timeout: cât se așteaptă primul frame (sau unul mai nou decât newer_than).
+            newer_than: dacă este specificat, așteaptă un frame cu seq mai mare.
+        """
+        if not self._running:
+            self.start()
+        return self.bus.wait_for_frame(newer_than=newer_than, timeout=timeout)
+
+    def get_frame(self, timeout: float = 3.0, newer_than: Optional[int] = None) -> Optional[np.ndarray]:
+        """Returnează cel mai nou frame ca imagine BGR read-only (conversie doar dacă e nevoie)."""
+        frame = self.get_latest_frame(timeout=timeout, newer_than=newer_than)
+        return frame.bgr() if frame is not None else None
+
+    def frames_around(self, timestamp: float, count: int = 5, after: int = 2, timeout: float = 0.2) -> List[Frame]:
+        """
+        Rafală de frame-uri în jurul unui moment: așteaptă (cel mult timeout) până există
+        `after` frame-uri de după el, apoi întoarce cele mai apropiate `count` frame-uri
+        din buffer, în ordine cronologică.
+        """
+        if not self._running:
+            self.start()
+
+        deadline = time.monotonic() + timeout
+        latest = self.bus.latest()
+        while True:
+            newer = [frame for frame in self.bus.frames() if frame.timestamp >= timestamp]
+            remaining = deadline - time.monotonic()
+            if len(newer) >= after or remaining <= 0:
+                break
+            latest = self.bus.wait_for_frame(
+                newer_than=latest.seq if latest is not None else None,
+                timeout=remaining,
+            ) or latest
+
+        frames = sorted(self.bus.frames(), key=lambda frame: abs(frame.timestamp - timestamp))[:count]
+        return sorted(frames, key=lambda frame: frame.seq)
+
+    def capture_still(self, timeout: float = 3.0) -> Optional[np.ndarray]:
+        """
+        Poză la rezoluție mare (BGR) din sesiunea deja deschisă, fără repornirea camerei.
+        Dacă backend-ul are un singur flux, se folosește cel mai nou frame din flux.
+        """
+        if not self._running:
+            self.start()
+        try:
+            still = self.backend.capture_still(timeout)
+        except Exception as exc:
+            print(f"[CameraService] Poza la rezoluție mare a eșuat: {exc}")
+            still = None
+        if still is not None:
+            return still
+        return self.get_frame(timeout=timeout)
+
+    def _reader_loop(self):
+        backend = self.backend
+        while self._running:
+            try:
+                item = backend.read()
+            except Exception as exc:
+                print(f"[CameraService] Eroare la citirea de la {backend.name}: {exc}")
+                item = None
+            if item is None:
+                break
+            frame, timestamp = item
+            self.bus.publish(frame, timestamp, backend.frame_format)
+
+        with self._lock:
+            stopped_by_source = self._running and self._thread is threading.current_thread()
+            if stopped_by_source:
+                # Sursa s-a oprit singură - următorul get_frame() o repornește
+                self._running = False
+                self._thread = None
+        if stopped_by_source:
+            try:
+                backend.close()
+            except Exception:
+                pass
+            print(f"[CameraService] Sursa {backend.name} s-a oprit.")
+        self.bus.notify()
+
+
+_shared_service: Optional[CameraService] = None
+_shared_lock = threading.Lock()
+
+
+def get_camera_service() -> CameraService:
+    """
+    Returnează serviciul de cameră comun pentru toate modulele.
+    Cu CAMERA_PROCESS=1, captura și decodarea rulează într-un proces separat, iar
+    frame-urile ajung prin memorie partajată.
+    """
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            backend = None
+            if os.environ.get("CAMERA_PROCESS", "0") == "1":
+                backend = SharedMemoryBackend()
+            _shared_service = CameraService(backend=backend)
+        return _shared_service
+
+
+if __name__ == "__main__":
+    service = get_camera_service()
+    try:
+        service.start()
+        while True:
+            frame = service.latest()
+            if frame is not None:
+                print(f"Frame #{frame.seq} @ {frame.timestamp:.3f}: {frame.image.shape}")
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        print("Oprire...")
+    finally:
+        service.stop()
@@ -0,0 +1,126 @@
+"""
+Procesul de captură pentru modul CAMERA_PROCESS=1.
+
+Rulează backend-ul camerei (ales din CAMERA_BACKEND, ca în procesul principal), decodează
+frame-urile și le scrie în inelul de memorie partajată. Comunicarea cu procesul UI:
+  - stdout: primul rând este "SHM <nume> <format>" (sau "ERR <mesaj>");
+  - stdin: "STILL" cere o poză la rezoluție mare, trimisă pe stdout ca
+    "STILL <h> <w> <c>" + octeții BGR; EOF înseamnă oprire.
+Stdout e rezervat protocolului: mesajele backend-urilor (print) ajung pe stderr.
+
+Rulare: python -m modules.capture_process --width 640 --height 480
+"""
+import argparse
+import os
+import sys
+import threading
+
+import cv2
+import numpy as np
+
+from modules.camera_backends import backend_from_env
+from modules.frame_bus import FORMAT_YUV420, resize_i420
+from modules.shared_frames import SharedFrameRing
+
+
+def _protocol_stream():
+    """
+    Stdout-ul real, păstrat doar pentru protocol. Descriptorul 1 (și sys.stdout) se
+    redirecționează spre stderr, ca print()-urile backend-urilor și ale proceselor
+    pornite de ele să nu fie citite de procesul UI drept antete.
+    """
+    sys.stdout.flush()
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return out
+
+
+def _send_line(out, text: str):
+    out.write(text.encode() + b"\n")
+    out.flush()
+
+
+def _send_still(out, image):
+    """Trimite poza pe canalul protocolului: antet text + octeții BGR (antet cu 0 dacă nu există poză)."""
+    if image is None:
+        out.write(b"STILL 0 0 0\n")
+    else:
+        image = np.ascontiguousarray(image)
+        h, w = image.shape[:2]
+        c = image.shape[2] if image.ndim > 2 else 1
+        out.write(f"STILL {h} {w} {c}\n".encode())
+        out.write(memoryview(image).cast("B"))
+    out.flush()
+
+
+def run(width: int, height: int, framerate: int, slots: int):
+    out = _protocol_stream()
+    stop_event = threading.Event()
+    backend = None
+    last = {}
+
+    def watch_stdin():
+        # Procesul părinte închide stdin la oprire (sau moare) -> ieșim
+        for line in sys.stdin:
+            if line.strip() == "STILL":
+                still = backend.capture_still()
+                if still is None and "frame" in last:
+                    frame = last["frame"]
+                    still = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420) if last["format"] == FORMAT_YUV420 else frame
+                _send_still(out, still)
+        stop_event.set()
+
+    ring = None
+    try:
+        backend = backend_from_env(width, height, framerate)
+        backend.open()
+        threading.Thread(target=watch_stdin, daemon=True).start()
+
+        while not stop_event.is_set():
+            item = backend.read()
+            if item is None:
+                break
+            frame, timestamp = item
+            last["frame"], last["format"] = frame, backend.frame_format
+
+            if ring is None:
+                # Inelul se creează după primul frame, la rezoluția reală a sursei
+                ring = SharedFrameRing.create(frame.shape, slots=slots)
+                _send_line(out, f"SHM {ring.name} {backend.frame_format}")
+            elif frame.shape != ring.shape:
+                # Sursa și-a schimbat rezoluția: aducem frame-ul la forma inelului; I420 e
+                # stivuit (Y peste U și V), deci se redimensionează plan cu plan
+                if backend.frame_format == FORMAT_YUV420:
+                    frame = resize_i420(frame, (ring.shape[1], ring.shape[0] * 2 // 3))
+                else:
+                    frame = cv2.resize(frame, (ring.shape[1], ring.shape[0]))
+
+            ring.write(frame, timestamp)
+
+        if ring is None:
+            _send_line(out, "ERR sursa nu a livrat niciun frame")
+    except Exception as exc:
+        if ring is None:
+            _send_line(out, f"ERR {exc}")
+        else:
+            print(f"[capture_process] Eroare: {exc}", file=sys.stderr)
+    finally:
+        if backend is not None:
+            backend.close()
+        if ring is not None:
+            ring.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proces de captură cu memorie partajată")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--framerate", type=int, default=30)
+    parser.add_argument("--slots", type=int, default=16)
+    args = parser.parse_args()
+    run(args.width, args.height, args.framerate, args.slots)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+Detectoare de fețe interschimbabile, toate cu aceeași interfață detect(imagine) -> casete.
+
+  haar   - cascada Haar frontală din OpenCV (mereu disponibilă);
+  lbp    - cascada LBP (assets/face_models/lbpcascade_frontalface_improved.xml, copiată
+           din opencv/data/lbpcascades; vine cu aplicația);
+  yunet  - CNN-ul YuNet prin cv2.FaceDetectorYN (assets/face_models/face_detection_yunet_2023mar.onnx,
+           din opencv_zoo/models/face_detection_yunet).
+
+Modelele ONNX (YuNet și SFace, folosit de modules.face_index) sunt fișiere LFS din
+opencv_zoo și se descarcă o singură dată, la instalarea kiosk-ului, cu --fetch; fiecare
+fișier e verificat (încărcat cu cv2.dnn) înainte de a fi pus în assets/face_models.
+Backend-urile fără fișierul de model sunt sărite. La prima pornire, select_face_detector()
+rulează o calibrare scurtă pe frame-urile din assets/face_samples (casetele adevărate în
+annotations.json): măsoară latența și recall-ul fiecărui backend la rezoluția la care
+lucrează FaceTracker și păstrează cel mai rapid backend care atinge pragul de recall.
+Rezultatul se salvează în assets/face_models/.calibration.json și se refolosește cât timp
+dispozitivul, versiunea OpenCV și backend-urile disponibile rămân aceleași.
+
+Exemple:
+    python -m modules.face_detectors                 # recalibrează și afișează tabelul
+    python -m modules.face_detectors --fetch         # descarcă modelele ONNX lipsă, apoi recalibrează
+    python -m modules.face_detectors --recall-floor 0.9
+    FACE_DETECTOR=yunet python main.py               # forțează un backend
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+FACE_MODELS_DIR = ASSETS_DIR / "face_models"
+FACE_SAMPLES_DIR = ASSETS_DIR / "face_samples"
+CALIBRATION_PATH = FACE_MODELS_DIR / ".calibration.json"
+LBP_MODEL_PATH = FACE_MODELS_DIR / "lbpcascade_frontalface_improved.xml"
+YUNET_MODEL_PATH = FACE_MODELS_DIR / "face_detection_yunet_2023mar.onnx"
+SFACE_MODEL_PATH = FACE_MODELS_DIR / "face_recognition_sface_2021dec.onnx"
+
+# Sursele modelelor ONNX care nu sunt incluse în repository (fișiere LFS în opencv_zoo)
+MODEL_URLS = {
+    YUNET_MODEL_PATH: "https://github.com/opencv/opencv_zoo/raw/main/models/face_detection_yunet/"
+                      "face_detection_yunet_2023mar.onnx",
+    SFACE_MODEL_PATH: "https://github.com/opencv/opencv_zoo/raw/main/models/face_recognition_sface/"
+                      "face_recognition_sface_2021dec.onnx",
+}
+
+# Aceeași lățime ca imaginea de lucru din FaceTracker
+CALIBRATION_WIDTH = 320
+
+
+class FaceDetector:
+    """Interfața comună: detect(imagine gri sau BGR) -> array (N, 4) de casete x, y, w, h."""
+
+    name = ""
+
+    def detect(self, image: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class CascadeFaceDetector(FaceDetector):
+    """Cascadă OpenCV (Haar sau LBP)."""
+
+    def __init__(self, name: str, path, scale_factor: float = 1.2, min_neighbors: int = 5):
+        self.name = name
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Cascada {path} lipsește.")
+        self.classifier = cv2.CascadeClassifier(str(path))
+        if self.classifier.empty():
+            raise OSError(f"Cascada {path} nu poate fi citită.")
+        # detectMultiScale nu e sigur la apeluri concurente pe aceeași instanță (tracker,
+        # poza finală și indexul portretelor pot detecta simultan)
+        self._lock = threading.Lock()
+
+    def detect(self, image: np.ndarray) -> np.ndarray:
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        with self._lock:
+            faces = self.classifier.detectMultiScale(
+                gray, scaleFactor=self.scale_factor, minNeighbors=self.min_neighbors
+            )
+        return np.asarray(faces, dtype=np.int32).reshape(-1, 4)
+
+
+class YuNetFaceDetector(FaceDetector):
+    """Detectorul CNN YuNet din modulul DNN al OpenCV."""
+
+    name = "yunet"
+
+    def __init__(self, model_path=YUNET_MODEL_PATH, score_threshold: float = 0.7):
+        if not hasattr(cv2, "FaceDetectorYN"):
+            raise RuntimeError("OpenCV nu are cv2.FaceDetectorYN (e nevoie de OpenCV >= 4.5.4).")
+        if not Path(model_path).exists():
+            raise FileNotFoundError(f"Modelul YuNet {model_path} lipsește.")
+        self.model = cv2.FaceDetectorYN.create(str(model_path), "", (CALIBRATION_WIDTH, CALIBRATION_WIDTH), score_threshold)
+        # setInputSize + detect modifică starea modelului; preview-ul și poza pot apela concurent
+        self._lock = threading.Lock()
+
+    def detect(self, image: np.ndarray) -> np.ndarray:
+        bgr = image if image.ndim == 3 else cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        height, width = bgr.shape[:2]
+        with self._lock:
+            self.model.setInputSize((width, height))
+            _, faces = self.model.detect(bgr)
+        if faces is None:
+            return np.zeros((0, 4), dtype=np.int32)
+        return np.round(faces[:, :4]).astype(np.int32)
+
+
+# Registrul backend-urilor: nume -> constructor (poate ridica excepție dacă lipsește modelul)
+FACE_DETECTORS: Dict[str, Callable[[], FaceDetector]] = {
+    "haar": lambda: CascadeFaceDetector("haar", cv2.data.haarcascades + "haarcascade_frontalface_default.xml"),
+    "lbp": lambda: CascadeFaceDetector("lbp", LBP_MODEL_PATH, scale_factor=1.1, min_neighbors=4),
+    "yunet": YuNetFaceDetector,
+}
+
+
+def create_face_detector(name: str) -> FaceDetector:
+    if name not in FACE_DETECTORS:
+        raise ValueError(f"Detector de fețe necunoscut: {name} (disponibile: {', '.join(FACE_DETECTORS)})")
+    return FACE_DETECTORS[name]()
+
+
+def available_face_detectors() -> Dict[str, FaceDetector]:
+    """Instanțele tuturor backend-urilor care pot fi construite pe acest dispozitiv."""
+    detectors = {}
+    for name in FACE_DETECTORS:
+        try:
+            detectors[name] = create_face_detector(name)
+        except (OSError, RuntimeError, cv2.error) as exc:
+            print(f"[FaceDetectors] Sar peste {name}: {exc}")
+    return detectors
+
+
+# --- Calibrare ---
+
+def load_samples(sample_dir: Path = FACE_SAMPLES_DIR, width: int = CALIBRATION_WIDTH) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Frame-urile de calibrare (gri, redimensionate la width) și casetele lor adevărate."""
+    annotations_path = Path(sample_dir) / "annotations.json"
+    if not annotations_path.exists():
+        return []
+    annotations = json.loads(annotations_path.read_text(encoding="utf-8"))
+
+    samples = []
+    for filename, boxes in annotations.items():
+        image = cv2.imread(str(Path(sample_dir) / filename), cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            continue
+        scale = width / image.shape[1]
+        image = cv2.resize(image, (width, int(round(image.shape[0] * scale))), interpolation=cv2.INTER_AREA)
+        samples.append((image, np.asarray(boxes, dtype=np.float32).reshape(-1, 4) * scale))
+    return samples
+
+
+def box_iou(boxes: np.ndarray, box: np.ndarray) -> np.ndarray:
+    """IoU dintre fiecare casetă (N, 4) și o casetă, toate în format x, y, w, h."""
+    if not len(boxes):
+        return np.zeros(0, dtype=np.float32)
+    x0 = np.maximum(boxes[:, 0], box[0])
+    y0 = np.maximum(boxes[:, 1], box[1])
+    x1 = np.minimum(boxes[:, 0] + boxes[:, 2], box[0] + box[2])
+    y1 = np.minimum(boxes[:, 1] + boxes[:, 3], box[1] + box[3])
+    intersection = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    union = boxes[:, 2] * boxes[:, 3] + box[2] * box[3] - intersection
+    return intersection / np.maximum(union, 1e-6)
+
+
+def measure(
+    detector: FaceDetector,
+    samples: List[Tuple[np.ndarray, np.ndarray]],
+    repeats: int = 3,
+    min_iou: float = 0.3,
+) -> Dict[str, float]:
+    """Latența mediană (ms), recall-ul și numărul de detecții false ale unui backend."""
+    # Primul apel (alocări, inițializarea rețelei) nu intră în latență
+    detector.detect(samples[0][0])
+
+    latencies = []
+    found = expected = false_positives = 0
+    for image, truth in samples:
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            boxes = detector.detect(image)
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+
+        boxes = boxes.astype(np.float32)
+        matched = np.zeros(len(boxes), dtype=bool)
+        for box in truth:
+            overlaps = box_iou(boxes, box)
+            if len(overlaps) and overlaps.max() >= min_iou:
+                found += 1
+                matched[int(np.argmax(overlaps))] = True
+        expected += len(truth)
+        false_positives += int(np.count_nonzero(~matched))
+
+    return {
+        "latency_ms": round(float(np.median(latencies)), 3),
+        "recall": round(found / expected, 4) if expected else 1.0,
+        "false_positives": false_positives,
+    }
+
+
+def choose_backend(results: Dict[str, Dict[str, float]], recall_floor: float) -> str:
+    """Cel mai rapid backend cu recall >= recall_floor; altfel cel cu recall maxim."""
+    eligible = [name for name, result in results.items() if result["recall"] >= recall_floor]
+    if eligible:
+        return min(eligible, key=lambda name: results[name]["latency_ms"])
+    return max(results, key=lambda name: (results[name]["recall"], -results[name]["latency_ms"]))
+
+
+def calibrate(
+    detectors: Dict[str, FaceDetector],
+    samples: List[Tuple[np.ndarray, np.ndarray]],
+    recall_floor: float,
+) -> Tuple[str, Dict[str, Dict[str, float]]]:
+    results = {name: measure(detector, samples) for name, detector in detectors.items()}
+    return choose_backend(results, recall_floor), results
+
+
+def _device_key(detectors: Dict[str, FaceDetector], recall_floor: float) -> Dict:
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "opencv": cv2.__version__,
+        "backends": sorted(detectors),
+        "recall_floor": recall_floor,
+    }
+
+
+def select_face_detector(
+    cache_path: Path = CALIBRATION_PATH,
+    sample_dir: Path = FACE_SAMPLES_DIR,
+    recall_floor: float = 0.8,
+    force: bool = False,
+) -> FaceDetector:
+    """
+    Backend-ul de folosit pe acest dispozitiv: FACE_DETECTOR din mediu, altfel rezultatul
+    calibrării salvate, altfel o calibrare nouă (salvată pentru pornirile următoare).
+    """
+    forced = os.environ.get("FACE_DETECTOR")
+    if forced:
+        return create_face_detector(forced)
+
+    detectors = available_face_detectors()
+    if len(detectors) == 1:
+        return next(iter(detectors.values()))
+
+    key = _device_key(detectors, recall_floor)
+    cache_path = Path(cache_path)
+    if not force and cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("device") == key and cached.get("backend") in detectors:
+                return detectors[cached["backend"]]
+        except (OSError, ValueError) as exc:
+            print(f"[FaceDetectors] Calibrarea salvată nu poate fi citită: {exc}")
+
+    samples = load_samples(sample_dir)
+    if not samples:
+        print(f"[FaceDetectors] Nu există frame-uri de calibrare în {sample_dir}; folosesc haar.")
+        return detectors["haar"]
+
+    backend, results = calibrate(detectors, samples, recall_floor)
+    for name, result in results.items():
+        print(f"[FaceDetectors] {name}: {result['latency_ms']:.1f} ms, recall {result['recall']:.2f}, "
+              f"{result['false_positives']} false")
+    print(f"[FaceDetectors] Backend ales: {backend}")
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"backend": backend, "device": key, "results": results}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        print(f"[FaceDetectors] Nu am putut salva calibrarea: {exc}")
+    return detectors[backend]
+
+
+def fetch_models(timeout: float = 60.0) -> List[Path]:
+    """Descarcă modelele ONNX lipsă din MODEL_URLS; returnează fișierele care încă lipsesc."""
+    missing = []
+    FACE_MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    for path, url in MODEL_URLS.items():
+        if path.exists():
+            continue
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            print(f"[FaceDetectors] Descarc {path.name}...")
+            with urllib.request.urlopen(url, timeout=timeout) as response, open(tmp_path, "wb") as handle:
+                handle.write(response.read())
+            # Un fișier trunchiat sau o pagină HTML în loc de model nu trec de încărcare
+            cv2.dnn.readNet(str(tmp_path))
+            os.replace(tmp_path, path)
+        except (OSError, cv2.error) as exc:
+            print(f"[FaceDetectors] Nu am putut descărca {path.name}: {exc}")
+            tmp_path.unlink(missing_ok=True)
+            missing.append(path)
+    return missing
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Calibrează detectoarele de fețe pe acest dispozitiv")
+    parser.add_argument("--samples", default=str(FACE_SAMPLES_DIR), help="director cu frame-uri și annotations.json")
+    parser.add_argument("--recall-floor", type=float, default=0.8, help="recall-ul minim acceptat")
+    parser.add_argument("--output", default=str(CALIBRATION_PATH), help="unde se salvează rezultatul")
+    parser.add_argument("--fetch", action="store_true", help="descarcă întâi modelele ONNX lipsă (YuNet, SFace)")
+    args = parser.parse_args(argv)
+
+    if args.fetch and fetch_models():
+        print("[FaceDetectors] Unele modele lipsesc; calibrez doar backend-urile disponibile.")
+
+    detector = select_face_detector(Path(args.output), Path(args.samples), args.recall_floor, force=True)
+    print(detector.name)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+import os
+import random
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from modules.face_detectors import FACE_MODELS_DIR, SFACE_MODEL_PATH
+
+
+INDEX_CACHE_PATH = FACE_MODELS_DIR / ".scientist_faces.npz"
+
+# Portretele mari se micșorează înainte de detecția feței
+PORTRAIT_MAX_SIZE = 640
+
+
+def crop_face(image: np.ndarray, box, margin: float = 0.1) -> np.ndarray:
+    """Decupajul feței (x, y, w, h) cu o margine relativă, limitat la imagine."""
+    x, y, w, h = [int(v) for v in box]
+    dx, dy = int(w * margin), int(h * margin)
+    x0, y0 = max(0, x - dx), max(0, y - dy)
+    x1, y1 = min(image.shape[1], x + w + dx), min(image.shape[0], y + h + dy)
+    return image[y0:y1, x0:x1]
+
+
+class HogFaceDescriptor:
+    """
+    Descriptor HOG pe fața gri 64x64, egalizată (1764 de valori). Nu cere niciun model;
+    valorile sunt pozitive, deci indexul le centrează pe media catalogului.
+    """
+
+    name = "hog"
+    centred = True
+
+    def __init__(self):
+        self.hog = cv2.HOGDescriptor((64, 64), (16, 16), (8, 8), (8, 8), 9)
+
+    def describe(self, image: np.ndarray, box) -> np.ndarray:
+        face = crop_face(image, box)
+        gray = face if face.ndim == 2 else cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+        gray = cv2.equalizeHist(cv2.resize(gray, (64, 64), interpolation=cv2.INTER_AREA))
+        return self.hog.compute(gray).ravel().astype(np.float32)
+
+
+class SFaceDescriptor:
+    """
+    Embedding-ul de 128 de valori al rețelei SFace (cv2.FaceRecognizerSF). Modelul se
+    descarcă la instalare cu `python -m modules.face_detectors --fetch`.
+    """
+
+    name = "sface"
+    centred = False
+
+    def __init__(self, model_path=SFACE_MODEL_PATH):
+        if not hasattr(cv2, "FaceRecognizerSF"):
+            raise RuntimeError("OpenCV nu are cv2.FaceRecognizerSF.")
+        if not Path(model_path).exists():
+            raise FileNotFoundError(f"Modelul SFace {model_path} lipsește.")
+        self.model = cv2.FaceRecognizerSF.create(str(model_path), "")
+
+    def describe(self, image: np.ndarray, box) -> np.ndarray:
+        face = crop_face(image, box, margin=0.05)
+        if face.ndim == 2:
+            face = cv2.cvtColor(face, cv2.COLOR_GRAY2BGR)
+        face = cv2.resize(face, (112, 112), interpolation=cv2.INTER_AREA)
+        return self.model.feature(face).ravel().astype(np.float32)
+
+
+def create_face_descriptor():
+    """SFace dacă modelul e în assets/face_models, altfel HOG."""
+    try:
+        return SFaceDescriptor()
+    except (OSError, RuntimeError, cv2.error):
+        return HogFaceDescriptor()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class ScientistFaceIndex:
+    """
+    Indexul fețelor din portretele oamenilor de știință.
+
+    Descriptorul fiecărui portret se calculează o singură dată și se salvează într-un
+    cache .npz cheiat după cale, mtime și tipul descriptorului. În memorie, portretele
+    formează o matrice normalizată L2 (o linie per portret distinct), așa că fața
+    vizitatorului se compară cu tot catalogul printr-un singur produs matrice-vector.
+    """
+
+    def __init__(self, descriptor=None, cache_path: Optional[Path] = None):
+        self.descriptor = descriptor or create_face_descriptor()
+        self.cache_path = Path(cache_path) if cache_path else INDEX_CACHE_PATH
+
+        self.paths: List[str] = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.mean: Optional[np.ndarray] = None
+        # Pentru fiecare linie din matrice: indicii oamenilor de știință cu acel portret
+        self.owners: List[List[int]] = []
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def _read_cache(self) -> Dict[str, Tuple[float, np.ndarray]]:
+        if not self.cache_path.exists():
+            return {}
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                if str(data["descriptor"]) != self.descriptor.name:
+                    return {}
+                return {
+                    str(path): (float(mtime), vector)
+                    for path, mtime, vector in zip(data["paths"], data["mtimes"], data["vectors"])
+                }
+        except Exception as exc:
+            print(f"[ScientistFaceIndex] Cache invalid, recalculez: {exc}")
+            return {}
+
+    def _write_cache(self, mtimes: List[float], vectors: np.ndarray):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            with open(tmp_path, "wb") as handle:
+                np.savez_compressed(
+                    handle,
+                    descriptor=np.array(self.descriptor.name),
+                    paths=np.array(self.paths, dtype=str),
+                    mtimes=np.array(mtimes, dtype=np.float64),
+                    vectors=vectors,
+                )
+            tmp_path.replace(self.cache_path)
+        except OSError as exc:
+            print(f"[ScientistFaceIndex] Nu pot salva cache-ul: {exc}")
+
+    def _describe_portrait(self, path: str, detect: Callable[[np.ndarray], np.ndarray]) -> Optional[np.ndarray]:
+        image = cv2.imread(path)
+        if image is None:
+            return None
+        scale = min(1.0, PORTRAIT_MAX_SIZE / max(image.shape[:2]))
+        small = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else image
+        faces = detect(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY))
+        if len(faces):
+            box = np.asarray(max(faces, key=lambda f: f[2] * f[3]), dtype=np.float64) / scale
+        else:
+            # Portret fără față detectabilă (desen, profil): folosim toată imaginea
+            print(f"[ScientistFaceIndex] Nicio față în {os.path.basename(path)}; folosesc tot portretul.")
+            box = (0, 0, image.shape[1], image.shape[0])
+        return self.descriptor.describe(image, box)
+
+    def load(self, image_paths: Sequence[Optional[str]], detect: Callable[[np.ndarray], np.ndarray]) -> "ScientistFaceIndex":
+        """
+        Construiește matricea pentru portretele date (image_paths[i] = portretul omului
+        de știință i sau None), din cache unde e posibil.
+        """
+        cached = self._read_cache()
+        rows: Dict[str, int] = {}
+        paths, mtimes, vectors, owners = [], [], [], []
+        computed = 0
+
+        for index, path in enumerate(image_paths):
+            if not path or not os.path.exists(path):
+                continue
+            if path in rows:
+                owners[rows[path]].append(index)
+                continue
+            mtime = os.path.getmtime(path)
+            hit = cached.get(path)
+            if hit is not None and hit[0] == mtime:
+                vector = hit[1]
+            else:
+                vector = self._describe_portrait(path, detect)
+                if vector is None:
+                    continue
+                computed += 1
+            rows[path] = len(paths)
+            paths.append(path)
+            mtimes.append(mtime)
+            vectors.append(vector)
+            owners.append([index])
+
+        self.paths = paths
+        self.owners = owners
+        if not vectors:
+            return self
+
+        raw = np.stack(vectors).astype(np.float32)
+        # Descriptorii cu valori pozitive (HOG) se centrează, altfel toate cosinusurile ar fi mari
+        self.mean = raw.mean(axis=0) if self.descriptor.centred and len(raw) > 1 else None
+        self.matrix = np.ascontiguousarray(_normalize(raw - self.mean if self.mean is not None else raw))
+
+        if computed or len(paths) != len(cached):
+            self._write_cache(mtimes, raw)
+            print(f"[ScientistFaceIndex] {computed} portrete descrise, {len(paths)} în total ({self.descriptor.name}).")
+        return self
+
+    def query_vector(self, image: np.ndarray, box) -> np.ndarray:
+        """Descriptorul feței vizitatorului, în același spațiu cu matricea."""
+        vector = self.descriptor.describe(image, box)
+        if self.mean is not None:
+            vector = vector - self.mean
+        return _normalize(vector)
+
+    def scores(self, vector: np.ndarray) -> np.ndarray:
+        """Similaritatea cosinus cu fiecare portret, dintr-un singur produs matrice-vector."""
+        return self.matrix @ vector
+
+    def best(self, image: np.ndarray, box) -> Optional[Tuple[int, float]]:
+        """
+        (indicele omului de știință, similaritate) pentru fața din box. Oamenii de știință
+        care împart același portret sunt la egalitate; dintre ei se alege unul la întâmplare.
+        """
+        if not len(self.matrix):
+            return None
+        scores = self.scores(self.query_vector(image, box))
+        row = int(np.argmax(scores))
+        return random.choice(self.owners[row]), float(scores[row])
@@ -0,0 +1,190 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from modules.frame_bus import Frame
+
+
+Box = Tuple[int, int, int, int]
+
+
+class FaceTracker:
+    """
+    Urmărire de fețe pentru preview-ul live.
+
+    Detecția completă (detect_fn, ex. cascada Haar) rulează pe o imagine gri micșorată
+    la detect_width, doar o dată la detect_every frame-uri; între ele casetele se
+    propagă cu flux optic Lucas-Kanade (deplasarea mediană a punctelor din casetă).
+    Rezultatele se păstrează în cache pe seq-ul frame-ului, așa că poza finală
+    refolosește detecția deja făcută pentru preview.
+    """
+
+    def __init__(
+        self,
+        detect_fn: Callable[[np.ndarray], np.ndarray],
+        detect_every: int = 5,
+        detect_width: int = 320,
+        cache_size: int = 32,
+        max_lag: int = 3,
+    ):
+        self.detect_fn = detect_fn
+        self.detect_every = detect_every
+        self.detect_width = detect_width
+        self.cache_size = cache_size
+        # Cât de vechi (în frame-uri) poate fi rezultatul refolosit pentru un frame neprocesat
+        self.max_lag = max_lag
+
+        self._cache: "OrderedDict[int, List[Box]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._prev_gray: Optional[np.ndarray] = None
+        self._prev_seq: Optional[int] = None
+        # Casetele curente, la scara imaginii de lucru (micșorate)
+        self._boxes: List[Box] = []
+        self._since_detect = 0
+        # Rezultatul celui mai nou frame procesat: (seq, casete), înlocuit dintr-o singură atribuire
+        self._latest: Tuple[Optional[int], List[Box]] = (None, [])
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # --- Procesare ---
+
+    def _work_image(self, frame: Frame) -> Tuple[np.ndarray, float]:
+        """Imaginea gri micșorată pe care se lucrează și factorul până la rezoluția frame-ului."""
+        gray = frame.gray()
+        width = gray.shape[1]
+        if width <= self.detect_width:
+            return gray, 1.0
+        scale = width / self.detect_width
+        size = (self.detect_width, int(round(gray.shape[0] / scale)))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA), scale
+
+    def _detect(self, gray: np.ndarray) -> List[Box]:
+        faces = self.detect_fn(gray)
+        return [tuple(int(v) for v in face) for face in faces]
+
+    @staticmethod
+    def _track(prev: np.ndarray, current: np.ndarray, boxes: List[Box]) -> Optional[List[Box]]:
+        """Propagă casetele cu flux optic; None dacă urmărirea nu mai e de încredere."""
+        height, width = current.shape[:2]
+        tracked = []
+        for x, y, w, h in boxes:
+            roi = prev[max(0, y):y + h, max(0, x):x + w]
+            if roi.size == 0:
+                return None
+            points = cv2.goodFeaturesToTrack(roi, maxCorners=40, qualityLevel=0.01, minDistance=3)
+            if points is None or len(points) < 5:
+                return None
+            points = points.reshape(-1, 2) + np.float32([max(0, x), max(0, y)])
+            moved, status, _ = cv2.calcOpticalFlowPyrLK(
+                prev, current, points.reshape(-1, 1, 2), None, winSize=(15, 15), maxLevel=2
+            )
+            good = status.ravel() == 1
+            if np.count_nonzero(good) < 5:
+                return None
+            dx, dy = np.median(moved.reshape(-1, 2)[good] - points[good], axis=0)
+            nx = int(round(min(max(0, x + dx), width - w)))
+            ny = int(round(min(max(0, y + dy), height - h)))
+            tracked.append((nx, ny, w, h))
+        return tracked
+
+    def process(self, frame: Frame) -> List[Box]:
+        """Casetele fețelor din frame (coordonate la rezoluția frame-ului), cu cache pe seq."""
+        # Lock-ul se ține doar cât se citește/scrie starea: detecția și fluxul optic rulează
+        # în afara lui, ca latest() (apelat pe thread-ul UI de preview) să nu aștepte după ele
+        with self._lock:
+            cached = self._cache.get(frame.seq)
+            if cached is not None:
+                return cached
+            prev_gray, prev_seq = self._prev_gray, self._prev_seq
+            tracked_boxes, since_detect = self._boxes, self._since_detect
+
+        gray, scale = self._work_image(frame)
+        # Un frame mai vechi decât starea urmărită primește o detecție separată, fără a strica starea
+        advances = prev_seq is None or frame.seq > prev_seq
+        boxes = None
+        if advances and tracked_boxes and since_detect < self.detect_every \
+                and prev_gray is not None and prev_gray.shape == gray.shape:
+            boxes = self._track(prev_gray, gray, tracked_boxes)
+        detected = boxes is None
+        if detected:
+            boxes = self._detect(gray)
+
+        result = [
+            (int(x * scale), int(y * scale), int(w * scale), int(h * scale))
+            for x, y, w, h in boxes
+        ]
+        with self._lock:
+            # Între timp alt thread poate să fi avansat starea cu un frame mai nou
+            if advances and (self._prev_seq is None or frame.seq > self._prev_seq):
+                # Fără fețe nu avem ce urmări: detectăm din nou la următorul frame
+                self._boxes = boxes
+                self._since_detect = 0 if detected else since_detect + 1
+                self._prev_gray = gray
+                self._prev_seq = frame.seq
+            if self._latest[0] is None or frame.seq > self._latest[0]:
+                self._latest = (frame.seq, result)
+            self._cache[frame.seq] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def latest(self) -> Tuple[Optional[int], List[Box]]:
+        """(seq, casete) pentru cel mai nou frame procesat."""
+        return self._latest
+
+    def boxes_for(self, frame: Frame) -> List[Box]:
+        """
+        Casetele pentru un frame: din cache dacă a fost deja procesat (sau dacă cel mai
+        nou rezultat e cu cel mult max_lag frame-uri în urmă), altfel le calculează.
+        """
+        with self._lock:
+            cached = self._cache.get(frame.seq)
+            if cached is not None:
+                return cached
+            seq, boxes = self._latest
+            if seq is not None and 0 <= frame.seq - seq <= self.max_lag:
+                return boxes
+        return self.process(frame)
+
+    def reset(self):
+        with self._lock:
+            self._cache.clear()
+            self._latest = (None, [])
+            self._prev_gray = None
+            self._prev_seq = None
+            self._boxes = []
+            self._since_detect = 0
+
+    # --- Rulare pe fluxul camerei ---
+
+    def start(self, camera, fps: float = 15.0):
+        """
+        Procesează fluxul camerei pe un thread propriu (no-op dacă rulează deja). Sesiunea
+        camerei trebuie să fie deja pornită; aici doar ne abonăm la bus.
+        """
+        if self._thread is not None and self._thread.is_alive() and not self._stop.is_set():
+            return
+        self.reset()
+        self._stop = threading.Event()
+        subscription = camera.bus.subscribe("face-tracker", fps=fps)
+        self._thread = threading.Thread(target=self._run, args=(subscription, self._stop), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self, subscription, stop: threading.Event):
+        try:
+            while not stop.is_set():
+                frame = subscription.wait(timeout=0.2)
+                if frame is not None and not stop.is_set():
+                    self.process(frame)
+        except Exception as exc:
+            print(f"[FaceTracker] Urmărirea fețelor s-a oprit: {exc}")
+        finally:
+            subscription.close()
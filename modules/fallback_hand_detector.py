@@ -0,0 +1,143 @@
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# Pielea în spațiul YCrCb (interval larg, robust la iluminare)
+SKIN_LOWER = np.array([0, 135, 85], dtype=np.uint8)
+SKIN_UPPER = np.array([255, 180, 135], dtype=np.uint8)
+
+
+def count_fingers_contour(contour: np.ndarray, min_depth: float = 0.15) -> int:
+    """
+    Numără degetele ridicate dintr-un contur de mână, calculând vectorizat unghiurile
+    tuturor defectelor de convexitate deodată (fără buclă Python pe defecte).
+
+    Args:
+        min_depth: adâncimea minimă a unui defect (golul dintre două degete), ca
+            fracție din latura mare a dreptunghiului mâinii.
+    """
+    if len(contour) < 5:
+        return 0
+    hull = cv2.convexHull(contour, returnPoints=False)
+    if hull is None or len(hull) < 3:
+        return 0
+    try:
+        defects = cv2.convexityDefects(contour, hull)
+    except cv2.error:
+        # Hull neordonat monoton (contur care se auto-intersectează)
+        return 0
+    if defects is None:
+        return 0
+
+    defects = defects[:, 0]
+    points = contour[:, 0].astype(np.float32)
+    start, end, far = points[defects[:, 0]], points[defects[:, 1]], points[defects[:, 2]]
+
+    a = np.linalg.norm(end - start, axis=1)
+    b = np.linalg.norm(far - start, axis=1)
+    c = np.linalg.norm(end - far, axis=1)
+    angles = np.arccos(np.clip((b ** 2 + c ** 2 - a ** 2) / (2 * b * c + 1e-6), -1.0, 1.0))
+
+    # Adâncimea vine în virgulă fixă (1/256 pixeli)
+    _, _, width, height = cv2.boundingRect(contour)
+    depths = defects[:, 3] / 256.0
+    gaps = int(np.count_nonzero((angles <= np.pi / 2) & (depths > min_depth * max(width, height))))
+
+    # N goluri între degete = N + 1 degete; fără goluri considerăm pumn
+    return gaps + 1 if gaps else 0
+
+
+def move_from_finger_count(finger_count: int) -> Tuple[str, float]:
+    """Semnul și încrederea lui după numărul de degete ridicate."""
+    if finger_count <= 1:
+        return "piatră", 0.6
+    if finger_count == 2:
+        return "foarfecă", 0.6
+    if finger_count >= 4:
+        return "hârtie", 0.6
+    return "piatră", 0.4
+
+
+class FallbackHandDetector:
+    """
+    Detector de mâini fără MediaPipe, pentru kiosk-uri slabe.
+
+    Un model de fundal MOG2 învață scena din fluxul live; mâinile sunt zonele din
+    prim-plan care au și culoarea pielii. Se păstrează cele mai mari două componente
+    (jucătorul din stânga și cel din dreapta), iar pentru fiecare degetele se numără
+    din defectele de convexitate ale conturului.
+    """
+
+    def __init__(
+        self,
+        history: int = 300,
+        var_threshold: float = 25.0,
+        learning_rate: float = 0.002,
+        warmup_frames: int = 15,
+        min_area: float = 0.01,
+        max_hands: int = 2,
+    ):
+        self.learning_rate = learning_rate
+        self.warmup_frames = warmup_frames
+        self.min_area = min_area
+        self.max_hands = max_hands
+
+        self.background = cv2.createBackgroundSubtractorMOG2(
+            history=history, varThreshold=var_threshold, detectShadows=False
+        )
+        self._frames_seen = 0
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+    @property
+    def background_ready(self) -> bool:
+        return self._frames_seen >= self.warmup_frames
+
+    def reset(self):
+        self.background = cv2.createBackgroundSubtractorMOG2(
+            history=self.background.getHistory(),
+            varThreshold=self.background.getVarThreshold(),
+            detectShadows=False,
+        )
+        self._frames_seen = 0
+
+    def segment(self, frame: np.ndarray) -> np.ndarray:
+        """Masca mâinilor: prim-plan (după ce fundalul e învățat) ∩ piele (dacă avem culoare)."""
+        # Fundalul se actualizează încet, ca mâinile ținute nemișcate să nu dispară imediat
+        foreground = self.background.apply(frame, learningRate=self.learning_rate)
+        self._frames_seen += 1
+
+        if frame.ndim == 3:
+            skin = cv2.inRange(cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb), SKIN_LOWER, SKIN_UPPER)
+            mask = cv2.bitwise_and(foreground, skin) if self.background_ready else skin
+        elif self.background_ready:
+            mask = foreground
+        else:
+            # Imagine gri și fundal încă neînvățat: prag Otsu (mână închisă la culoare pe fundal deschis)
+            blur = cv2.GaussianBlur(frame, (5, 5), 0)
+            _, mask = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._kernel)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._kernel, iterations=2)
+        return mask
+
+    def detect(self, frame: np.ndarray) -> List[Tuple[str, float, Optional[float]]]:
+        """Gesturile mâinilor din frame: (semn, scor, x-ul centrului normalizat în [0, 1])."""
+        h, w = frame.shape[:2]
+        mask = self.segment(frame)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return []
+
+        areas = np.array([cv2.contourArea(contour) for contour in contours])
+        order = np.argsort(areas)[::-1][:self.max_hands]
+        detected = []
+        for index in order:
+            if areas[index] < self.min_area * h * w:
+                break
+            contour = contours[index]
+            move, score = move_from_finger_count(count_fingers_contour(contour))
+            x, _, width, _ = cv2.boundingRect(contour)
+            detected.append((move, score, (x + width / 2) / w))
+        return detected
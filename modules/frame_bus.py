@@ -0,0 +1,243 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+FORMAT_BGR = "bgr"
+FORMAT_YUV420 = "yuv420"
+
+
+@dataclass(frozen=True)
+class Frame:
+    """
+    Un frame publicat pe bus: imagine read-only + număr de secvență și timestamp.
+
+    format = "bgr" (H x W x 3) sau "yuv420" (I420 planar, (H * 3/2) x W). Pentru YUV,
+    gray() este un view direct pe planul Y (fără copie), iar conversia BGR se face doar
+    la cerere, prin bgr(), o singură dată per frame.
+    """
+    seq: int
+    timestamp: float
+    image: np.ndarray
+    format: str = FORMAT_BGR
+    _converted: dict = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        h, w = self.image.shape[:2]
+        if self.format == FORMAT_YUV420:
+            h = h * 2 // 3
+        return (w, h)
+
+    def gray(self) -> np.ndarray:
+        """Imaginea în tonuri de gri (pentru YUV: planul Y, zero-copy)."""
+        if self.format == FORMAT_YUV420:
+            return self.image[:self.size[1]]
+        gray = self._converted.get("gray")
+        if gray is None:
+            gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+            gray.flags.writeable = False
+            self._converted["gray"] = gray
+        return gray
+
+    def bgr(self) -> np.ndarray:
+        """Imaginea color BGR (pentru YUV: convertită o singură dată, la prima cerere)."""
+        if self.format == FORMAT_BGR:
+            return self.image
+        bgr = self._converted.get("bgr")
+        if bgr is None:
+            bgr = cv2.cvtColor(self.image, cv2.COLOR_YUV2BGR_I420)
+            bgr.flags.writeable = False
+            self._converted["bgr"] = bgr
+        return bgr
+
+
+def resize_i420(image: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """Redimensionează un frame I420 plan cu plan, fără conversie de culoare."""
+    width, height = size[0] & ~1, size[1] & ~1
+    src_h = image.shape[0] * 2 // 3
+    src_w = image.shape[1]
+    chroma = image[src_h:].reshape(2, src_h // 2, src_w // 2)
+
+    out = np.empty((height * 3 // 2, width), dtype=np.uint8)
+    out[:height] = cv2.resize(image[:src_h], (width, height), interpolation=cv2.INTER_AREA)
+    out_chroma = out[height:].reshape(2, height // 2, width // 2)
+    for plane in range(2):
+        out_chroma[plane] = cv2.resize(chroma[plane], (width // 2, height // 2), interpolation=cv2.INTER_AREA)
+    return out
+
+
+class FrameBus:
+    """
+    Bus publish/subscribe pentru frame-uri de cameră.
+
+    Un singur producător (serviciul de cameră) publică frame-uri decodate o singură dată;
+    mai mulți consumatori primesc view-uri read-only ale aceluiași buffer. Un consumator
+    care cere altă rezoluție primește o variantă redimensionată, calculată o singură dată
+    per frame și per rezoluție, indiferent câți consumatori o cer.
+    """
+
+    def __init__(self, buffer_size: int = 8):
+        self._frames = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._cond = threading.Condition()
+        # Cache pentru variantele redimensionate: size -> Frame (doar pentru ultimul frame)
+        self._resized: Dict[Tuple[int, int], Frame] = {}
+        self._subscribers: List["FrameSubscription"] = []
+
+    def publish(
+        self,
+        image: np.ndarray,
+        timestamp: Optional[float] = None,
+        format: str = FORMAT_BGR,
+    ) -> Frame:
+        """Publică un frame nou. Imaginea devine read-only și e partajată cu toți consumatorii."""
+        image.flags.writeable = False
+        with self._cond:
+            self._seq += 1
+            frame = Frame(self._seq, timestamp if timestamp is not None else time.time(), image, format)
+            self._frames.append(frame)
+            self._resized.clear()
+            self._cond.notify_all()
+        return frame
+
+    def clear(self):
+        with self._cond:
+            self._frames.clear()
+            self._resized.clear()
+            self._cond.notify_all()
+
+    def latest(self) -> Optional[Frame]:
+        """Cel mai nou frame, fără așteptare."""
+        with self._cond:
+            return self._frames[-1] if self._frames else None
+
+    def frames(self) -> List[Frame]:
+        """Copie a listei de frame-uri din buffer (cele mai vechi primele)."""
+        with self._cond:
+            return list(self._frames)
+
+    def wait_for_frame(self, newer_than: Optional[int] = None, timeout: float = 1.0) -> Optional[Frame]:
+        """Așteaptă un frame cu seq > newer_than (sau orice frame dacă newer_than e None)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._frames:
+                    frame = self._frames[-1]
+                    if newer_than is None or frame.seq > newer_than:
+                        return frame
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def notify(self):
+        """Trezește consumatorii care așteaptă (ex. la oprirea producătorului)."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def resized(self, frame: Frame, size: Optional[Tuple[int, int]]) -> Frame:
+        """Returnează frame-ul la rezoluția cerută, partajând redimensionarea între consumatori."""
+        if size is None or frame.size == tuple(size):
+            return frame
+        size = (int(size[0]), int(size[1]))
+
+        with self._cond:
+            cached = self._resized.get(size)
+            if cached is not None and cached.seq == frame.seq:
+                return cached
+
+        if frame.format == FORMAT_YUV420:
+            image = resize_i420(frame.image, size)
+        else:
+            image = cv2.resize(frame.image, size, interpolation=cv2.INTER_AREA)
+        image.flags.writeable = False
+        resized = Frame(frame.seq, frame.timestamp, image, frame.format)
+
+        with self._cond:
+            latest = self._frames[-1] if self._frames else None
+            if latest is not None and latest.seq == frame.seq:
+                self._resized[size] = resized
+        return resized
+
+    def subscribe(
+        self,
+        name: str,
+        fps: Optional[float] = None,
+        size: Optional[Tuple[int, int]] = None,
+    ) -> "FrameSubscription":
+        """
+        Creează un consumator nou.
+
+        Args:
+            name: nume pentru debugging.
+            fps: rata maximă dorită (None = toată rata producătorului).
+            size: rezoluția (width, height) dorită (None = rezoluția originală).
+        """
+        subscription = FrameSubscription(self, name, fps=fps, size=size)
+        with self._cond:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: "FrameSubscription"):
+        with self._cond:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+
+class FrameSubscription:
+    """Consumator al unui FrameBus, cu rată și rezoluție proprii."""
+
+    def __init__(
+        self,
+        bus: FrameBus,
+        name: str,
+        fps: Optional[float] = None,
+        size: Optional[Tuple[int, int]] = None,
+    ):
+        self.bus = bus
+        self.name = name
+        self.fps = fps
+        self.size = size
+        self._last_seq: Optional[int] = None
+        self._last_delivery = 0.0
+        self._closed = False
+
+    def latest(self) -> Optional[Frame]:
+        """Cel mai nou frame la rezoluția consumatorului, fără așteptare și fără limită de rată."""
+        frame = self.bus.latest()
+        if frame is None:
+            return None
+        self._last_seq = frame.seq
+        return self.bus.resized(frame, self.size)
+
+    def wait(self, timeout: float = 1.0) -> Optional[Frame]:
+        """
+        Așteaptă următorul frame nou, respectând rata cerută de consumator.
+        Returnează None la timeout sau dacă abonamentul a fost închis.
+        """
+        if self._closed:
+            return None
+
+        if self.fps:
+            next_slot = self._last_delivery + 1.0 / self.fps
+            delay = next_slot - time.monotonic()
+            if delay > 0:
+                time.sleep(min(delay, timeout))
+
+        frame = self.bus.wait_for_frame(newer_than=self._last_seq, timeout=timeout)
+        if frame is None or self._closed:
+            return None
+
+        self._last_seq = frame.seq
+        self._last_delivery = time.monotonic()
+        return self.bus.resized(frame, self.size)
+
+    def close(self):
+        self._closed = True
+        self.bus._unsubscribe(self)
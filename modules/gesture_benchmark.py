@@ -0,0 +1,275 @@
+"""
+Benchmark de viteză și acuratețe pentru recunoașterea gesturilor RPS.
+
+Redă un set etichetat prin detectoarele din RPSCameraGame și scrie un raport JSON:
+latența per frame (p50/p95/p99), throughput, precision/recall pe clasă și matricea
+de confuzie. Cu --baseline, iese cu cod 1 dacă latența sau acuratețea regresează.
+
+Surse:
+  - director etichetat: <dir>/<semn>/*.jpg (aceeași structură ca assets/rps_references);
+  - video: --video f.mp4 --label piatră, sau --labels f.csv cu rânduri
+    „frame_start,frame_end,semn” (intervale inclusive; frame-urile neacoperite se sar).
+
+Exemple:
+    python -m modules.gesture_benchmark --images teste/ --detector mediapipe histogram fallback
+    python -m modules.gesture_benchmark --images teste/ --output raport.json --save-baseline baseline.json
+    python -m modules.gesture_benchmark --images teste/ --baseline baseline.json
+"""
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from modules.rps_references import REFERENCE_PATTERNS
+
+
+NO_GESTURE = "nimic"
+
+
+def _mediapipe(game, image: np.ndarray, still: bool) -> List[Tuple[str, float]]:
+    return game._detect_gesture_mediapipe(image, still=still)
+
+
+def _mediapipe_histogram(game, image: np.ndarray, still: bool) -> List[Tuple[str, float]]:
+    # Aceeași detecție, dar fără clasificatorul pe landmark-uri (doar histograme)
+    classifier, game.gesture_classifier = game.gesture_classifier, None
+    try:
+        return game._detect_gesture_mediapipe(image, still=still)
+    finally:
+        game.gesture_classifier = classifier
+
+
+def _fallback(game, image: np.ndarray, still: bool) -> List[Tuple[str, float]]:
+    return game._detect_gesture_fallback(image)
+
+
+# Detectoarele comparabile: nume -> (funcție, are nevoie de MediaPipe)
+DETECTORS: Dict[str, Tuple[Callable, bool]] = {
+    "mediapipe": (_mediapipe, True),
+    "histogram": (_mediapipe_histogram, True),
+    "fallback": (_fallback, False),
+}
+
+
+def labelled_images(root: Path, moves: List[str]) -> Iterator[Tuple[str, np.ndarray]]:
+    for move in moves:
+        files = []
+        for pattern in REFERENCE_PATTERNS:
+            files.extend((root / move).glob(pattern))
+        for path in sorted(files):
+            image = cv2.imread(str(path))
+            if image is not None:
+                yield move, image
+
+
+def labelled_video(path: str, label: Optional[str], labels_csv: Optional[str]) -> Iterator[Tuple[str, np.ndarray]]:
+    ranges = []
+    if labels_csv:
+        with open(labels_csv, newline="", encoding="utf-8") as handle:
+            for row in csv.reader(handle):
+                if len(row) >= 3 and row[0].strip().isdigit():
+                    ranges.append((int(row[0]), int(row[1]), row[2].strip()))
+
+    capture = cv2.VideoCapture(path)
+    index = -1
+    try:
+        while True:
+            ok, image = capture.read()
+            if not ok:
+                break
+            index += 1
+            move = label
+            for start, end, range_move in ranges:
+                if start <= index <= end:
+                    move = range_move
+                    break
+            if move:
+                yield move, image
+    finally:
+        capture.release()
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": round(float(p50), 3), "p95": round(float(p95), 3), "p99": round(float(p99), 3),
+            "mean": round(float(np.mean(values)), 3)}
+
+
+def evaluate(
+    game,
+    detector: str,
+    samples: Iterable[Tuple[str, np.ndarray]],
+    independent: bool,
+    warmup: int = 3,
+) -> Dict:
+    """
+    Rulează un detector pe exemple (parcurse o singură dată, fără a le ține în memorie)
+    și întoarce metricile lui. Cu independent=True (poze, nu video) MediaPipe folosește
+    graful în modul imagine statică: tracking-ul între poze fără legătură ar rata mâinile.
+    """
+    detect, _ = DETECTORS[detector]
+    classes = list(game.MOVES) + [NO_GESTURE]
+    confusion = np.zeros((len(game.MOVES), len(classes)), dtype=np.int64)
+    latencies = []
+    game.fallback_detector.reset()
+
+    started = time.perf_counter()
+    for index, (move, image) in enumerate(samples):
+        if independent:
+            # Poze independente: modelul de fundal al fallback-ului nu are ce învăța între ele
+            game.fallback_detector.reset()
+        t0 = time.perf_counter()
+        gestures = detect(game, image, independent)
+        # Primele apeluri (alocări, inițializarea grafului) intră în acuratețe, dar nu în latență
+        if index < warmup:
+            started = time.perf_counter()
+        else:
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+        predicted = max(gestures, key=lambda gesture: gesture[1])[0] if gestures else NO_GESTURE
+        confusion[game.MOVES.index(move), classes.index(predicted)] += 1
+    elapsed = time.perf_counter() - started
+
+    per_class = {}
+    for index, move in enumerate(game.MOVES):
+        true_positive = int(confusion[index, index])
+        predicted_total = int(confusion[:, index].sum())
+        actual_total = int(confusion[index].sum())
+        per_class[move] = {
+            "precision": round(true_positive / predicted_total, 4) if predicted_total else 0.0,
+            "recall": round(true_positive / actual_total, 4) if actual_total else 0.0,
+            "support": actual_total,
+        }
+
+    total = int(confusion.sum())
+    return {
+        "frames": total,
+        "latency_samples": len(latencies),
+        "latency_ms": percentiles(latencies),
+        "throughput_fps": round(len(latencies) / elapsed, 2) if latencies and elapsed > 0 else 0.0,
+        "accuracy": round(float(np.trace(confusion[:, :len(game.MOVES)])) / total, 4) if total else 0.0,
+        "per_class": per_class,
+        "confusion_matrix": {
+            "labels": classes,
+            "rows": {move: dict(zip(classes, confusion[index].tolist())) for index, move in enumerate(game.MOVES)},
+        },
+    }
+
+
+def check_baseline(report: Dict, baseline: Dict, latency_tolerance: float, accuracy_tolerance: float) -> List[str]:
+    """Lista regresiilor față de baseline (goală dacă totul e în toleranță)."""
+    regressions = []
+    for name, result in report["detectors"].items():
+        reference = baseline.get("detectors", {}).get(name)
+        if reference is None:
+            continue
+        if not result.get("latency_samples"):
+            # Toate exemplele au fost de încălzire: latența 0 ar trece orice baseline
+            regressions.append(f"{name}: nicio latență măsurată (e nevoie de mai multe exemple decât --warmup)")
+            continue
+        limit = reference["latency_ms"]["p95"] * (1.0 + latency_tolerance)
+        if result["latency_ms"]["p95"] > limit:
+            regressions.append(f"{name}: p95 {result['latency_ms']['p95']} ms > {limit:.1f} ms")
+        minimum = reference["accuracy"] - accuracy_tolerance
+        if result["accuracy"] < minimum:
+            regressions.append(f"{name}: acuratețe {result['accuracy']} < {minimum:.4f}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pentru recunoașterea gesturilor RPS")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--images", help="director etichetat <dir>/<semn>/*.jpg")
+    source.add_argument("--video", help="fișier video etichetat (--label sau --labels)")
+    parser.add_argument("--label", help="semnul din tot videoclipul")
+    parser.add_argument("--labels", help="CSV frame_start,frame_end,semn pentru video")
+    parser.add_argument("--detector", nargs="+", choices=sorted(DETECTORS), default=sorted(DETECTORS))
+    parser.add_argument("--output", help="fișierul JSON al raportului (implicit stdout)")
+    parser.add_argument("--baseline", help="raport de referință; cod de ieșire 1 la regresie")
+    parser.add_argument("--save-baseline", help="salvează raportul curent ca baseline")
+    parser.add_argument("--latency-tolerance", type=float, default=0.2, help="creștere relativă permisă a p95")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.02, help="scădere absolută permisă a acurateței")
+    parser.add_argument("--warmup", type=int, default=3, help="exemple de încălzire excluse din latență")
+    args = parser.parse_args(argv)
+    if args.video and not args.label and not args.labels:
+        parser.error("--video cere --label sau --labels")
+
+    # Stdout e rezervat raportului JSON: mesajele modulelor (import, warm_up) merg pe stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        report = build_report(args)
+    if report is None:
+        print("[gesture_benchmark] Nu am găsit exemple etichetate.", file=sys.stderr)
+        return 2
+    for name, result in report["detectors"].items():
+        if not result["latency_samples"]:
+            print(f"[gesture_benchmark] Atenție: {name} nu are latențe măsurate "
+                  f"({result['frames']} exemple, --warmup {args.warmup}).", file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(text, encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = check_baseline(report, baseline, args.latency_tolerance, args.accuracy_tolerance)
+        for regression in regressions:
+            print(f"[gesture_benchmark] Regresie: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+def build_report(args) -> Optional[Dict]:
+    """Rulează detectoarele cerute pe sursa din argumente; None dacă sursa nu are exemple."""
+    from modules.rps_camera_game import RPSCameraGame
+    import modules.rps_camera_game as rps_camera_game
+
+    game = RPSCameraGame()
+    game.warm_up()
+
+    # Sursa se redeschide pentru fiecare detector, ca exemplele să nu stea toate în memorie
+    if args.images:
+        def load_samples():
+            return labelled_images(Path(args.images), game.MOVES)
+    else:
+        def load_samples():
+            return labelled_video(args.video, args.label, args.labels)
+    first = next(iter(load_samples()), None)
+    if first is None:
+        return None
+
+    report = {
+        "source": args.images or args.video,
+        "frame_size": list(first[1].shape[1::-1]),
+        # „mediapipe” folosește clasificatorul pe landmark-uri când modelul există
+        "gesture_model": game.gesture_classifier is not None,
+        "detectors": {},
+    }
+    for name in args.detector:
+        _, needs_mediapipe = DETECTORS[name]
+        if needs_mediapipe and not (rps_camera_game.MEDIAPIPE_AVAILABLE and game.hands):
+            print(f"[gesture_benchmark] Sar peste {name}: MediaPipe nu e disponibil.", file=sys.stderr)
+            continue
+        if needs_mediapipe and args.video:
+            # Graf de tracking nou, fără starea lăsată de detectorul anterior
+            game._build_hands(game._model_complexity)
+        report["detectors"][name] = evaluate(
+            game, name, load_samples(), independent=bool(args.images), warmup=args.warmup
+        )
+    return report
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Clasificator de gesturi RPS pe geometria celor 21 de landmark-uri MediaPipe.
+
+Landmark-urile se aduc într-un sistem de coordonate canonic (încheietura în origine,
+încheietura -> baza degetului mijlociu în sus, lungime 1, mâna stângă oglindită peste
+cea dreaptă), deci vectorul de trăsături nu depinde de poziția, mărimea, rotația sau
+mâna folosită. Clasificarea: kNN (sau centroidul cel mai apropiat) pe un model mic
+salvat ca .npz.
+
+Antrenare din assets/rps_references (împreună cu histogramele, pe un pool de procese):
+    python -m modules.rps_reference_cli build
+sau, doar modelul, secvențial:
+    python -m modules.gesture_classifier
+"""
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+WRIST = 0
+MIDDLE_MCP = 9
+INDEX_MCP = 5
+PINKY_MCP = 17
+FINGER_TIPS = (4, 8, 12, 16, 20)   # Deget mare, arătător, mijlociu, inelar, mic
+FINGER_PIPS = (3, 6, 10, 14, 18)   # Articulațiile de comparație
+
+DEFAULT_MODEL_PATH = Path("assets/rps_references/gesture_model.npz")
+
+
+def landmark_array(landmarks) -> np.ndarray:
+    """Landmark-urile MediaPipe (NormalizedLandmarkList) ca array (21, 2) de x, y."""
+    if isinstance(landmarks, np.ndarray):
+        return landmarks[:, :2].astype(np.float32)
+    return np.array([(lm.x, lm.y) for lm in landmarks.landmark], dtype=np.float32)
+
+
+def canonical_points(points: np.ndarray) -> np.ndarray:
+    """
+    Aduce punctele (21, 2) în sistemul canonic: încheietura în origine, axa
+    încheietură -> MCP mijlociu pe +y, lungimea ei 1, degetul mare mereu spre -x.
+    """
+    points = points - points[WRIST]
+    axis = points[MIDDLE_MCP]
+    length = float(np.linalg.norm(axis))
+    if length < 1e-6:
+        return points
+
+    # Rotație care duce axa mâinii pe +y (în coordonate imagine y crește în jos)
+    up = axis / length
+    rotation = np.array([[up[1], up[0]], [-up[0], up[1]]], dtype=np.float32)
+    points = points @ rotation / length
+
+    # Oglindire: degetul mare (MCP arătător față de MCP mic) ajunge mereu în aceeași parte
+    if points[INDEX_MCP, 0] > points[PINKY_MCP, 0]:
+        points = points * np.array([-1.0, 1.0], dtype=np.float32)
+    return points
+
+
+def finger_states(points: np.ndarray) -> np.ndarray:
+    """
+    Pentru fiecare deget: True dacă e ridicat. Lucrează pe punctele canonice, deci
+    verificarea degetului mare funcționează la fel pentru mâna stângă și cea dreaptă.
+    """
+    canonical = canonical_points(points)
+    states = np.empty(5, dtype=bool)
+    # Degetul mare: vârful mai departe de palmă (spre -x) decât articulația IP
+    states[0] = canonical[FINGER_TIPS[0], 0] < canonical[FINGER_PIPS[0], 0]
+    # Celelalte: vârful mai departe de încheietură decât articulația PIP
+    tips = np.linalg.norm(canonical[list(FINGER_TIPS[1:])], axis=1)
+    pips = np.linalg.norm(canonical[list(FINGER_PIPS[1:])], axis=1)
+    states[1:] = tips > pips
+    return states
+
+
+def count_fingers(points: np.ndarray) -> int:
+    """Numărul de degete ridicate (0-5) din landmark-uri (21, 2)."""
+    return int(finger_states(points).sum())
+
+
+def landmark_features(points: np.ndarray) -> np.ndarray:
+    """
+    Vectorul de trăsături: coordonatele canonice (42 de valori) plus, pentru fiecare
+    deget, raportul distanțelor vârf / articulație față de încheietură (5 valori).
+    """
+    canonical = canonical_points(points)
+    tips = np.linalg.norm(canonical[list(FINGER_TIPS)], axis=1)
+    pips = np.linalg.norm(canonical[list(FINGER_PIPS)], axis=1)
+    ratios = tips / np.maximum(pips, 1e-6)
+    return np.concatenate([canonical.ravel(), ratios]).astype(np.float32)
+
+
+class GestureClassifier:
+    """
+    kNN pe vectori de trăsături de landmark-uri; cu puține exemple pe semn se
+    folosește centroidul cel mai apropiat. Modelul (exemple, etichete, centroizi)
+    se salvează compact ca .npz.
+    """
+
+    def __init__(self, moves: Iterable[str], k: int = 5):
+        self.moves = list(moves)
+        self.k = k
+        self.features = np.zeros((0, 0), dtype=np.float32)
+        self.labels = np.zeros(0, dtype=np.int32)
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+
+    @property
+    def trained(self) -> bool:
+        return len(self.labels) > 0
+
+    def fit(self, samples: Dict[str, List[np.ndarray]]) -> "GestureClassifier":
+        """Antrenează din {semn: [vectori landmark_features()]}."""
+        features, labels = [], []
+        for index, move in enumerate(self.moves):
+            for vector in samples.get(move, []):
+                features.append(vector)
+                labels.append(index)
+        if not features:
+            raise ValueError("Nu există exemple pentru antrenare.")
+
+        self.features = np.stack(features).astype(np.float32)
+        self.labels = np.array(labels, dtype=np.int32)
+        self.centroids = np.stack([
+            self.features[self.labels == index].mean(axis=0)
+            if np.any(self.labels == index) else np.full(self.features.shape[1], np.inf, np.float32)
+            for index in range(len(self.moves))
+        ]).astype(np.float32)
+        return self
+
+    def predict(self, vector: np.ndarray) -> Tuple[Optional[str], float]:
+        """
+        Returnează (semn, încredere în [0, 1]). Încrederea e fracția de vecini care
+        votează semnul ales (kNN) sau marginea relativă față de al doilea centroid.
+        """
+        if not self.trained:
+            return None, 0.0
+
+        counts = np.bincount(self.labels, minlength=len(self.moves))
+        if counts[counts > 0].min() >= self.k:
+            distances = np.linalg.norm(self.features - vector, axis=1)
+            nearest = np.argpartition(distances, self.k - 1)[:self.k]
+            votes = np.bincount(self.labels[nearest], minlength=len(self.moves))
+            best = int(np.argmax(votes))
+            return self.moves[best], float(votes[best]) / self.k
+
+        distances = np.linalg.norm(self.centroids - vector, axis=1)
+        order = np.argsort(distances)
+        best = int(order[0])
+        if len(order) < 2 or not np.isfinite(distances[order[1]]):
+            return self.moves[best], 1.0
+        margin = 1.0 - distances[best] / max(float(distances[order[1]]), 1e-6)
+        return self.moves[best], float(np.clip(0.5 + margin, 0.0, 1.0))
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as handle:
+            np.savez_compressed(
+                handle,
+                moves=np.array(self.moves, dtype=str),
+                k=np.int32(self.k),
+                features=self.features.astype(np.float16),
+                labels=self.labels,
+                centroids=self.centroids,
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["GestureClassifier"]:
+        """Încarcă modelul salvat, sau None dacă nu există / e invalid."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                classifier = cls([str(move) for move in data["moves"]], k=int(data["k"]))
+                classifier.features = data["features"].astype(np.float32)
+                classifier.labels = data["labels"].astype(np.int32)
+                classifier.centroids = data["centroids"].astype(np.float32)
+            return classifier
+        except Exception as exc:
+            print(f"[GestureClassifier] Model invalid ({path}): {exc}")
+            return None
+
+
+def extract_samples(reference_dir: Path, moves: Iterable[str], hands) -> Dict[str, List[np.ndarray]]:
+    """
+    Rulează MediaPipe Hands (static_image_mode=True) pe pozele de referință și întoarce
+    vectorii de trăsături pe semn. Pozele în care nu se găsește nicio mână sunt sărite.
+    """
+    samples: Dict[str, List[np.ndarray]] = {}
+    for move in moves:
+        samples[move] = []
+        ref_dir = Path(reference_dir) / move
+        if not ref_dir.exists():
+            continue
+        for pattern in ("*.jpg", "*.jpeg", "*.png"):
+            for img_path in sorted(ref_dir.glob(pattern)):
+                image = cv2.imread(str(img_path))
+                if image is None:
+                    continue
+                results = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                for hand_landmarks in results.multi_hand_landmarks or []:
+                    samples[move].append(landmark_features(landmark_array(hand_landmarks)))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Antrenează clasificatorul de gesturi RPS")
+    parser.add_argument("--references", default="assets/rps_references")
+    parser.add_argument("--output", default=str(DEFAULT_MODEL_PATH))
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    import mediapipe as mp
+    from modules.rps_camera_game import RPSCameraGame
+
+    with mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1) as hands:
+        samples = extract_samples(Path(args.references), RPSCameraGame.MOVES, hands)
+    for move, vectors in samples.items():
+        print(f"[GestureClassifier] {move}: {len(vectors)} exemple")
+
+    classifier = GestureClassifier(RPSCameraGame.MOVES, k=args.k).fit(samples)
+    classifier.save(Path(args.output))
+    print(f"[GestureClassifier] Model salvat în {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import itertools
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, List, Optional, Tuple
+
+
+class HandTrack:
+    """O mână urmărită de la un frame la altul, cu voturile ultimelor frame-uri."""
+
+    def __init__(self, track_id: int, center_x: Optional[float], timestamp: float, window: int):
+        self.id = track_id
+        self.center_x = center_x
+        self.last_seen = timestamp
+        # (timestamp, semn, scor) pentru ultimele `window` frame-uri
+        self.votes: Deque[Tuple[float, str, float]] = deque(maxlen=window)
+
+    def add(self, move: str, score: float, center_x: Optional[float], timestamp: float):
+        self.votes.append((timestamp, move, score))
+        self.center_x = center_x
+        self.last_seen = timestamp
+
+    def majority(self, since: Optional[float] = None) -> Optional[Tuple[str, int, float]]:
+        """
+        Votul majoritar din fereastră: (semn, nr. voturi, scor mediu al acelor voturi).
+        Cu since se iau în calcul doar voturile de după acel moment.
+        """
+        votes = [(move, score) for ts, move, score in self.votes if since is None or ts >= since]
+        if not votes:
+            return None
+        move, count = Counter(move for move, _ in votes).most_common(1)[0]
+        score = sum(score for vote_move, score in votes if vote_move == move) / count
+        return move, count, score
+
+
+class GestureTracker:
+    """
+    Urmărește mâinile dintr-un flux de frame-uri consecutive și votează gestul fiecăreia
+    pe o fereastră glisantă. Detecțiile dintr-un frame se asociază cu track-ul cel mai
+    apropiat pe orizontală; track-urile nevăzute de max_age secunde dispar.
+
+    Un gest e „stabil” când are cel puțin min_votes voturi și o majoritate de
+    min_share din fereastră; wait_stable() se întoarce imediat ce se întâmplă asta.
+    """
+
+    def __init__(
+        self,
+        window: int = 7,
+        min_votes: int = 4,
+        min_share: float = 0.6,
+        max_distance: float = 0.2,
+        max_age: float = 0.5,
+    ):
+        self.window = window
+        self.min_votes = min_votes
+        self.min_share = min_share
+        self.max_distance = max_distance
+        self.max_age = max_age
+
+        self._tracks: List[HandTrack] = []
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+
+    def reset(self):
+        with self._cond:
+            self._tracks = []
+            self._cond.notify_all()
+
+    def update(self, hands: List[Tuple[str, float, Optional[float]]], timestamp: float):
+        """Adaugă detecțiile unui frame: listă de (semn, scor, x-ul centrului mâinii)."""
+        with self._cond:
+            unmatched = list(self._tracks)
+            for move, score, center_x in sorted(hands, key=lambda hand: hand[1], reverse=True):
+                track = self._closest(unmatched, center_x)
+                if track is None:
+                    track = HandTrack(next(self._ids), center_x, timestamp, self.window)
+                    self._tracks.append(track)
+                else:
+                    unmatched.remove(track)
+                track.add(move, score, center_x, timestamp)
+
+            self._tracks = [track for track in self._tracks if timestamp - track.last_seen <= self.max_age]
+            self._cond.notify_all()
+
+    def _closest(self, tracks: List[HandTrack], center_x: Optional[float]) -> Optional[HandTrack]:
+        if not tracks:
+            return None
+        if center_x is None:
+            return tracks[0]
+        candidates = [track for track in tracks if track.center_x is not None]
+        if not candidates:
+            return None
+        track = min(candidates, key=lambda track: abs(track.center_x - center_x))
+        return track if abs(track.center_x - center_x) <= self.max_distance else None
+
+    def tracks(self) -> List[HandTrack]:
+        with self._cond:
+            return list(self._tracks)
+
+    def current(self, since: Optional[float] = None, stable_only: bool = True) -> List[Tuple[str, float, Optional[float]]]:
+        """
+        Gestul curent al fiecărui track, ca (semn, încredere, x) - același format ca
+        detecțiile, deci se poate da direct lui RPSCameraGame._assign_players.
+        Încrederea = ponderea votului majoritar în fereastră x scorul lui mediu.
+        """
+        with self._cond:
+            return self._current(since, stable_only)
+
+    def _current(self, since: Optional[float], stable_only: bool) -> List[Tuple[str, float, Optional[float]]]:
+        gestures = []
+        for track in self._tracks:
+            majority = track.majority(since)
+            if majority is None:
+                continue
+            move, count, score = majority
+            total = sum(1 for ts, _, _ in track.votes if since is None or ts >= since)
+            share = count / total
+            if stable_only and (count < self.min_votes or share < self.min_share):
+                continue
+            gestures.append((move, share * score, track.center_x))
+        return gestures
+
+    def wait_stable(self, hands: int = 2, since: Optional[float] = None, timeout: float = 0.5) -> List[Tuple[str, float, Optional[float]]]:
+        """Așteaptă până când cel puțin `hands` track-uri au un gest stabil (sau timeout)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                stable = self._current(since, stable_only=True)
+                remaining = deadline - time.monotonic()
+                if len(stable) >= hands or remaining <= 0:
+                    return stable
+                self._cond.wait(remaining)
@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+def _kivy_dispatch(callback: Callable[[], None]):
+    """Rulează callback-ul pe thread-ul UI, la următorul tick al Clock-ului Kivy."""
+    from kivy.clock import Clock
+    Clock.schedule_once(lambda dt: callback(), 0)
+
+
+class Job:
+    """Un task trimis în executor. cancel() oprește și livrarea rezultatului către UI."""
+
+    def __init__(self, future: Future, group: Optional[str]):
+        self.future = future
+        self.group = group
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Anulează task-ul: dacă n-a pornit nu mai rulează, iar rezultatul nu mai ajunge la UI."""
+        self._cancelled.set()
+        self.future.cancel()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+
+class JobExecutor:
+    """
+    Executor pentru lucrul blocant (cameră, detecție, MediaPipe) în afara thread-ului UI.
+
+    Task-urile rulează într-un ThreadPoolExecutor (OpenCV și MediaPipe eliberează GIL-ul
+    în codul nativ), iar on_success/on_error sunt livrate înapoi pe thread-ul UI prin
+    Clock. Task-urile pot fi grupate (ex. pe ecran) și anulate împreună când utilizatorul
+    părăsește ecranul.
+    """
+
+    def __init__(self, max_workers: int = 2, dispatch: Optional[Callable] = None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kiosk-job")
+        self._dispatch = dispatch or _kivy_dispatch
+        self._jobs: Dict[str, List[Job]] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        on_success: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        group: Optional[str] = None,
+        **kwargs,
+    ) -> Job:
+        """
+        Rulează fn(*args, **kwargs) în fundal.
+
+        Args:
+            on_success: apelat pe thread-ul UI cu rezultatul.
+            on_error: apelat pe thread-ul UI cu excepția.
+            group: numele grupului pentru cancel_group() (ex. "scientist", "rps").
+        """
+        future = self._pool.submit(fn, *args, **kwargs)
+        job = Job(future, group)
+
+        if group is not None:
+            with self._lock:
+                self._jobs.setdefault(group, []).append(job)
+
+        def deliver(done: Future):
+            self._forget(job)
+            if job.cancelled or done.cancelled():
+                return
+            error = done.exception()
+            if error is not None:
+                if on_error is not None:
+                    self._dispatch(lambda: None if job.cancelled else on_error(error))
+                else:
+                    print(f"[JobExecutor] Task eșuat: {error}")
+            elif on_success is not None:
+                result = done.result()
+                self._dispatch(lambda: None if job.cancelled else on_success(result))
+
+        future.add_done_callback(deliver)
+        return job
+
+    def cancel_group(self, group: str):
+        """Anulează toate task-urile active dintr-un grup."""
+        with self._lock:
+            jobs = self._jobs.pop(group, [])
+        for job in jobs:
+            job.cancel()
+
+    def is_busy(self, group: str) -> bool:
+        """True dacă grupul are task-uri încă nefinalizate."""
+        with self._lock:
+            return any(not job.done() for job in self._jobs.get(group, []))
+
+    def shutdown(self):
+        with self._lock:
+            groups = list(self._jobs)
+        for group in groups:
+            self.cancel_group(group)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _forget(self, job: Job):
+        if job.group is None:
+            return
+        with self._lock:
+            jobs = self._jobs.get(job.group)
+            if jobs and job in jobs:
+                jobs.remove(job)
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from kivy.graphics.texture import Texture
+
+
+class PortraitCache:
+    """
+    Cache LRU de texturi pentru portretele oamenilor de știință.
+
+    Portretele se decodează doar când e nevoie de ele, se micșorează o singură dată la
+    dimensiunea popup-ului și se păstrează ca texturi Kivy; când memoria ocupată de
+    texturi depășește max_bytes se elimină cele folosite cel mai demult. preload()
+    decodează în fundal (de pe orice thread), iar texture() - apelat pe thread-ul UI -
+    doar încarcă pixelii gata decodați în GPU.
+    """
+
+    def __init__(self, size: Tuple[int, int] = (512, 512), max_bytes: int = 32 * 1024 * 1024):
+        self.size = size
+        self.max_bytes = max_bytes
+
+        self._textures: "OrderedDict[str, Texture]" = OrderedDict()
+        self._bytes = 0
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="portrait")
+
+    def _decode(self, path: str) -> Optional[np.ndarray]:
+        """Citește portretul și îl micșorează ca să încapă în self.size (fără mărire)."""
+        image = cv2.imread(path)
+        if image is None:
+            print(f"[PortraitCache] Nu pot citi {path}")
+            return None
+        height, width = image.shape[:2]
+        scale = min(1.0, self.size[0] / width, self.size[1] / height)
+        if scale < 1.0:
+            image = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+        return np.ascontiguousarray(image)
+
+    def preload(self, path: Optional[str]):
+        """Pornește decodarea în fundal (no-op dacă portretul e deja în cache sau în lucru)."""
+        if not path:
+            return
+        with self._lock:
+            if path in self._textures or path in self._pending:
+                return
+            self._pending[path] = self._pool.submit(self._decode, path)
+
+    def texture(self, path: Optional[str]) -> Optional[Texture]:
+        """Textura portretului (apelat pe thread-ul UI); None dacă imaginea nu poate fi citită."""
+        if not path:
+            return None
+        with self._lock:
+            texture = self._textures.get(path)
+            if texture is not None:
+                self._textures.move_to_end(path)
+                return texture
+            pending = self._pending.pop(path, None)
+
+        # Preîncărcat: așteptăm doar restul decodării; altfel decodăm acum
+        image = pending.result() if pending is not None else self._decode(path)
+        if image is None:
+            return None
+
+        height, width = image.shape[:2]
+        texture = Texture.create(size=(width, height), colorfmt="bgr")
+        # Imaginile OpenCV au originea sus; textura Kivy o are jos
+        texture.flip_vertical()
+        texture.blit_buffer(memoryview(image).cast("B"), colorfmt="bgr", bufferfmt="ubyte")
+
+        with self._lock:
+            self._textures[path] = texture
+            self._bytes += width * height * 3
+            while self._bytes > self.max_bytes and len(self._textures) > 1:
+                _, evicted = self._textures.popitem(last=False)
+                self._bytes -= evicted.width * evicted.height * 3
+        return texture
+
+    def clear(self):
+        with self._lock:
+            self._textures.clear()
+            self._bytes = 0
@@ -1,22 +1,37 @@
 import cv2
 import threading
 import time
+from typing import Optional
+
+from modules.camera_service import CameraService, get_camera_service
 
 
 class PresenceDetector:
+    """
+    Detectează prezența prin diferența între frame-uri consecutive.
+    Nu deschide camera direct: se abonează la bus-ul serviciului de cameră comun
+    (5 fps, 320x240), ca să nu concureze cu celelalte module pentru camera Pi.
+    """
+
     def __init__(
         self,
         camera_index: int = 0,
         motion_threshold: float = 15.0,      # mai sensibil
         min_changed_pixels: int = 1000,     # mai puțini pixeli
         presence_timeout: float = 3.0,
+        camera: Optional[CameraService] = None,
+        fps: float = 5.0,
+        frame_size: tuple = (320, 240),
     ):
         self.camera_index = camera_index
         self.motion_threshold = motion_threshold
         self.min_changed_pixels = min_changed_pixels
         self.presence_timeout = presence_timeout
+        self.camera = camera or get_camera_service()
+        self.fps = fps
+        self.frame_size = frame_size
 
-        self._capture = None
+        self._subscription = None
         self._thread = None
         self._running = False
 
@@ -28,11 +43,12 @@ class PresenceDetector:
         if self._running:
             return
 
-        self._capture = cv2.VideoCapture(self.camera_index)
-        if not self._capture.isOpened():
-            raise RuntimeError(f"Nu pot deschide camera cu index {self.camera_index}")
+        self.camera.start()
 
-        print("[PresenceDetector] Camera deschisă OK")
+        self._subscription = self.camera.bus.subscribe(
+            "presence", fps=self.fps, size=self.frame_size
+        )
+        print("[PresenceDetector] Abonat la camera comună OK")
 
         self._running = True
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
@@ -50,12 +66,9 @@ class PresenceDetector:
             self._thread.join(timeout=1.0)
             self._thread = None
 
-        if self._capture is not None:
-            try:
-                self._capture.release()
-            except Exception:
-                pass
-            self._capture = None
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
 
         print("[PresenceDetector] Oprit.")
 
@@ -63,14 +76,17 @@ class PresenceDetector:
         prev_gray = None
 
         while self._running:
-            ret, frame = self._capture.read()
-            if not ret or frame is None:
-                print("[PresenceDetector] Frame invalid, aștept...")
-                time.sleep(0.1)
+            subscription = self._subscription
+            frame = subscription.wait(timeout=1.0) if subscription is not None else None
+            if frame is None:
+                if self._running:
+                    print("[PresenceDetector] Niciun frame, aștept...")
+                    time.sleep(0.1)
                 continue
 
-            frame_small = cv2.resize(frame, (320, 240))
-            gray = cv2.cvtColor(frame_small, cv2.COLOR_BGR2GRAY)
+            # Frame-ul vine deja la 320x240 din bus (redimensionare partajată);
+            # pentru YUV420 gray() e direct planul Y
+            gray = frame.gray()
             gray = cv2.GaussianBlur(gray, (5, 5), 0)
 
             if prev_gray is not None:
@@ -90,7 +106,6 @@ class PresenceDetector:
                         self._person_present = True
 
             prev_gray = gray
-            time.sleep(0.05)
 
 
 if __name__ == "__main__":
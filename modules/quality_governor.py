@@ -0,0 +1,107 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class QualityTier:
+    """O treaptă de calitate a detecției mâinilor."""
+
+    name: str
+    # model_complexity pentru MediaPipe Hands (1 = complet, 0 = lite)
+    model_complexity: int
+    # Rezoluția la care intră frame-urile în detecție (None = rezoluția fluxului)
+    frame_size: Optional[Tuple[int, int]]
+    # Câte frame-uri se sar între două procesate în modul streaming
+    frame_skip: int
+
+
+# De la calitatea maximă (Pi 5) la cea mai ieftină (Pi 3)
+DEFAULT_TIERS = (
+    QualityTier("maximă", 1, None, 0),
+    QualityTier("ridicată", 0, None, 0),
+    QualityTier("medie", 0, (480, 360), 0),
+    QualityTier("scăzută", 0, (320, 240), 1),
+    QualityTier("minimă", 0, (256, 192), 2),
+)
+
+
+class QualityGovernor:
+    """
+    Adaptează calitatea detecției la puterea dispozitivului.
+
+    Măsoară timpul de inferență per frame și, pe o fereastră glisantă, compară
+    percentila 90 cu bugetul de latență: peste buget coboară o treaptă, iar dacă rămâne
+    mult sub buget (headroom) urcă una. După fiecare schimbare urmează o pauză
+    (cooldown), ca măsurătorile să reflecte noile setări.
+    """
+
+    def __init__(
+        self,
+        budget_ms: float = 66.0,
+        tiers: Sequence[QualityTier] = DEFAULT_TIERS,
+        window: int = 20,
+        headroom: float = 0.5,
+        cooldown: int = 30,
+        start_tier: int = 0,
+    ):
+        self.budget_ms = budget_ms
+        self.tiers = list(tiers)
+        self.window = window
+        self.headroom = headroom
+        self.cooldown = cooldown
+
+        self._index = max(0, min(start_tier, len(self.tiers) - 1))
+        self._samples = deque(maxlen=window)
+        self._cooldown_left = 0
+        self._frame_counter = 0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[QualityTier], None]] = []
+
+    @property
+    def tier(self) -> QualityTier:
+        return self.tiers[self._index]
+
+    @property
+    def tier_index(self) -> int:
+        return self._index
+
+    def add_listener(self, callback: Callable[[QualityTier], None]):
+        """callback(tier) la fiecare schimbare de treaptă (apelat pe thread-ul detecției)."""
+        self._listeners.append(callback)
+
+    def should_process(self) -> bool:
+        """False pentru frame-urile care trebuie sărite în treapta curentă."""
+        with self._lock:
+            self._frame_counter += 1
+            return self._frame_counter % (self.tier.frame_skip + 1) == 0
+
+    def record(self, latency_ms: float) -> bool:
+        """Înregistrează durata unui frame; returnează True dacă s-a schimbat treapta."""
+        with self._lock:
+            if self._cooldown_left > 0:
+                self._cooldown_left -= 1
+                return False
+            self._samples.append(latency_ms)
+            if len(self._samples) < self.window:
+                return False
+
+            p90 = float(np.percentile(self._samples, 90))
+            if p90 > self.budget_ms and self._index < len(self.tiers) - 1:
+                self._index += 1
+            elif p90 < self.budget_ms * self.headroom and self._index > 0:
+                self._index -= 1
+            else:
+                return False
+
+            self._samples.clear()
+            self._cooldown_left = self.cooldown
+            tier = self.tier
+            print(f"[QualityGovernor] p90 {p90:.0f} ms (buget {self.budget_ms:.0f} ms) -> treapta {tier.name}")
+
+        for callback in list(self._listeners):
+            callback(tier)
+        return True
@@ -1,22 +1,50 @@
+import importlib.util
+import os
 import random
+import threading
 import time
-import subprocess
-import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
 import cv2
 import numpy as np
 
-try:
-    import mediapipe as mp
-    MEDIAPIPE_AVAILABLE = True
-except ImportError:
-    MEDIAPIPE_AVAILABLE = False
+from modules.camera_service import CameraService, get_camera_service
+from modules.fallback_hand_detector import FallbackHandDetector
+from modules.frame_bus import Frame
+from modules.gesture_classifier import (
+    DEFAULT_MODEL_PATH,
+    GestureClassifier,
+    count_fingers,
+    landmark_array,
+    landmark_features,
+)
+from modules.gesture_tracker import GestureTracker
+from modules.quality_governor import QualityGovernor, QualityTier
+from modules.rps_references import REFERENCE_SIZE, ReferenceHistogramIndex, histogram_vector
+
+# MediaPipe se importă abia la warm_up() (importul și construirea grafului durează
+# secunde pe Pi); aici verificăm doar că pachetul există
+mp = None
+MEDIAPIPE_AVAILABLE = importlib.util.find_spec("mediapipe") is not None
+if not MEDIAPIPE_AVAILABLE:
     print("MediaPipe nu este instalat. Folosind metoda alternativă.")
 
 
+def _import_mediapipe():
+    """Importă mediapipe la prima nevoie; returnează modulul sau None."""
+    global mp, MEDIAPIPE_AVAILABLE
+    if mp is None and MEDIAPIPE_AVAILABLE:
+        try:
+            import mediapipe
+            mp = mediapipe
+        except ImportError as exc:
+            MEDIAPIPE_AVAILABLE = False
+            print(f"MediaPipe nu a putut fi importat ({exc}). Folosind metoda alternativă.")
+    return mp
+
+
 class RPSCameraGame:
     """
     Joc piatră-foarfecă-hârtie folosind AI pentru recunoașterea semnelor:
@@ -28,99 +56,251 @@ class RPSCameraGame:
     """
 
     MOVES = ["piatră", "foarfecă", "hârtie"]
+
+    # Rafala din jurul momentului deciziei: câte frame-uri și bugetul întregii decizii
+    # (secunde de la momentul deciziei, incluzând așteptarea votului din streaming)
+    BURST_FRAMES = 5
+    BURST_BUDGET = 0.3
+    # Scorul de la care un gest e considerat sigur (rafala se poate opri mai devreme)
+    CONFIDENT_SCORE = 0.8
+    # Sub această încredere a clasificatorului se decide după numărul de degete
+    CLASSIFIER_MIN_CONFIDENCE = 0.6
+    # Modul streaming: rata cu care se urmăresc mâinile în timpul countdown-ului și cât
+    # se așteaptă după momentul deciziei ca votul să se stabilizeze (secunde, din
+    # BURST_BUDGET; restul bugetului rămâne pentru rafală)
+    STREAM_FPS = 20
+    STREAM_SETTLE_TIMEOUT = 0.15
     
-    def __init__(self):
+    def __init__(self, camera: Optional[CameraService] = None, split_halves: Optional[bool] = None):
+        """
+        Args:
+            split_halves: împarte frame-ul în jumătatea stângă (jucătorul 1) și dreaptă
+                (jucătorul 2), fiecare cu propriul graf Hands (max_num_hands=1), rulate în
+                paralel. Implicit din RPS_SPLIT_HALVES=1.
+        """
+        # Sesiunea de cameră comună (backend-ul rămâne deschis între capturi)
+        self.camera = camera or get_camera_service()
+        if split_halves is None:
+            split_halves = os.environ.get("RPS_SPLIT_HALVES", "0") == "1"
+        self.split_halves = split_halves
         self.reference_images_dir = Path("assets/rps_references")
         self.reference_images_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Inițializează MediaPipe dacă e disponibil
-        if MEDIAPIPE_AVAILABLE:
-            self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=2,
+
+        # Graful MediaPipe, referințele și clasificatorul se încarcă în warm_up(), pe un
+        # thread de fundal; până atunci detecția folosește metoda alternativă
+        self.hands = None
+        self.half_hands = []
+        # Grafuri separate, în modul imagine statică, pentru rafala de la momentul deciziei
+        # (tot frame-ul, respectiv câte unul per jumătate în modul pe jumătăți)
+        self.still_hands = None
+        self.still_half_hands = []
+        self._still_lock = threading.Lock()
+        self._half_locks = []
+        self._still_half_locks = []
+        self._half_pool = None
+        self.reference_index = ReferenceHistogramIndex(self.reference_images_dir, self.MOVES)
+        self.gesture_classifier = None
+        # Detectorul fără MediaPipe (fundal MOG2 + piele), învățat din fluxul live
+        self.fallback_detector = FallbackHandDetector()
+        # Setat după warm_up(); ecranul RPS îl poate aștepta
+        self.ready = threading.Event()
+        self._warm_up_lock = threading.Lock()
+
+        # Calitatea detecției se adaptează la bugetul de latență (RPS_LATENCY_BUDGET_MS)
+        self.governor = QualityGovernor(budget_ms=float(os.environ.get("RPS_LATENCY_BUDGET_MS", "66")))
+        self.mp_hands = None
+        self._model_complexity: Optional[int] = None
+        # Setat când governor-ul schimbă treapta; grafurile se reconstruiesc o singură dată,
+        # între frame-urile streaming-ului (sau la pregătirea rundei), nu în mijlocul detecției
+        self._tier_changed = threading.Event()
+        self._rebuild_lock = threading.Lock()
+
+        # Urmărirea mâinilor pe fluxul continuu (vezi start_streaming)
+        self.tracker = GestureTracker()
+        self._hands_lock = threading.Lock()
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_stop = threading.Event()
+
+    def warm_up(self):
+        """
+        Importă MediaPipe, construiește grafurile Hands și încarcă referințele și
+        clasificatorul. Se apelează o dată în fundal, după ce UI-ul e pe ecran; apelurile
+        ulterioare (sau concurente) doar așteaptă să se termine prima inițializare.
+        """
+        if self.ready.is_set():
+            return
+        with self._warm_up_lock:
+            if self.ready.is_set():
+                return
+            started = time.monotonic()
+
+            # Inițializează MediaPipe dacă e disponibil
+            if _import_mediapipe() is not None:
+                self.mp_hands = mp.solutions.hands
+                self._build_hands(self.governor.tier.model_complexity)
+
+            # Încarcă pozele de referință dacă există
+            self._load_reference_images()
+
+            # Clasificatorul pe landmark-uri (python -m modules.rps_reference_cli build); fără el
+            # se folosesc histogramele de culoare
+            classifier = GestureClassifier.load(self.reference_images_dir / DEFAULT_MODEL_PATH.name)
+            if classifier is not None and classifier.moves != self.MOVES:
+                print("[RPS] Modelul de gesturi are alte semne; îl ignor.")
+                classifier = None
+            self.gesture_classifier = classifier
+
+            self.ready.set()
+            print(f"[RPS] Detecția gesturilor e pregătită în {time.monotonic() - started:.1f}s.")
+
+    def _build_hands(self, model_complexity: int):
+        """(Re)construiește grafurile Hands cu model_complexity dat și le înlocuiește pe cele vechi."""
+        def create(max_num_hands: int, static_image_mode: bool = False):
+            return self.mp_hands.Hands(
+                static_image_mode=static_image_mode,
+                max_num_hands=max_num_hands,
+                model_complexity=model_complexity,
                 min_detection_confidence=0.7,
                 min_tracking_confidence=0.5
             )
-            self.mp_drawing = mp.solutions.drawing_utils
-        else:
-            self.hands = None
-        
-        # Încarcă pozele de referință dacă există
-        self._load_reference_images()
+
+        hands = create(2)
+        # Frame-urile rafalei sunt mai vechi decât cele deja trimise de streaming în graful
+        # de tracking (timestamp-urile ar merge înapoi), așa că au graful lor, fără tracking
+        still_hands = create(2, static_image_mode=True)
+        # Modul pe jumătăți: câte un graf cu o singură mână per jucător, pe thread-uri
+        # separate (MediaPipe rulează graful în cod nativ, pe alt nucleu)
+        half_hands = [create(1) for _ in range(2)] if self.split_halves else []
+        still_half_hands = [create(1, static_image_mode=True) for _ in range(2)] if self.split_halves else []
+        if half_hands and self._half_pool is None:
+            self._half_locks = [threading.Lock() for _ in half_hands]
+            self._still_half_locks = [threading.Lock() for _ in still_half_hands]
+            # Câte un worker pentru fiecare graf pe jumătate (streaming-ul și rafala pot rula simultan)
+            self._half_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rps-half")
+
+        # Înlocuirea se face sub lock-uri, ca niciun thread să nu folosească un graf închis
+        locks = [self._hands_lock, self._still_lock]
+        if half_hands:
+            locks += self._half_locks + self._still_half_locks
+        for lock in locks:
+            lock.acquire()
+        try:
+            old = [self.hands, self.still_hands] + list(self.half_hands) + list(self.still_half_hands)
+            self.hands, self.still_hands = hands, still_hands
+            self.half_hands, self.still_half_hands = half_hands, still_half_hands
+            self._model_complexity = model_complexity
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        for graph in old:
+            if graph is not None:
+                graph.close()
+
+    def _apply_quality_tier(self):
+        """
+        Aplică treapta curentă a governor-ului dacă s-a schimbat (rezoluția și frame skip
+        se citesc la fiecare frame; doar model_complexity cere reconstruirea grafurilor).
+        """
+        if not self._tier_changed.is_set():
+            return
+        with self._rebuild_lock:
+            self._tier_changed.clear()
+            tier = self.governor.tier
+            if self.mp_hands is not None and tier.model_complexity != self._model_complexity:
+                self._build_hands(tier.model_complexity)
+
+    @property
+    def quality_tier(self) -> QualityTier:
+        """Treapta de calitate curentă a detecției (pentru afișare în UI)."""
+        return self.governor.tier
 
     def _load_reference_images(self):
-        """Încarcă pozele de referință pentru fiecare semn."""
-        self.reference_images = {
-            "piatră": [],
-            "foarfecă": [],
-            "hârtie": []
-        }
-        
-        for move in self.MOVES:
-            ref_dir = self.reference_images_dir / move
-            if ref_dir.exists():
-                for img_path in ref_dir.glob("*.jpg"):
-                    img = cv2.imread(str(img_path))
-                    if img is not None:
-                        self.reference_images[move].append(img)
-
-    def _capture_frame_rpicam(self) -> np.ndarray:
         """
-        Capturează un frame folosind rpicam-still pentru captură statică.
-        Returnează imaginea ca numpy array (BGR pentru OpenCV).
+        Încarcă histogramele pozelor de referință pentru fiecare semn, ca o singură matrice.
+        Se calculează o singură dată și se păstrează în cache pe disc (cheiat după cale și mtime).
         """
-        temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-        temp_path = temp_file.name
-        temp_file.close()
-        
+        self.reference_index = ReferenceHistogramIndex(self.reference_images_dir, self.MOVES).load()
+
+    def prepare_capture(self, stream: bool = True):
+        """
+        Pornește fluxul camerei din timp (ex. la începutul countdown-ului) și, dacă
+        stream=True, urmărirea continuă a mâinilor.
+        """
+        self.camera.start()
+        self.warm_up()
+        self._apply_quality_tier()
+        if stream:
+            self.start_streaming()
+
+    def start_streaming(self, fps: Optional[float] = None):
+        """
+        Modul streaming: frame-uri consecutive din bus intră în Hands.process (graful
+        rămâne în modul tracking, mult mai ieftin decât detecția completă a palmei), iar
+        fiecare mână are un track cu vot majoritar pe o fereastră glisantă.
+
+        Fără MediaPipe, același flux alimentează modelul de fundal al detectorului alternativ.
+        """
+        self.warm_up()
+        if self.is_streaming():
+            return
+
+        self.camera.start()
+        self.tracker.reset()
+        self._stream_stop = threading.Event()
+        subscription = self.camera.bus.subscribe("rps-stream", fps=fps or self.STREAM_FPS)
+        self._stream_thread = threading.Thread(
+            target=self._stream_loop,
+            args=(subscription, self._stream_stop),
+            daemon=True,
+        )
+        self._stream_thread.start()
+
+    def stop_streaming(self):
+        """Oprește urmărirea continuă (thread-ul iese după frame-ul curent)."""
+        self._stream_stop.set()
+        self._stream_thread = None
+
+    def is_streaming(self) -> bool:
+        thread = self._stream_thread
+        return thread is not None and thread.is_alive() and not self._stream_stop.is_set()
+
+    def _stream_loop(self, subscription, stop: threading.Event):
         try:
-            # Șterge fișierul dacă există pentru a forța o captură nouă
-            if os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-            
-            cmd = [
-                "rpicam-still",
-                "--timeout", "1000",  # 1 secundă
-                "--output", temp_path,
-                "--width", "640",
-                "--height", "480",
-                "--nopreview"
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            # Așteaptă puțin pentru a se asigura că fișierul este scris complet
-            time.sleep(0.2)
-            
-            # Verifică dacă fișierul a fost creat chiar dacă returncode nu este 0
-            if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
-                raise RuntimeError(f"rpicam-still nu a creat fișierul sau este gol. stderr: {result.stderr}")
-            
-            frame = cv2.imread(temp_path)
-            if frame is None:
-                raise RuntimeError("Nu am putut citi imaginea capturată.")
-            
-            return frame
-            
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("Timeout la capturarea frame-ului cu rpicam-still.")
-        except Exception as e:
-            raise RuntimeError(f"Eroare la capturarea frame-ului: {e}")
+            while not stop.is_set():
+                frame = subscription.wait(timeout=0.2)
+                if frame is None or stop.is_set():
+                    continue
+                # Reconstruirea cerută de governor se face aici, între frame-uri
+                self._apply_quality_tier()
+                # Treptele de calitate scăzută procesează doar unul din N frame-uri
+                if not self.governor.should_process():
+                    continue
+                self.tracker.update(self._detect_hands(frame), frame.timestamp)
+        except Exception as exc:
+            print(f"[RPS] Urmărirea mâinilor s-a oprit: {exc}")
         finally:
-            if os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+            subscription.close()
+
+    def _stable_moves(self, target_time: float, timeout: float) -> List[Optional[Tuple[str, float]]]:
+        """
+        Gesturile jucătorilor din track-uri, folosind doar voturile de după target_time.
+        Se întoarce imediat ce ambele mâini au un vot stabil; la timeout se ia votul
+        majoritar curent, chiar dacă nu e încă stabil.
+        """
+        gestures = self.tracker.wait_stable(hands=2, since=target_time, timeout=timeout)
+        if len(gestures) < 2:
+            gestures = self.tracker.current(since=target_time, stable_only=False) or gestures
+        return self._assign_players(gestures)
+
+    def _latest_frame(self) -> Frame:
+        """
+        Returnează cel mai nou frame din serviciul de cameră (sesiune deja deschisă).
+        Frame-ul rămâne în formatul nativ; gray()/bgr() convertesc doar la nevoie.
+        """
+        frame = self.camera.get_latest_frame()
+        if frame is None:
+            raise RuntimeError("Serviciul de cameră nu a livrat niciun frame.")
+        return frame
 
     def _extract_hand_roi(self, frame: np.ndarray, landmarks, h: int, w: int) -> Optional[np.ndarray]:
         """Extrage regiunea de interes (ROI) pentru o mână."""
@@ -146,210 +326,254 @@ class RPSCameraGame:
             return None
         
         # Redimensionează pentru comparare
-        roi = cv2.resize(roi, (224, 224))
+        roi = cv2.resize(roi, REFERENCE_SIZE)
         return roi
 
-    def _compare_with_references(self, hand_roi: np.ndarray, move: str) -> float:
-        """Compară ROI-ul mâinii cu pozele de referință pentru un semn."""
-        if not self.reference_images[move]:
-            return 0.0
-        
-        best_match = 0.0
-        
-        for ref_img in self.reference_images[move]:
-            # Redimensionează imaginea de referință
-            ref_resized = cv2.resize(ref_img, (224, 224))
-            
-            # Compară folosind histogramă de culori
-            hand_hist = cv2.calcHist([hand_roi], [0, 1, 2], None, [50, 50, 50], [0, 256, 0, 256, 0, 256])
-            ref_hist = cv2.calcHist([ref_resized], [0, 1, 2], None, [50, 50, 50], [0, 256, 0, 256, 0, 256])
-            
-            # Corelație între histograme
-            correlation = cv2.compareHist(hand_hist, ref_hist, cv2.HISTCMP_CORREL)
-            best_match = max(best_match, correlation)
-        
-        return best_match
+    def _compare_with_references(self, hand_rois: List[np.ndarray]) -> np.ndarray:
+        """
+        Compară toate ROI-urile de mâini cu toate pozele de referință deodată.
+        Returnează matricea (mâini x MOVES) cu cea mai bună corelație pe semn.
+        """
+        if not hand_rois:
+            return np.zeros((0, len(self.MOVES)), dtype=np.float32)
+        hand_vectors = np.stack([histogram_vector(roi) for roi in hand_rois])
+        return self.reference_index.score(hand_vectors)
 
-    def _detect_gesture_mediapipe(self, frame: np.ndarray) -> List[Tuple[str, float]]:
+    def _detect_gesture_mediapipe(self, frame: np.ndarray, still: bool = False) -> List[Tuple[str, float]]:
         """Detectează gesturile folosind MediaPipe și compară cu referințele."""
+        return [(move, score) for move, score, _ in self._detect_hands_mediapipe(frame, still=still)]
+
+    def _detect_hands_mediapipe(
+        self, frame: np.ndarray, half: Optional[int] = None, still: bool = False
+    ) -> List[Tuple[str, float, float]]:
+        """
+        Ca _detect_gesture_mediapipe, dar întoarce și poziția fiecărei mâini:
+        (semn, scor, x-ul centrului mâinii normalizat în [0, 1]).
+
+        Args:
+            half: 0/1 pentru grafurile modului pe jumătăți; None = graful pe tot frame-ul.
+            still: folosește grafurile în modul imagine statică (still_hands /
+                still_half_hands), pentru frame-uri care nu continuă fluxul deja urmărit.
+        """
         if not MEDIAPIPE_AVAILABLE or not self.hands:
             return []
         
         h, w, _ = frame.shape
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
+        # Graful MediaPipe nu e thread-safe (streaming-ul și rafala îl pot folosi simultan);
+        # se alege sub lock, ca o reconstruire (governor) să nu-l închidă între timp
+        if half is not None:
+            lock = (self._still_half_locks if still else self._half_locks)[half]
+        else:
+            lock = self._still_lock if still else self._hands_lock
+        with lock:
+            if half is not None:
+                hands = (self.still_half_hands if still else self.half_hands)[half]
+            else:
+                hands = self.still_hands if still else self.hands
+            results = hands.process(rgb_frame)
         
         detected_gestures = []
-        
-        if results.multi_hand_landmarks:
+        if not results.multi_hand_landmarks:
+            return detected_gestures
+
+        hands = []
+        if self.gesture_classifier is not None:
+            # Clasificator pe geometria landmark-urilor: fără crop, resize sau histograme
+            for hand_landmarks in results.multi_hand_landmarks:
+                points = landmark_array(hand_landmarks)
+                move, confidence = self.gesture_classifier.predict(landmark_features(points))
+                hands.append((points, move, confidence))
+        else:
+            # Extrage ROI-urile tuturor mâinilor, apoi le compară cu referințele într-un singur pas
+            rois = []
             for hand_landmarks in results.multi_hand_landmarks:
-                # Extrage ROI pentru mână
                 hand_roi = self._extract_hand_roi(frame, hand_landmarks, h, w)
-                if hand_roi is None:
-                    continue
-                
-                # Numără degetele ridicate
-                finger_count = self._count_fingers_from_landmarks(hand_landmarks, h, w)
-                
-                # Compară cu pozele de referință
-                best_move = None
-                best_score = 0.0
-                
-                for move in self.MOVES:
-                    score = self._compare_with_references(hand_roi, move)
-                    if score > best_score:
-                        best_score = score
-                        best_move = move
-                
-                # Verifică și cu numărul de degete
-                if finger_count == 0 or finger_count == 1:
-                    if best_move != "piatră" or best_score < 0.3:
-                        best_move = "piatră"
-                        best_score = 0.5
-                elif finger_count == 2:
-                    if best_move != "foarfecă" or best_score < 0.3:
-                        best_move = "foarfecă"
-                        best_score = 0.5
-                elif finger_count >= 4:
-                    if best_move != "hârtie" or best_score < 0.3:
-                        best_move = "hârtie"
-                        best_score = 0.5
-                
-                if best_move and best_score > 0.2:
-                    detected_gestures.append((best_move, best_score))
-        
-        return detected_gestures
+                if hand_roi is not None:
+                    rois.append((landmark_array(hand_landmarks), hand_roi))
+            scores = self._compare_with_references([roi for _, roi in rois])
+            for (points, _), hand_scores in zip(rois, scores):
+                best_index = int(np.argmax(hand_scores))
+                best_score = float(hand_scores[best_index])
+                hands.append((points, self.MOVES[best_index] if best_score > 0 else None, best_score))
 
-    def _count_fingers_from_landmarks(self, landmarks, h: int, w: int) -> int:
-        """Numără degetele ridicate folosind landmark-urile MediaPipe."""
-        # Puncte cheie pentru degete
-        finger_tips = [4, 8, 12, 16, 20]  # Deget mare, arătător, mijlociu, inelar, mic
-        finger_pips = [3, 6, 10, 14, 18]  # Articulații pentru degete
-        
-        fingers_up = 0
-        
-        # Deget mare (verificare specială - stânga/dreapta)
-        if landmarks.landmark[4].x > landmarks.landmark[3].x:
-            fingers_up += 1
-        
-        # Celelalte 4 degete (verificare sus/jos)
-        for i in range(1, 5):
-            if landmarks.landmark[finger_tips[i]].y < landmarks.landmark[finger_pips[i]].y:
-                fingers_up += 1
-        
-        return fingers_up
+        for points, best_move, best_score in hands:
+            center_x = float(points[:, 0].mean())
+            if self.gesture_classifier is not None and best_score >= self.CLASSIFIER_MIN_CONFIDENCE:
+                detected_gestures.append((best_move, best_score, center_x))
+                continue
 
-    def _detect_gesture_fallback(self, frame: np.ndarray) -> List[Tuple[str, float]]:
-        """Metodă alternativă de detectare când MediaPipe nu e disponibil."""
-        # Folosește metoda veche de numărare degete
-        finger_count = self._count_fingers_advanced(frame)
-        
-        if finger_count == 0 or finger_count == 1:
-            return [("piatră", 0.6)]
-        elif finger_count == 2:
-            return [("foarfecă", 0.6)]
-        elif finger_count >= 4:
-            return [("hârtie", 0.6)]
-        else:
-            return [("piatră", 0.4)]  # Default
+            # Verifică și cu numărul de degete
+            finger_count = count_fingers(points)
+            if finger_count == 0 or finger_count == 1:
+                if best_move != "piatră" or best_score < 0.3:
+                    best_move = "piatră"
+                    best_score = 0.5
+            elif finger_count == 2:
+                if best_move != "foarfecă" or best_score < 0.3:
+                    best_move = "foarfecă"
+                    best_score = 0.5
+            elif finger_count >= 4:
+                if best_move != "hârtie" or best_score < 0.3:
+                    best_move = "hârtie"
+                    best_score = 0.5
 
-    def _count_fingers_advanced(self, frame) -> int:
-        """Numără degetele folosind metoda veche (fallback)."""
-        h, w, _ = frame.shape
-        cx, cy = w // 2, h // 2
-        size = min(h, w) // 3
-        roi = frame[max(0, cy - size):min(h, cy + size), 
-                    max(0, cx - size):min(w, cx + size)]
-        
-        if roi.size == 0:
-            return 0
-
-        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-        blur = cv2.GaussianBlur(gray, (5, 5), 0)
-        _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        thresh = cv2.bitwise_not(thresh)
-
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        if not contours:
-            return 0
-
-        max_contour = max(contours, key=cv2.contourArea)
-        if cv2.contourArea(max_contour) < 3000:
-            return 0
-
-        hull = cv2.convexHull(max_contour, returnPoints=False)
-        if hull is None or len(hull) < 3:
-            return 0
-
-        defects = cv2.convexityDefects(max_contour, hull)
-        if defects is None:
-            return 0
-
-        finger_count = 0
-        for i in range(defects.shape[0]):
-            s, e, f, d = defects[i, 0]
-            start = tuple(max_contour[s][0])
-            end = tuple(max_contour[e][0])
-            far = tuple(max_contour[f][0])
-            
-            a = np.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2)
-            b = np.sqrt((far[0] - start[0])**2 + (far[1] - start[1])**2)
-            c = np.sqrt((end[0] - far[0])**2 + (end[1] - far[1])**2)
-            
-            angle = np.arccos((b**2 + c**2 - a**2) / (2 * b * c + 1e-6))
-            
-            if angle <= np.pi / 2 and d > 15000:
-                finger_count += 1
+            if best_move and best_score > 0.2:
+                detected_gestures.append((best_move, best_score, center_x))
+
+        return detected_gestures
 
-        return finger_count
+    def _detect_gesture_fallback(self, frame: np.ndarray) -> List[Tuple[str, float]]:
+        """Metodă alternativă de detectare când MediaPipe nu e disponibil."""
+        return [(move, score) for move, score, _ in self.fallback_detector.detect(frame)]
 
     def _warm_capture(self, attempts: int = 2, delay: float = 0.5):
         """Face mai multe încercări de captură."""
         for attempt in range(attempts):
             try:
-                frame = self._capture_frame_rpicam()
-                if frame is not None and frame.size > 0:
+                frame = self._latest_frame()
+                if frame is not None and frame.image.size > 0:
                     return frame
-            except subprocess.TimeoutExpired:
-                if attempt == attempts - 1:
-                    raise RuntimeError("Timeout la capturarea imaginii.")
-                time.sleep(delay)
-            except Exception as e:
+            except Exception:
                 if attempt == attempts - 1:
                     raise
                 time.sleep(delay)
         return None
 
-    def play_round_two_players(self, camera_index: int = 0) -> Dict:
+    def _detect_hands_split(self, frame: np.ndarray, still: bool = False) -> List[Tuple[str, float, float]]:
+        """
+        Rulează în paralel câte un graf Hands pe jumătatea stângă și pe cea dreaptă a
+        frame-ului. Pozițiile se raportează la tot frame-ul, deci jucătorul 1 rămâne
+        mereu în stânga și jucătorul 2 în dreapta. Cu still=True se folosesc grafurile
+        fără tracking.
+        """
+        w = frame.shape[1]
+        middle = w // 2
+        halves = [(frame[:, :middle], 0), (frame[:, middle:], middle)]
+        futures = [
+            self._half_pool.submit(self._detect_hands_mediapipe, half, index, still)
+            for index, (half, _) in enumerate(halves)
+        ]
+
+        detected = []
+        for (half, offset), future in zip(halves, futures):
+            for move, score, center_x in future.result():
+                detected.append((move, score, (offset + center_x * half.shape[1]) / w))
+        return detected
+
+    def _detect_hands(self, frame: Frame, still: bool = False) -> List[Tuple[str, float, Optional[float]]]:
+        """
+        Gesturile dintr-un frame, cu poziția mâinii (None când metoda nu o cunoaște).
+        Frame-ul se micșorează la rezoluția treptei curente, iar durata detecției
+        ajunge la governor (o schimbare de treaptă doar se marchează, vezi
+        _apply_quality_tier). Cu still=True frame-ul trece prin graful fără tracking.
+        """
+        tier = self.governor.tier
+        if tier.frame_size is not None and frame.size[0] > tier.frame_size[0]:
+            frame = self.camera.bus.resized(frame, tier.frame_size)
+
+        started = time.perf_counter()
+        hands = self._run_detector(frame.bgr(), still)
+        if self.governor.record((time.perf_counter() - started) * 1000.0):
+            self._tier_changed.set()
+        return hands
+
+    def _run_detector(self, image: np.ndarray, still: bool = False) -> List[Tuple[str, float, Optional[float]]]:
+        if MEDIAPIPE_AVAILABLE and self.half_hands:
+            return self._detect_hands_split(image, still)
+        if MEDIAPIPE_AVAILABLE and self.hands:
+            return self._detect_hands_mediapipe(image, still=still)
+        # Modelul de fundal e comun streaming-ului și rafalei
+        with self._hands_lock:
+            return self.fallback_detector.detect(image)
+
+    @staticmethod
+    def _assign_players(hands: List[Tuple[str, float, Optional[float]]]) -> List[Optional[Tuple[str, float]]]:
+        """
+        Împarte mâinile pe jucători după poziție: jucătorul 1 în stânga imaginii,
+        jucătorul 2 în dreapta (stabil de la un frame la altul, spre deosebire de
+        ordinea în care MediaPipe întoarce mâinile).
+        """
+        players: List[Optional[Tuple[str, float]]] = [None, None]
+        hands = sorted(hands, key=lambda hand: hand[1], reverse=True)[:2]
+
+        if len(hands) == 2 and all(hand[2] is not None for hand in hands):
+            left, right = sorted(hands, key=lambda hand: hand[2])
+            return [left[:2], right[:2]]
+
+        for move, score, center_x in hands:
+            slot = 0 if center_x is None or center_x < 0.5 else 1
+            if players[slot] is None:
+                players[slot] = (move, score)
+            elif players[1 - slot] is None:
+                players[1 - slot] = (move, score)
+        return players
+
+    def _best_moves(self, frames: List[Frame], deadline: Optional[float] = None) -> List[Optional[Tuple[str, float]]]:
+        """
+        Rulează detecția pe frame-uri în ordine cronologică, prin graful fără tracking
+        (streaming-ul poate fi deja trecut de ele), și păstrează, pentru fiecare jucător,
+        gestul cu cel mai mare scor. Se oprește la deadline (time.monotonic()) sau când ambii jucători
+        au deja un gest sigur.
+        """
+        best: List[Optional[Tuple[str, float]]] = [None, None]
+        for index, frame in enumerate(frames):
+            if index > 0 and deadline is not None and time.monotonic() >= deadline:
+                break
+            for player, found in enumerate(self._assign_players(self._detect_hands(frame, still=True))):
+                if found is not None and (best[player] is None or found[1] > best[player][1]):
+                    best[player] = found
+            if all(move is not None and move[1] >= self.CONFIDENT_SCORE for move in best):
+                break
+        return best
+
+    def play_round_two_players(self, camera_index: int = 0, target_time: Optional[float] = None) -> Dict:
         """
         Joacă o rundă între 2 jucători.
         Detectează 2 mâini simultan și compară semnele.
+
+        Args:
+            target_time: momentul deciziei (time.time(), ex. când countdown-ul ajunge la 0).
+                În modul streaming se folosește votul track-urilor de după acest moment;
+                altfel (sau pentru jucătorii încă nedetectați) se analizează o rafală de
+                BURST_FRAMES frame-uri din jurul lui și se alege pentru fiecare jucător
+                gestul cel mai sigur. Ambii pași împart termenul target_time + BURST_BUDGET.
         """
         try:
-            # Capturează frame
-            frame = self._warm_capture()
-            if frame is None:
-                raise RuntimeError("Nu am putut citi un frame de la cameră.")
-
-            # Detectează gesturile
-            if MEDIAPIPE_AVAILABLE and self.hands:
-                gestures = self._detect_gesture_mediapipe(frame)
-            else:
-                gestures = self._detect_gesture_fallback(frame)
-
-            # Trebuie să detectăm exact 2 mâini
-            if len(gestures) < 2:
-                # Dacă detectăm doar o mână, o folosim pentru ambele (test)
-                if len(gestures) == 1:
-                    player1_move = gestures[0][0]
-                    player2_move = random.choice(self.MOVES)  # Fallback
+            self.warm_up()
+            deadline = None
+            if target_time is not None:
+                deadline = time.monotonic() + max(0.0, target_time + self.BURST_BUDGET - time.time())
+
+            player1 = player2 = None
+            if target_time is not None and self.is_streaming():
+                settle = min(self.STREAM_SETTLE_TIMEOUT, deadline - time.monotonic())
+                player1, player2 = self._stable_moves(target_time, max(0.0, settle))
+
+            if player1 is None or player2 is None:
+                # Capturează frame-urile
+                if target_time is not None:
+                    frames = self.camera.frames_around(
+                        target_time,
+                        count=self.BURST_FRAMES,
+                        after=self.BURST_FRAMES // 2,
+                        timeout=max(0.0, min(self.BURST_BUDGET / 3, deadline - time.monotonic())),
+                    )
                 else:
-                    player1_move = random.choice(self.MOVES)
-                    player2_move = random.choice(self.MOVES)
-            else:
-                # Avem 2 mâini detectate
-                player1_move = gestures[0][0]
-                player2_move = gestures[1][0]
+                    frame = self._warm_capture()
+                    frames = [frame] if frame is not None else []
+                if not frames:
+                    raise RuntimeError("Nu am putut citi un frame de la cameră.")
+
+                burst1, burst2 = self._best_moves(frames, deadline)
+                player1 = player1 or burst1
+                player2 = player2 or burst2
+
+            # Fallback aleator doar dacă un jucător nu a apărut în niciun frame
+            if player1 is None or player2 is None:
+                print("[RPS] Mână nedetectată; folosesc un semn aleator.")
+            player1_move = player1[0] if player1 is not None else random.choice(self.MOVES)
+            player2_move = player2[0] if player2 is not None else random.choice(self.MOVES)
 
             # Determină câștigătorul
             result = self._winner(player1_move, player2_move)
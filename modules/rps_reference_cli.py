@@ -0,0 +1,261 @@
+"""
+Unealtă în linie de comandă pentru pozele de referință RPS (assets/rps_references).
+
+  record  - înregistrează exemple etichetate de la cameră (orice backend, vezi
+            CAMERA_BACKEND) sau dintr-un fișier video; decupează mâinile cu MediaPipe
+            și sare peste aproape-duplicate (hash perceptual).
+  dedup   - elimină aproape-duplicatele dintr-un set existent.
+  build   - calculează într-o singură trecere, pe un pool de procese, histogramele
+            (cache-ul .histograms.npz) și clasificatorul pe landmark-uri (gesture_model.npz),
+            ca kiosk-ul să nu le mai calculeze la pornire.
+
+Exemple:
+    python -m modules.rps_reference_cli record piatră --count 40
+    python -m modules.rps_reference_cli record hârtie --video hartie.mp4
+    python -m modules.rps_reference_cli dedup --dry-run
+    python -m modules.rps_reference_cli build --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from modules.gesture_classifier import (
+    DEFAULT_MODEL_PATH,
+    GestureClassifier,
+    landmark_array,
+    landmark_features,
+)
+from modules.rps_camera_game import RPSCameraGame
+from modules.rps_references import REFERENCE_PATTERNS, REFERENCE_SIZE, ReferenceHistogramIndex, histogram_vector
+
+
+MOVES = RPSCameraGame.MOVES
+DEFAULT_ROOT = Path("assets/rps_references")
+
+
+def perceptual_hash(image: np.ndarray) -> int:
+    """dHash pe 64 de biți: compară luminozitatea pixelilor vecini dintr-o miniatură 9x8."""
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming_distances(hashes: np.ndarray, value: int) -> np.ndarray:
+    """Distanța Hamming dintre value și fiecare hash din array-ul uint64."""
+    if not len(hashes):
+        return np.zeros(0, dtype=np.int64)
+    xor = np.bitwise_xor(hashes, np.uint64(value))
+    return np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def reference_files(folder: Path) -> List[Path]:
+    files = []
+    for pattern in REFERENCE_PATTERNS:
+        files.extend(folder.glob(pattern))
+    return sorted(files)
+
+
+def read_image(path: Path) -> Optional[np.ndarray]:
+    """cv2.imread cu mesaj pentru fișierele care nu pot fi citite (corupte, format necunoscut)."""
+    image = cv2.imread(str(path))
+    if image is None:
+        print(f"[rps_reference_cli] Nu pot citi {path}; îl sar.")
+    return image
+
+
+def crop_hand(frame: np.ndarray, points: np.ndarray, padding: float = 0.2) -> Optional[np.ndarray]:
+    """Decupează mâina după landmark-urile normalizate (21, 2), cu o margine relativă."""
+    h, w = frame.shape[:2]
+    pixels = points * (w, h)
+    x_min, y_min = pixels.min(axis=0)
+    x_max, y_max = pixels.max(axis=0)
+    margin = padding * max(x_max - x_min, y_max - y_min)
+    x0, y0 = int(max(0, x_min - margin)), int(max(0, y_min - margin))
+    x1, y1 = int(min(w, x_max + margin)), int(min(h, y_max + margin))
+    if x1 - x0 < 16 or y1 - y0 < 16:
+        return None
+    return frame[y0:y1, x0:x1].copy()
+
+
+def _open_source(args):
+    from modules.camera_backends import VideoReplayBackend, backend_from_env
+    if args.video:
+        return VideoReplayBackend(args.video, pace=False, loop=False)
+    return backend_from_env(args.width, args.height, args.framerate)
+
+
+def record(args) -> int:
+    import mediapipe as mp
+    from modules.frame_bus import Frame
+
+    folder = Path(args.root) / args.move
+    folder.mkdir(parents=True, exist_ok=True)
+    images = (read_image(path) for path in reference_files(folder))
+    hashes = np.array([perceptual_hash(image) for image in images if image is not None], dtype=np.uint64)
+
+    backend = _open_source(args)
+    backend.open()
+    saved = skipped = seq = 0
+    last_saved = 0.0
+    print(f"[rps_reference_cli] Înregistrez „{args.move}” din {backend.name} în {folder} (Ctrl+C pentru oprire)")
+    try:
+        with mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.6) as hands:
+            while saved < args.count:
+                item = backend.read()
+                if item is None:
+                    break
+                image, timestamp = item
+                seq += 1
+                if timestamp - last_saved < args.interval:
+                    continue
+
+                frame = Frame(seq, timestamp, image, backend.frame_format).bgr()
+                results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                for hand_landmarks in results.multi_hand_landmarks or []:
+                    crop = crop_hand(frame, landmark_array(hand_landmarks))
+                    if crop is None:
+                        continue
+                    value = perceptual_hash(crop)
+                    if np.any(hamming_distances(hashes, value) <= args.threshold):
+                        skipped += 1
+                        continue
+                    hashes = np.append(hashes, np.uint64(value))
+                    path = folder / f"{time.strftime('%Y%m%d_%H%M%S')}_{seq:05d}_{saved:03d}.jpg"
+                    cv2.imwrite(str(path), crop)
+                    saved += 1
+                    last_saved = timestamp
+                    print(f"[rps_reference_cli] {saved}/{args.count} {path.name}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.close()
+    print(f"[rps_reference_cli] {saved} poze salvate, {skipped} aproape-duplicate sărite.")
+    return 0
+
+
+def dedup(args) -> int:
+    removed = 0
+    for move in MOVES:
+        folder = Path(args.root) / move
+        kept = np.zeros(0, dtype=np.uint64)
+        for path in reference_files(folder):
+            image = read_image(path)
+            if image is None:
+                continue
+            value = perceptual_hash(image)
+            if np.any(hamming_distances(kept, value) <= args.threshold):
+                removed += 1
+                print(f"[rps_reference_cli] Duplicat: {path}")
+                if not args.dry_run:
+                    path.unlink()
+                continue
+            kept = np.append(kept, np.uint64(value))
+    verb = "ar fi eliminate" if args.dry_run else "eliminate"
+    print(f"[rps_reference_cli] {removed} aproape-duplicate {verb}.")
+    return 0
+
+
+# Graful MediaPipe al fiecărui proces din pool (creat o singură dată, în initializer)
+_worker_hands = None
+
+
+def _init_worker():
+    global _worker_hands
+    try:
+        import mediapipe as mp
+        _worker_hands = mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1)
+    except ImportError:
+        _worker_hands = None
+
+
+def _describe(path: str) -> Optional[Tuple[str, float, np.ndarray, Optional[np.ndarray]]]:
+    """Lucrul unui proces: (cale, mtime, vector histogramă, trăsături landmark sau None)."""
+    image = read_image(path)
+    if image is None:
+        return None
+    vector = histogram_vector(cv2.resize(image, REFERENCE_SIZE))
+    features = None
+    if _worker_hands is not None:
+        results = _worker_hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        if results.multi_hand_landmarks:
+            features = landmark_features(landmark_array(results.multi_hand_landmarks[0]))
+    return path, os.path.getmtime(path), vector, features
+
+
+def build(args) -> int:
+    root = Path(args.root)
+    jobs = [(move, str(path)) for move in MOVES for path in reference_files(root / move)]
+    if not jobs:
+        print(f"[rps_reference_cli] Nu există poze în {root}.")
+        return 1
+
+    started = time.monotonic()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        described = list(pool.map(_describe, [path for _, path in jobs], chunksize=8))
+
+    precomputed: Dict[str, Tuple[float, np.ndarray]] = {}
+    samples: Dict[str, List[np.ndarray]] = {move: [] for move in MOVES}
+    for (move, _), result in zip(jobs, described):
+        if result is None:
+            continue
+        path, mtime, vector, features = result
+        precomputed[path] = (mtime, vector)
+        if features is not None:
+            samples[move].append(features)
+
+    index = ReferenceHistogramIndex(root, MOVES).load(precomputed=precomputed)
+    print(f"[rps_reference_cli] {len(index)} histograme în {index.cache_path}")
+
+    if any(samples.values()):
+        for move, vectors in samples.items():
+            print(f"[rps_reference_cli] {move}: {len(vectors)} exemple cu landmark-uri")
+        model_path = root / DEFAULT_MODEL_PATH.name
+        GestureClassifier(MOVES, k=args.k).fit(samples).save(model_path)
+        print(f"[rps_reference_cli] Model salvat în {model_path}")
+    else:
+        print("[rps_reference_cli] Fără landmark-uri (MediaPipe lipsă?); modelul nu a fost generat.")
+
+    print(f"[rps_reference_cli] Gata în {time.monotonic() - started:.1f}s.")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Poze de referință pentru piatră-foarfecă-hârtie")
+    parser.add_argument("--root", default=str(DEFAULT_ROOT), help="directorul cu referințe")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="înregistrează exemple etichetate")
+    record_parser.add_argument("move", choices=MOVES)
+    record_parser.add_argument("--count", type=int, default=30, help="câte poze noi să salveze")
+    record_parser.add_argument("--interval", type=float, default=0.3, help="secunde minime între poze")
+    record_parser.add_argument("--threshold", type=int, default=6, help="distanța Hamming maximă a unui duplicat")
+    record_parser.add_argument("--video", help="fișier video în loc de cameră")
+    record_parser.add_argument("--width", type=int, default=640)
+    record_parser.add_argument("--height", type=int, default=480)
+    record_parser.add_argument("--framerate", type=int, default=30)
+    record_parser.set_defaults(handler=record)
+
+    dedup_parser = commands.add_parser("dedup", help="elimină aproape-duplicatele")
+    dedup_parser.add_argument("--threshold", type=int, default=6)
+    dedup_parser.add_argument("--dry-run", action="store_true")
+    dedup_parser.set_defaults(handler=dedup)
+
+    build_parser = commands.add_parser("build", help="precalculează histogramele și modelul")
+    build_parser.add_argument("--workers", type=int, default=os.cpu_count())
+    build_parser.add_argument("-k", type=int, default=5)
+    build_parser.set_defaults(handler=build)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# Dimensiunea la care se compară ROI-urile și numărul de bin-uri pe canal ale histogramei.
+# 16 bin-uri/canal = vectori de 4096 de valori: ~16 KB pe referință, deci și sute de poze
+# pe semn încap într-o matrice mică.
+REFERENCE_SIZE = (224, 224)
+HIST_BINS = 16
+REFERENCE_PATTERNS = ("*.jpg", "*.jpeg", "*.png")
+
+
+def color_histogram(image: np.ndarray) -> np.ndarray:
+    """Histograma 3-D de culoare (BGR) a unei imagini deja redimensionate la REFERENCE_SIZE."""
+    return cv2.calcHist(
+        [image], [0, 1, 2], None,
+        [HIST_BINS, HIST_BINS, HIST_BINS],
+        [0, 256, 0, 256, 0, 256],
+    )
+
+
+def histogram_vector(image: np.ndarray) -> np.ndarray:
+    """
+    Histograma ca vector centrat și normalizat L2: produsul scalar a doi astfel de
+    vectori este exact corelația HISTCMP_CORREL dintre histograme.
+    """
+    vector = color_histogram(image).ravel().astype(np.float32)
+    vector -= vector.mean()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class ReferenceHistogramIndex:
+    """
+    Index al histogramelor pozelor de referință RPS (assets/rps_references/<semn>/*.jpg).
+
+    Histogramele se calculează o singură dată și se salvează într-un fișier cache
+    (.npz) cheiat după calea și mtime-ul fiecărei poze; la repornire se recalculează
+    doar pozele noi sau modificate. În memorie, referințele formează o singură matrice
+    (o linie per poză, grupate pe semn), deci toate mâinile se compară cu toate
+    referințele printr-o singură înmulțire de matrice.
+    """
+
+    def __init__(self, root: Path, moves: Iterable[str], cache_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.moves = list(moves)
+        self.cache_path = Path(cache_path) if cache_path else self.root / ".histograms.npz"
+
+        self.matrix = np.zeros((0, HIST_BINS ** 3), dtype=np.float32)
+        # Pentru fiecare semn: poziția primei linii și numărul de linii din matrice
+        self.move_ranges: Dict[str, Tuple[int, int]] = {move: (0, 0) for move in self.moves}
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def count(self, move: str) -> int:
+        return self.move_ranges.get(move, (0, 0))[1]
+
+    def _reference_files(self) -> List[Tuple[str, Path]]:
+        files = []
+        for move in self.moves:
+            ref_dir = self.root / move
+            if not ref_dir.exists():
+                continue
+            for pattern in REFERENCE_PATTERNS:
+                files.extend((move, path) for path in sorted(ref_dir.glob(pattern)))
+        return files
+
+    def _read_cache(self) -> Dict[str, Tuple[float, np.ndarray]]:
+        if not self.cache_path.exists():
+            return {}
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                if int(data["bins"]) != HIST_BINS:
+                    return {}
+                return {
+                    str(path): (float(mtime), vector)
+                    for path, mtime, vector in zip(data["paths"], data["mtimes"], data["vectors"])
+                }
+        except Exception as exc:
+            print(f"[ReferenceHistogramIndex] Cache invalid, recalculez: {exc}")
+            return {}
+
+    def _write_cache(self, paths: List[str], mtimes: List[float]):
+        try:
+            # np.savez adaugă extensia .npz dacă lipsește; scriem printr-un handle ca să păstrăm numele
+            tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            with open(tmp_path, "wb") as handle:
+                np.savez_compressed(
+                    handle,
+                    bins=np.int32(HIST_BINS),
+                    paths=np.array(paths, dtype=str),
+                    mtimes=np.array(mtimes, dtype=np.float64),
+                    vectors=self.matrix,
+                )
+            tmp_path.replace(self.cache_path)
+        except OSError as exc:
+            print(f"[ReferenceHistogramIndex] Nu pot salva cache-ul: {exc}")
+
+    def load(self, precomputed: Optional[Dict[str, Tuple[float, np.ndarray]]] = None) -> "ReferenceHistogramIndex":
+        """
+        Construiește matricea de referințe, din cache unde e posibil.
+
+        Args:
+            precomputed: {cale: (mtime, vector)} calculate deja în altă parte (ex. de
+                modules.rps_reference_cli într-un pool de procese); au prioritate față de cache.
+        """
+        cached = self._read_cache()
+        stored = len(cached)
+        if precomputed:
+            cached.update(precomputed)
+        paths, mtimes, vectors = [], [], []
+        computed = 0
+
+        files = self._reference_files()
+        for move in self.moves:
+            start = len(vectors)
+            for path in (path for file_move, path in files if file_move == move):
+                key = str(path)
+                mtime = path.stat().st_mtime
+                hit = cached.get(key)
+                if hit is not None and hit[0] == mtime:
+                    vector = hit[1]
+                else:
+                    image = cv2.imread(key)
+                    if image is None:
+                        continue
+                    vector = histogram_vector(cv2.resize(image, REFERENCE_SIZE))
+                    computed += 1
+                paths.append(key)
+                mtimes.append(mtime)
+                vectors.append(vector)
+            self.move_ranges[move] = (start, len(vectors) - start)
+
+        if vectors:
+            self.matrix = np.ascontiguousarray(np.stack(vectors), dtype=np.float32)
+
+        # Rescriem cache-ul doar dacă s-a schimbat ceva (poze noi, modificate sau șterse)
+        if computed or precomputed or len(paths) != stored:
+            self._write_cache(paths, mtimes)
+            print(f"[ReferenceHistogramIndex] {computed} histograme calculate, {len(paths)} în total.")
+        return self
+
+    def score(self, hand_vectors: np.ndarray) -> np.ndarray:
+        """
+        Scorurile tuturor mâinilor față de toate semnele, dintr-o singură înmulțire:
+        matricea (mâini x referințe) de corelații, redusă la maximul pe fiecare semn.
+
+        Args:
+            hand_vectors: (H, D) vectori histogram_vector() ai mâinilor.
+
+        Returns:
+            (H, len(moves)) cea mai bună corelație pe semn (0 dacă semnul nu are referințe).
+        """
+        hand_vectors = np.atleast_2d(hand_vectors)
+        scores = np.zeros((len(hand_vectors), len(self.moves)), dtype=np.float32)
+        if not len(self.matrix) or not len(hand_vectors):
+            return scores
+
+        similarity = hand_vectors @ self.matrix.T
+        columns = [i for i, move in enumerate(self.moves) if self.count(move)]
+        starts = [self.move_ranges[self.moves[i]][0] for i in columns]
+        scores[:, columns] = np.maximum.reduceat(similarity, starts, axis=1)
+        return np.maximum(scores, 0.0)
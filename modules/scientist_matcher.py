@@ -1,108 +1,111 @@
+import json
 import os
 import random
 import time
-import subprocess
-import tempfile
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
+from pathlib import Path
 
 import cv2
 import numpy as np
 
+from modules.asset_index import get_asset_index
+from modules.camera_service import CameraService, get_camera_service
+from modules.face_detectors import FaceDetector, create_face_detector, select_face_detector
+from modules.face_index import ScientistFaceIndex
+from modules.face_tracker import FaceTracker
+from modules.frame_bus import Frame
+
+
+SCIENTISTS_CATALOGUE_PATH = Path(__file__).resolve().parent.parent / "assets" / "scientists.json"
+
 
 @dataclass
 class Scientist:
     name: str
     description: str
     image_path: Optional[str] = None
+    # False când image_path e doar imaginea de rezervă (nu chipul lui): portretul nu intră în indexul fețelor
+    has_portrait: bool = True
 
 
 class ScientistMatcher:
     """
-    Captură un frame folosind rpicam-hello, detectează fața, adaugă cască de muncitor
+    Captură un frame din serviciul de cameră, detectează fața, adaugă cască de muncitor
     și salvează poza editată.
     """
 
-    def __init__(self, scientists: Optional[List[Scientist]] = None):
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-        )
+    def __init__(self, scientists: Optional[List[Scientist]] = None, camera: Optional[CameraService] = None):
+        # Sesiunea de cameră comună (backend-ul rămâne deschis între capturi)
+        self.camera = camera or get_camera_service()
+        # Haar până la calibrare (warm_up), apoi backend-ul cel mai rapid pentru dispozitiv
+        self.face_detector: FaceDetector = create_face_detector("haar")
+        # Detecție pe frame micșorat + urmărire între detecții; preview-ul și poza
+        # finală împart rezultatele (cache pe seq-ul frame-ului)
+        self.face_tracker = FaceTracker(self._detect_face)
+        # Descriptorii portretelor (construiți în warm_up); până atunci alegerea e aleatorie
+        self.face_index: Optional[ScientistFaceIndex] = None
         # Director pentru pozele salvate
         self.output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output_photos")
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # Apelat (pe thread-ul de lucru) imediat ce e ales omul de știință, ex. pentru preîncărcarea portretului
+        self.on_scientist_chosen: Optional[Callable[[Scientist], None]] = None
+
+        # Imaginile se caută în indexul din assets (un singur scan per director)
+        self.assets = get_asset_index()
+
         # Inițializează oamenii de știință (după ce toate metodele sunt disponibile)
         self.scientists = scientists or self._default_scientists()
 
-    def _find_scientist_image(self, name: str, base_dir: str) -> Optional[str]:
-        """Găsește imaginea pentru un om de știință bazat pe nume."""
-        # Caută fișiere care conțin numele omului de știință (case-insensitive)
-        name_lower = name.lower().replace(" ", "_")
-        
-        # Extensii posibile
-        extensions = ['.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG']
-        
-        for ext in extensions:
-            # Încearcă exact numele
-            image_path = os.path.join(base_dir, f"{name_lower}{ext}")
-            if os.path.exists(image_path):
-                return image_path
-            
-            # Încearcă cu nume parțial
-            for file in os.listdir(base_dir):
-                if name_lower in file.lower() and file.lower().endswith(ext.lower()):
-                    image_path = os.path.join(base_dir, file)
-                    if os.path.exists(image_path):
-                        return image_path
-        
+    def _find_scientist_image(self, name: str) -> Optional[str]:
+        """Găsește imaginea pentru un om de știință după nume, în indexul din assets/images."""
+        # Potrivire exactă sau parțială pe numele normalizat (fără acces la disc)
+        image_path = self.assets.find(name)
+        if image_path is not None:
+            return image_path
+
         # Fallback: folosește imaginea lui Einstein dacă există
-        einstein_path = os.path.join(base_dir, "Albert_Einstein_sticks_his_tongue.jpg")
-        if os.path.exists(einstein_path):
-            return einstein_path
-        
-        return None
+        return self.assets.find("Albert_Einstein_sticks_his_tongue", partial=False)
 
     def _default_scientists(self) -> List[Scientist]:
-        # Căi către imaginile oamenilor de știință
-        base_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "images")
-        return [
-            Scientist(
-                "Albert Einstein", 
-                "Pionier în fizica teoretică și relativitate.",
-                image_path=self._find_scientist_image("Albert Einstein", base_dir)
-            ),
-            Scientist(
-                "Marie Curie", 
-                "Cercetătoare în radioactivitate, dublu Nobel.",
-                image_path=self._find_scientist_image("Marie Curie", base_dir)
-            ),
-            Scientist(
-                "Nikola Tesla", 
-                "Inventator și vizionar al curentului alternativ.",
-                image_path=self._find_scientist_image("Nikola Tesla", base_dir)
-            ),
-            Scientist(
-                "Ada Lovelace", 
-                "Prima programatoare, a imaginat mașini computaționale.",
-                image_path=self._find_scientist_image("Ada Lovelace", base_dir)
-            ),
-            Scientist(
-                "Rosalind Franklin", 
-                "A elucidat structura ADN prin difracție cu raze X.",
-                image_path=self._find_scientist_image("Rosalind Franklin", base_dir)
-            ),
-            Scientist(
-                "Katherine Johnson", 
-                "Matematiciană NASA, calcule critice pentru zboruri spațiale.",
-                image_path=self._find_scientist_image("Katherine Johnson", base_dir)
-            ),
-        ]
+        """Catalogul din assets/scientists.json (sau SCIENTISTS_CATALOGUE)."""
+        path = os.environ.get("SCIENTISTS_CATALOGUE", str(SCIENTISTS_CATALOGUE_PATH))
+        try:
+            with open(path, encoding="utf-8") as handle:
+                entries = json.load(handle)["scientists"]
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"[ScientistMatcher] Nu pot citi catalogul {path}: {exc}")
+            entries = [{"name": "Albert Einstein", "description": "Pionier în fizica teoretică și relativitate."}]
+
+        scientists = []
+        for entry in entries:
+            # „image” e numele unui fișier din assets/images; portretul se decodează abia la afișare
+            image = entry.get("image")
+            portrait = (self.assets.find(image, partial=False) if image else None) or self.assets.find(entry["name"])
+            scientists.append(Scientist(
+                entry["name"],
+                entry.get("description", ""),
+                image_path=portrait or self._find_scientist_image(entry["name"]),
+                has_portrait=portrait is not None,
+            ))
+        return scientists
+
+    def warm_up(self):
+        """
+        Alege detectorul de fețe (calibrare la prima pornire) și încarcă indexul portretelor
+        (din cache, dacă nu s-au schimbat). Se apelează în fundal.
+        """
+        self.face_detector = select_face_detector()
+        # Cei fără portret propriu (ex. Marie Curie, afișată cu imaginea de rezervă) nu se pot potrivi după față
+        portraits = [s.image_path if s.has_portrait else None for s in self.scientists]
+        index = ScientistFaceIndex().load(portraits, self._detect_face)
+        self.face_index = index
 
     def _detect_face(self, frame):
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, scaleFactor=1.2, minNeighbors=5)
-        return faces
+        # Acceptă direct o imagine gri (ex. planul Y dintr-un frame YUV420)
+        return self.face_detector.detect(frame)
 
     def _create_helmet_mask(self, width: int, height: int) -> np.ndarray:
         """Creează o mască pentru cască de muncitor (galbenă cu bandă reflectantă)."""
@@ -159,189 +162,85 @@ class ScientistMatcher:
         
         return frame_copy
 
-    def _capture_frame_rpicam(self, output_path: Optional[str] = None) -> Optional[np.ndarray]:
-        """
-        Capturează un frame folosind rpicam-hello cu timeout scurt.
-        Returnează imaginea ca numpy array (BGR pentru OpenCV).
-        
-        Args:
-            output_path: Dacă este specificat, salvează direct la acest path (pentru feed live).
-                        Dacă este None, creează un fișier temporar care va fi șters.
-        """
-        # Dacă nu este specificat un output_path, creează un fișier temporar
-        if output_path is None:
-            temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-            temp_path = temp_file.name
-            temp_file.close()
-            should_delete = True
-        else:
-            temp_path = output_path
-            should_delete = False
-        
-        try:
-            # Șterge fișierul dacă există pentru a forța o captură nouă
-            if os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-            
-            # Folosește rpicam-still pentru capturi statice (mai rapid și mai fiabil)
-            # rpicam-still este specializat pentru capturi statice
-            cmd = [
-                "rpicam-still",
-                "--timeout", "1000",  # 1 secundă
-                "--output", temp_path,
-                "--width", "640",
-                "--height", "480",
-                "--nopreview"  # Oprește fereastra de preview
-            ]
-            
-            print(f"[DEBUG] Rulez comanda: {' '.join(cmd)}")
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=5  # Timeout mai mare pentru a permite capturarea
-            )
-            
-            # Așteaptă puțin pentru a se asigura că fișierul este scris complet
-            import time
-            time.sleep(0.2)
-            
-            print(f"[DEBUG] rpicam-still returncode: {result.returncode}")
-            if result.stdout:
-                print(f"[DEBUG] rpicam-still stdout: {result.stdout[:200]}")
-            if result.stderr:
-                print(f"[DEBUG] rpicam-still stderr: {result.stderr[:200]}")
-            
-            # Verifică dacă fișierul a fost creat
-            file_exists = os.path.exists(temp_path) and os.path.getsize(temp_path) > 0
-            print(f"[DEBUG] Fișierul există: {os.path.exists(temp_path)}, size: {os.path.getsize(temp_path) if os.path.exists(temp_path) else 0}")
-            
-            if not file_exists:
-                # Dacă rpicam-still eșuează, încearcă cu rpicam-vid
-                try:
-                    print(f"[DEBUG] Încerc rpicam-vid ca fallback")
-                    # Șterge din nou fișierul
-                    if os.path.exists(temp_path):
-                        try:
-                            os.unlink(temp_path)
-                        except:
-                            pass
-                    
-                    cmd_vid = [
-                        "rpicam-vid",
-                        "--frames", "1",
-                        "--output", temp_path,
-                        "--width", "640",
-                        "--height", "480",
-                        "--nopreview"
-                    ]
-                    result = subprocess.run(
-                        cmd_vid,
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    time.sleep(0.2)
-                    file_exists = os.path.exists(temp_path) and os.path.getsize(temp_path) > 0
-                    print(f"[DEBUG] rpicam-vid returncode: {result.returncode}, file_exists: {file_exists}")
-                    if not file_exists:
-                        return None
-                except FileNotFoundError:
-                    return None
-            
-            # Citește imaginea capturată
-            if not os.path.exists(temp_path):
-                print(f"[DEBUG] Fișierul {temp_path} nu există după rpicam-hello")
-                return None
-            
-            file_size = os.path.getsize(temp_path)
-            if file_size == 0:
-                print(f"[DEBUG] Fișierul {temp_path} este gol (0 bytes)")
-                return None
-            
-            frame = cv2.imread(temp_path)
-            if frame is None:
-                print(f"[DEBUG] Nu am putut citi imaginea de la {temp_path} (size: {file_size} bytes)")
-                return None
-            
-            print(f"[DEBUG] Frame capturat cu succes: {temp_path}, size: {file_size}, shape: {frame.shape}")
-            return frame
-            
-        except subprocess.TimeoutExpired:
-            # Dacă timeout, returnează None în loc să arunce eroare
-            return None
-        except Exception as e:
-            # Pentru feed live, nu aruncăm eroare, doar returnăm None
-            return None
-        finally:
-            # Șterge fișierul temporar doar dacă nu este pentru feed live
-            if should_delete and os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-
-    def _warm_capture(self, attempts: int = 2, delay: float = 0.5):
+    def _warm_capture(self, attempts: int = 2, delay: float = 0.5) -> Optional[Frame]:
         """Face mai multe încercări de captură pentru a se asigura că primește un frame valid."""
         for attempt in range(attempts):
             try:
-                frame = self._capture_frame_rpicam()
-                if frame is not None and frame.size > 0:
+                frame = self.camera.get_latest_frame()
+                if frame is not None and frame.image.size > 0:
                     return frame
-            except subprocess.TimeoutExpired:
-                if attempt == attempts - 1:
-                    raise RuntimeError("Timeout la capturarea imaginii. Verifică dacă camera funcționează.")
-                time.sleep(delay)
-            except Exception as e:
+            except Exception:
                 if attempt == attempts - 1:
                     raise
                 time.sleep(delay)
         return None
 
+    def match_frame(self, frame: Frame, prefix: str = "scientist_photo") -> Optional[Dict]:
+        """
+        Detectează fața pe frame-ul din fluxul de analiză, face o poză la rezoluție mare
+        din aceeași sesiune a camerei, adaugă casca și salvează poza editată.
+        Returnează None dacă nu s-a detectat nicio față.
+        """
+        # Refolosește detecția făcută deja pentru preview; altfel detectează acum
+        # (pe imaginea gri micșorată a fluxului mic)
+        faces = self.face_tracker.boxes_for(frame)
+        if len(faces) == 0:
+            return None
+
+        # Poza finală vine din fluxul de rezoluție mare (fără repornirea camerei)
+        still = self.camera.capture_still()
+        if still is None:
+            still = frame.bgr()
+
+        # Folosește cea mai mare față detectată, scalată la rezoluția pozei
+        largest_face = max(faces, key=lambda f: f[2] * f[3])
+        stream_w, stream_h = frame.size
+        scale_x = still.shape[1] / stream_w
+        scale_y = still.shape[0] / stream_h
+        x, y, w, h = largest_face
+        face = (int(x * scale_x), int(y * scale_y), int(w * scale_x), int(h * scale_y))
+
+        # Cel mai asemănător portret (descriptorul se ia înainte de adăugarea căștii)
+        match = self.face_index.best(still, face) if self.face_index is not None else None
+        if match is not None:
+            index, similarity = match
+            scientist = self.scientists[index]
+        else:
+            # Index încă neîncărcat sau fără portrete: alegere aleatorie
+            scientist, similarity = random.choice(self.scientists), None
+        # Portretul se poate decoda în fundal cât timp salvăm poza
+        if self.on_scientist_chosen is not None:
+            self.on_scientist_chosen(scientist)
+
+        edited_frame = self._add_helmet_to_face(still, face)
+
+        # Salvează poza editată
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{prefix}_{timestamp}.jpg"
+        output_path = os.path.join(self.output_dir, filename)
+        cv2.imwrite(output_path, edited_frame)
+
+        return {
+            "name": scientist.name,
+            "description": scientist.description,
+            "image_path": scientist.image_path,
+            "similarity": similarity,
+            "faces_detected": len(faces),
+            "edited_photo_path": output_path,
+        }
+
     def capture_and_match(self, camera_index: int = 0) -> Optional[Dict]:
         """
-        Capturează o imagine folosind rpicam-hello, detectează fața, adaugă cască
-        și salvează poza editată.
+        Ia cel mai nou frame din serviciul de cameră, detectează fața, adaugă cască
+        și salvează poza editată (la rezoluția mare a camerei).
         """
         try:
-            # Capturează frame folosind rpicam-hello
+            # Ia cel mai nou frame din serviciul de cameră
             frame = self._warm_capture()
             if frame is None:
                 raise RuntimeError("Nu am putut citi un frame de la cameră.")
 
-            faces = self._detect_face(frame)
-            if len(faces) == 0:
-                return None
-
-            # Adaugă casca pe prima față detectată
-            edited_frame = frame.copy()
-            if len(faces) > 0:
-                # Folosește cea mai mare față detectată
-                largest_face = max(faces, key=lambda f: f[2] * f[3])
-                edited_frame = self._add_helmet_to_face(edited_frame, largest_face)
-
-            # Salvează poza editată
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"scientist_photo_{timestamp}.jpg"
-            output_path = os.path.join(self.output_dir, filename)
-            cv2.imwrite(output_path, edited_frame)
-
-            # Alege un om de știință random
-            scientist = random.choice(self.scientists)
-            return {
-                "name": scientist.name,
-                "description": scientist.description,
-                "image_path": scientist.image_path,
-                "faces_detected": len(faces),
-                "edited_photo_path": output_path,
-            }
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Eroare la rularea rpicam-hello: {e}")
-        except FileNotFoundError:
-            raise RuntimeError("rpicam-hello nu este instalat sau nu este în PATH.")
+            return self.match_frame(frame)
         except Exception as e:
             raise RuntimeError(f"Eroare cameră: {e}")
 
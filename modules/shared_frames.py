@@ -0,0 +1,309 @@
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from modules.camera_backends import CameraBackend
+
+
+# Antetul inelului: [ultimul seq scris, nr. sloturi, înălțime, lățime, canale (0 = 2D)]
+HEADER_FIELDS = 5
+SLOT_WRITING = -1
+
+
+def _untrack(shm: shared_memory.SharedMemory):
+    """
+    Procesul care doar se atașează nu trebuie să șteargă memoria la ieșire
+    (resource_tracker din Python < 3.13 ar face unlink pe un segment pe care nu îl deține).
+    """
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+def _wait_readable(fd: int, deadline: float) -> bool:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return False
+    ready, _, _ = select.select([fd], [], [], remaining)
+    return bool(ready)
+
+
+def _read_line(fd: int, deadline: float) -> Optional[bytes]:
+    """Un rând de pe pipe, sau None la timeout / EOF (citire octet cu octet, fără buffer)."""
+    line = bytearray()
+    while not line.endswith(b"\n"):
+        if not _wait_readable(fd, deadline):
+            return None
+        chunk = os.read(fd, 1)
+        if not chunk:
+            return None
+        line += chunk
+    return bytes(line)
+
+
+def _read_exact(fd: int, size: int, deadline: float) -> Optional[bytearray]:
+    """Exact size octeți de pe pipe, sau None la timeout / EOF."""
+    data = bytearray(size)
+    view = memoryview(data)
+    filled = 0
+    while filled < size:
+        if not _wait_readable(fd, deadline):
+            return None
+        chunk = os.read(fd, min(size - filled, 1 << 20))
+        if not chunk:
+            return None
+        view[filled:filled + len(chunk)] = chunk
+        filled += len(chunk)
+    return data
+
+
+def _drain(fd: int, idle: float = 0.2):
+    """Aruncă tot ce mai sosește pe pipe până când acesta tace idle secunde."""
+    while _wait_readable(fd, time.monotonic() + idle):
+        if not os.read(fd, 1 << 20):
+            return
+
+
+class SharedFrameRing:
+    """
+    Inel de frame-uri în multiprocessing.shared_memory, fără lock-uri.
+
+    Un singur scriitor (procesul de captură) și oricâți cititori. Fiecare slot are propriul
+    număr de secvență: scriitorul îl marchează SLOT_WRITING, copiază frame-ul, apoi scrie
+    seq-ul și în final contorul global. Cititorul copiază slotul și verifică după copiere
+    că seq-ul nu s-a schimbat (altfel copia poate fi amestecată cu un frame mai nou).
+    Copia e necesară: consumatorii (preview-ul, poza, burst-ul RPS) țin frame-urile mult
+    mai mult decât durează un ocol complet al inelului.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+
+        self.header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        self.slots = int(self.header[1])
+        channels = int(self.header[4])
+        self.shape = (int(self.header[2]), int(self.header[3])) + ((channels,) if channels else ())
+
+        offset = self.header.nbytes
+        self.slot_seq = np.ndarray((self.slots,), dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += self.slot_seq.nbytes
+        self.slot_time = np.ndarray((self.slots,), dtype=np.float64, buffer=shm.buf, offset=offset)
+        offset += self.slot_time.nbytes
+        self.data = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+
+    @staticmethod
+    def required_size(shape: Tuple[int, ...], slots: int) -> int:
+        return 8 * HEADER_FIELDS + 16 * slots + slots * int(np.prod(shape))
+
+    @classmethod
+    def create(cls, shape: Tuple[int, ...], slots: int = 16) -> "SharedFrameRing":
+        shm = shared_memory.SharedMemory(create=True, size=cls.required_size(shape, slots))
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        channels = shape[2] if len(shape) > 2 else 0
+        header[:] = (0, slots, shape[0], shape[1], channels)
+        del header
+        ring = cls(shm, owner=True)
+        ring.slot_seq[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrameRing":
+        shm = shared_memory.SharedMemory(name=name)
+        _untrack(shm)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def latest_seq(self) -> int:
+        return int(self.header[0])
+
+    def write(self, frame: np.ndarray, timestamp: float) -> int:
+        """Scrie un frame (doar procesul de captură). Returnează seq-ul alocat."""
+        seq = int(self.header[0]) + 1
+        slot = seq % self.slots
+        self.slot_seq[slot] = SLOT_WRITING
+        np.copyto(self.data[slot], frame)
+        self.slot_time[slot] = timestamp
+        self.slot_seq[slot] = seq
+        self.header[0] = seq
+        return seq
+
+    def read(self, seq: int) -> Optional[Tuple[np.ndarray, float]]:
+        """Copia frame-ului seq, sau None dacă slotul a fost suprascris (înainte sau în timpul copierii)."""
+        if not self.is_valid(seq):
+            return None
+        slot = seq % self.slots
+        timestamp = float(self.slot_time[slot])
+        frame = self.data[slot].copy()
+        if not self.is_valid(seq):
+            return None
+        return frame, timestamp
+
+    def is_valid(self, seq: int) -> bool:
+        """True dacă slotul frame-ului seq nu a fost încă suprascris."""
+        return int(self.slot_seq[seq % self.slots]) == seq
+
+    def close(self):
+        # View-urile trebuie eliberate înainte de a închide maparea
+        self.header = self.slot_seq = self.slot_time = self.data = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Mai există view-uri NumPy exportate; maparea se eliberează la ieșire
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedMemoryBackend(CameraBackend):
+    """
+    Backend care rulează captura și decodarea într-un proces separat
+    (python -m modules.capture_process) și citește frame-urile din inelul de memorie
+    partajată. Procesul UI nu atinge octeții bruți ai camerei și nu decodează nimic;
+    fiecare frame publicat pe bus e o copie proprie a slotului (un memcpy), deci rămâne
+    valid oricât timp îl păstrează consumatorii.
+    """
+
+    name = "process"
+
+    def __init__(
+        self,
+        width: int = 640,
+        height: int = 480,
+        framerate: int = 30,
+        slots: int = 16,
+        poll_interval: float = 0.002,
+        start_timeout: float = 10.0,
+    ):
+        self.width = width
+        self.height = height
+        self.framerate = framerate
+        self.slots = slots
+        self.poll_interval = poll_interval
+        self.start_timeout = start_timeout
+
+        self._process = None
+        self.ring: Optional[SharedFrameRing] = None
+        self._last_seq = 0
+        self._still_lock = threading.Lock()
+        # După un timeout, restul răspunsului întârziat poate sosi mai târziu pe stdout
+        self._stdout_dirty = False
+
+    def open(self):
+        cmd = [
+            sys.executable, "-m", "modules.capture_process",
+            "--width", str(self.width),
+            "--height", str(self.height),
+            "--framerate", str(self.framerate),
+            "--slots", str(self.slots),
+        ]
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        print(f"[SharedMemoryBackend] Pornesc procesul de captură: {' '.join(cmd)}")
+        self._process = subprocess.Popen(
+            cmd,
+            cwd=project_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+
+        # Primul rând de la proces: "SHM <nume> <format>" (după primul frame) sau eroarea
+        raw = _read_line(self._process.stdout.fileno(), time.monotonic() + self.start_timeout)
+        line = raw.decode("utf-8", "replace").strip() if raw is not None else "timeout"
+        if not line.startswith("SHM "):
+            self.close()
+            raise RuntimeError(f"Procesul de captură nu a pornit: {line or 'fără răspuns'}")
+        _, shm_name, self.frame_format = line.split(" ", 2)
+        self.ring = SharedFrameRing.attach(shm_name)
+        self._last_seq = 0
+
+    def read(self) -> Optional[Tuple[np.ndarray, float]]:
+        while self.ring is not None:
+            if self._process is None or self._process.poll() is not None:
+                return None
+
+            seq = self.ring.latest_seq
+            if seq > self._last_seq:
+                item = self.ring.read(seq)
+                self._last_seq = seq
+                if item is not None:
+                    return item
+                continue
+            time.sleep(self.poll_interval)
+        return None
+
+    def capture_still(self, timeout: float = 3.0) -> Optional[np.ndarray]:
+        """
+        Cere procesului de captură o poză la rezoluție mare ("STILL" pe stdin); răspunsul
+        vine pe stdout: "STILL <h> <w> <c>" urmat de octeții imaginii BGR. Returnează None
+        dacă răspunsul nu sosește complet în timeout secunde.
+        """
+        process = self._process
+        if process is None:
+            return None
+        deadline = time.monotonic() + timeout
+        with self._still_lock:
+            fd = process.stdout.fileno()
+            try:
+                if self._stdout_dirty:
+                    _drain(fd)
+                    self._stdout_dirty = False
+                process.stdin.write(b"STILL\n")
+                process.stdin.flush()
+
+                raw = _read_line(fd, deadline)
+                if raw is None:
+                    return self._still_timeout(timeout)
+                header = raw.decode("utf-8", "replace").split()
+                if len(header) != 4 or header[0] != "STILL":
+                    return None
+                shape = tuple(int(value) for value in header[1:])
+                size = int(np.prod(shape))
+                if size == 0:
+                    return None
+                data = _read_exact(fd, size, deadline)
+                if data is None:
+                    return self._still_timeout(timeout)
+            except Exception as exc:
+                print(f"[SharedMemoryBackend] Eroare la poza de rezoluție mare: {exc}")
+                return None
+        return np.frombuffer(data, dtype=np.uint8).reshape(shape)
+
+    def _still_timeout(self, timeout: float) -> None:
+        # Răspunsul întârziat se aruncă la următoarea cerere, ca antetul ei să nu se decaleze
+        print(f"[SharedMemoryBackend] Poza de rezoluție mare nu a sosit în {timeout:.1f}s.")
+        self._stdout_dirty = True
+        return None
+
+    def close(self):
+        process = self._process
+        self._process = None
+        if process is not None:
+            try:
+                # EOF pe stdin oprește procesul de captură în mod ordonat
+                process.stdin.close()
+                process.wait(timeout=2.0)
+            except Exception:
+                try:
+                    process.kill()
+                except Exception:
+                    pass
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None